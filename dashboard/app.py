@@ -2,56 +2,22 @@
 import sys
 import os
 import pandas as pd
-# Garante import do pacote e do script de aquecimento
+# Garante import do pacote
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
-sys.path.insert(0, PROJECT_ROOT)
 
 import streamlit as st
 from datetime import date
 import pandas as pd
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from samsbet.services.match_service import get_daily_matches_dataframe
+from samsbet.services.match_service import (
+    SCHEDULE_REFRESH_SECONDS,
+    invalidate_match_caches,
+    refresh_matches_dataframe,
+)
+from samsbet.services.live_service import get_live_poller, live_candidates
 from samsbet.constants import PRINCIPAL_LEAGUES_IDS
-from samsbet.core.disk_cache import _get_cache_dir
-
-# Auto-aquecimento diário no primeiro acesso após 03:00 America/Sao_Paulo
-def _auto_warm_if_needed():
-    try:
-        try:
-            tz = ZoneInfo("America/Sao_Paulo")
-        except ZoneInfoNotFoundError:
-            tz = ZoneInfo("Etc/GMT+3")
-
-        from datetime import datetime
-        now_sp = datetime.now(tz)
-        cache_dir = _get_cache_dir()
-        marker_path = os.path.join(cache_dir, 'last_warm.txt')
-
-        today_str = now_sp.date().isoformat()
-        last_warm = None
-        if os.path.exists(marker_path):
-            try:
-                with open(marker_path, 'r', encoding='utf-8') as f:
-                    last_warm = f.read().strip()
-            except Exception:
-                last_warm = None
-
-        should_warm = (last_warm != today_str) and (now_sp.hour >= 1)
-        if should_warm:
-            from scripts.warm_cache import main as warm_cache_main
-            with st.spinner("Aquecendo cache diário... ⚙️"):
-                warm_cache_main()
-            try:
-                os.makedirs(cache_dir, exist_ok=True)
-                with open(marker_path, 'w', encoding='utf-8') as f:
-                    f.write(today_str)
-            except Exception:
-                pass
-    except Exception:
-        # Não quebra a página se o aquecimento falhar
-        pass
+from samsbet.services.warm_scheduler import get_warm_daemon
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -63,10 +29,15 @@ st.set_page_config(
 # <<< PASSO 1: LIGAS PRINCIPAIS (extraídas para samsbet.constants) >>>
 
 # --- Funções ---
-@st.cache_data(ttl=86400)
+@st.cache_data(ttl=SCHEDULE_REFRESH_SECONDS)
 def load_data(for_date: date) -> pd.DataFrame:
-    """Carrega os dados dos jogos para a data selecionada."""
-    return get_daily_matches_dataframe(for_date)
+    """
+    Carrega os dados dos jogos para a data selecionada. A cada expiração o schedule é
+    atualizado de forma incremental e os caches dos jogos que mudaram são descartados.
+    """
+    matches_df, changes = refresh_matches_dataframe(for_date)
+    invalidate_match_caches(changes)
+    return matches_df
 
 def display_games_table(df: pd.DataFrame, title: str, key_prefix: str):
     """
@@ -80,7 +51,8 @@ def display_games_table(df: pd.DataFrame, title: str, key_prefix: str):
     
     # Prepara o DataFrame para exibição
     df_display = df.copy()
-    df_display['start_time'] = pd.to_datetime(df_display['start_time']) - pd.Timedelta(hours=3)
+    # `start_time` já vem no fuso de America/Sao_Paulo: só removemos o fuso para exibir o horário local
+    df_display['start_time'] = df_display['start_time'].dt.tz_localize(None)
     
     df_display.insert(0, "Analisar", False)
     
@@ -123,7 +95,8 @@ def display_games_table(df: pd.DataFrame, title: str, key_prefix: str):
 
 # --- Título e Filtros ---
 st.title("⚽ SamsBet V2 - Dashboard de Jogos")
-_auto_warm_if_needed()
+# Aquecimento do cache em segundo plano (só a réplica líder aquece; a página nunca espera)
+get_warm_daemon()
 st.sidebar.header("Filtros")
 selected_date = st.sidebar.date_input(
     "Selecione a data", value=date.today(),
@@ -141,6 +114,9 @@ if not matches_df.empty:
     main_leagues_df = matches_df[matches_df['uniqueTournament_id'].isin(PRINCIPAL_LEAGUES_IDS)]
     other_leagues_df = matches_df[~matches_df['uniqueTournament_id'].isin(PRINCIPAL_LEAGUES_IDS)]
 
+    # Jogos em andamento (ou começando) entram no modo ao vivo; ligas principais primeiro
+    get_live_poller().track(live_candidates(main_leagues_df) + live_candidates(other_leagues_df))
+
     # <<< PASSO 3: RENDERIZAR AS DUAS TABELAS >>>
     display_games_table(main_leagues_df, "🏆 Ligas Principais", "main_leagues")
     st.divider()
@@ -0,0 +1,211 @@
+"""
+Benchmark dos construtores de DataFrame de jogadores e goleiros.
+
+Gera payloads sintéticos no formato de `unique-tournament/{ut}/season/{s}/statistics`
+(um time com 30 jogadores e uma liga inteira com 600) e mede o tempo médio de
+`_process_player_stats_to_dataframe` e `_process_goalkeeper_stats_to_dataframe`
+contra os construtores linha a linha anteriores (copiados abaixo), conferindo que
+as duas versões produzem a mesma tabela.
+
+Uso:
+  python -m scripts.bench_player_frames
+"""
+import random
+import timeit
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import poisson
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from samsbet.services.stats_service import (
+    _process_player_stats_to_dataframe,
+    _process_goalkeeper_stats_to_dataframe,
+)
+
+
+def _fake_players(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    results, last_match = [], {}
+    for player_id in range(1, n + 1):
+        appearances = rng.randint(0, 38)
+        total_shots = rng.randint(0, 4 * appearances + 1)
+        results.append({
+            'player': {'id': player_id, 'name': f'Jogador {player_id}'},
+            'totalShots': total_shots,
+            'shotsOnTarget': rng.randint(0, total_shots),
+            'appearances': appearances,
+            'matchesStarted': rng.randint(0, appearances),
+            'minutesPlayed': appearances * rng.randint(10, 90),
+        })
+        if rng.random() < 0.5:
+            last_match[player_id] = {'total_shots': rng.randint(0, 5), 'shots_on_target': rng.randint(0, 2)}
+    return results, last_match
+
+
+def _fake_goalkeepers(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    results, last_match = [], {}
+    for player_id in range(1, n + 1):
+        appearances = rng.randint(0, 38)
+        saves = rng.randint(0, 5 * appearances + 1)
+        inside = rng.randint(0, saves)
+        results.append({
+            'player': {'id': player_id, 'name': f'Goleiro {player_id}'},
+            'saves': saves,
+            'savedShotsFromInsideTheBox': inside,
+            'savedShotsFromOutsideTheBox': saves - inside,
+            'appearances': appearances,
+            'cleanSheet': rng.randint(0, appearances),
+        })
+        if rng.random() < 0.5:
+            last_match[player_id] = rng.randint(1, 8)
+    return results, last_match
+
+
+# --- Construtores anteriores (linha a linha), mantidos só para comparação ---
+
+def _legacy_player_frame(raw_player_stats, last_match_shots_map):
+    if not raw_player_stats:
+        return pd.DataFrame()
+
+    all_data = []
+    for player_data in raw_player_stats:
+        player_info = player_data.get("player", {})
+        player_id = player_info.get("id")
+
+        last_match_stats = last_match_shots_map.get(player_id, {})
+
+        all_data.append({
+            'Jogador': player_info.get('name'),
+            'Total de chutes': player_data.get('totalShots', 0),
+            'Chutes no alvo': player_data.get('shotsOnTarget', 0),
+            'Partidas jogadas': player_data.get('appearances', 0),
+            'Min/Jogados': player_data.get('minutesPlayed', 0),
+            'Chutes (Última)': last_match_stats.get('total_shots', 0),
+            'Chutes Alvo (Última)': last_match_stats.get('shots_on_target', 0)
+        })
+
+    df = pd.DataFrame(all_data)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['Chutes/P'] = (df['Total de chutes'] / df['Partidas jogadas']).round(2)
+        df['Chutes Alvo/P'] = (df['Chutes no alvo'] / df['Partidas jogadas']).round(2)
+        df['Min/Chute'] = (df['Min/Jogados'] / df['Total de chutes']).round(2)
+        df['Min/Chute Alvo'] = (df['Min/Jogados'] / df['Chutes no alvo']).round(2)
+        df['Min/Partida'] = (df['Min/Jogados'] / df['Partidas jogadas']).round(2)
+        df['Eficiência %'] = (df['Chutes no alvo'] / df['Total de chutes'] * 100).round(1)
+    df = df.fillna(0)
+
+    min_jogos = 5
+    jogos_validos = df['Partidas jogadas'] >= min_jogos
+    lambda_chutes_alvo = df.loc[jogos_validos, 'Chutes Alvo/P']
+
+    df['Prob_Over_0.5'] = np.nan
+    df.loc[jogos_validos, 'Prob_Over_0.5'] = 1 - poisson.cdf(0, lambda_chutes_alvo)
+
+    df['Prob_Over_1.5'] = np.nan
+    df.loc[jogos_validos, 'Prob_Over_1.5'] = 1 - poisson.cdf(1, lambda_chutes_alvo)
+
+    df['Odd_Over_0.5'] = (1 / df['Prob_Over_0.5']).round(2)
+    df['Odd_Over_1.5'] = (1 / df['Prob_Over_1.5']).round(2)
+
+    erro_padrao = np.sqrt(df['Chutes Alvo/P'] / df['Partidas jogadas'])
+    df['IC_Inferior'] = np.nan
+    df.loc[jogos_validos, 'IC_Inferior'] = (df['Chutes Alvo/P'] - 1.96 * erro_padrao).round(2)
+
+    df['IC_Superior'] = np.nan
+    df.loc[jogos_validos, 'IC_Superior'] = (df['Chutes Alvo/P'] + 1.96 * erro_padrao).round(2)
+
+    condicoes_alta = (jogos_validos) & (df['Chutes Alvo/P'] > 0.8) & (df['IC_Inferior'] > 0.4)
+    condicoes_media = (jogos_validos) & (df['Chutes Alvo/P'] > 0.4)
+    df['Consistência'] = np.select(
+        [condicoes_alta, condicoes_media],
+        ['Alta', 'Média'],
+        default='Baixa'
+    )
+
+    df = df.sort_values(by="Chutes Alvo/P", ascending=False).reset_index(drop=True)
+
+    ordem_colunas = [
+        'Jogador', 'Chutes Alvo/P', 'Partidas jogadas', 'Min/Partida', 'Consistência', 'Chutes (Última)', 'Chutes Alvo (Última)',
+        'Odd_Over_0.5', 'Odd_Over_1.5', 'Prob_Over_0.5', 'Prob_Over_1.5', 'Eficiência %', 'Total de chutes', 'Chutes no alvo',
+        'Chutes/P', 'Min/Jogados', 'Min/Chute', 'Min/Chute Alvo', 'IC_Inferior', 'IC_Superior'
+    ]
+    return df.reindex(columns=ordem_colunas).fillna(0)
+
+
+def _legacy_goalkeeper_frame(raw_gk_stats, last_match_saves_map):
+    """Versão anterior: o mapa de defesas da última partida usava o NOME como chave."""
+    if not raw_gk_stats:
+        return pd.DataFrame()
+
+    all_data = []
+    for gk_data in raw_gk_stats:
+        player_name = gk_data.get("player", {}).get("name")
+        all_data.append({
+            'Goleiro': player_name,
+            'Partidas': gk_data.get('appearances', 0),
+            'Sem Sofrer Gol': gk_data.get('cleanSheet', 0),
+            'Defesas': gk_data.get('saves', 0),
+            'Defesas (Dentro da Área)': gk_data.get('savedShotsFromInsideTheBox', 0),
+            'Defesas (Fora da Área)': gk_data.get('savedShotsFromOutsideTheBox', 0),
+            'Defesas (Última)': last_match_saves_map.get(player_name, 0)
+        })
+
+    df = pd.DataFrame(all_data)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['Defesas/J'] = (df['Defesas'] / df['Partidas']).round(2)
+        df['Jogos s/ Sofrer Gol (%)'] = (df['Sem Sofrer Gol'] / df['Partidas'] * 100).round(1)
+    df = df.fillna(0)
+
+    min_jogos = 5
+    jogos_validos = df['Partidas'] >= min_jogos
+    lambda_defesas = df.loc[jogos_validos, 'Defesas/J']
+    for line in [0.5, 1.5, 2.5, 3.5, 4.5]:
+        k = int(line)
+        df[f'Prob_Over_{line}'] = np.nan
+        df.loc[jogos_validos, f'Prob_Over_{line}'] = 1 - poisson.cdf(k, lambda_defesas)
+        df[f'Prob_Under_{line}'] = np.nan
+        df.loc[jogos_validos, f'Prob_Under_{line}'] = poisson.cdf(k, lambda_defesas)
+        df[f'Odd_Over_{line}'] = (1 / df[f'Prob_Over_{line}']).round(2)
+        df[f'Odd_Under_{line}'] = (1 / df[f'Prob_Under_{line}']).round(2)
+
+    df = df.fillna(0)
+    return df.sort_values(by="Partidas", ascending=False).reset_index(drop=True)
+
+
+def _time_ms(fn, runs: int) -> float:
+    return timeit.timeit(fn, number=runs) / runs * 1000
+
+
+def main() -> None:
+    for label, n_players, n_gks in (("time (30 jogadores)", 30, 3), ("liga (600 jogadores)", 600, 60)):
+        players, shots_map = _fake_players(n_players)
+        gks, saves_map = _fake_goalkeepers(n_gks)
+        # O construtor anterior recebia o mapa de defesas por nome; o atual, por player_id
+        saves_by_name = {f'Goleiro {player_id}': saves for player_id, saves in saves_map.items()}
+
+        pd.testing.assert_frame_equal(
+            _process_player_stats_to_dataframe(players, shots_map),
+            _legacy_player_frame(players, shots_map), check_dtype=False,
+        )
+        pd.testing.assert_frame_equal(
+            _process_goalkeeper_stats_to_dataframe(gks, saves_map),
+            _legacy_goalkeeper_frame(gks, saves_by_name), check_dtype=False,
+        )
+
+        runs = 50
+        t_players = _time_ms(lambda: _process_player_stats_to_dataframe(players, shots_map), runs)
+        t_players_old = _time_ms(lambda: _legacy_player_frame(players, shots_map), runs)
+        t_gks = _time_ms(lambda: _process_goalkeeper_stats_to_dataframe(gks, saves_map), runs)
+        t_gks_old = _time_ms(lambda: _legacy_goalkeeper_frame(gks, saves_by_name), runs)
+        print(f"{label}: jogadores {t_players_old:.2f} -> {t_players:.2f} ms ({t_players_old / t_players:.1f}x) | "
+              f"goleiros ({n_gks}) {t_gks_old:.2f} -> {t_gks:.2f} ms ({t_gks_old / t_gks:.1f}x) | saídas iguais")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark da montagem do DataFrame de jogos do dia (`schedule_to_dataframe`).
+
+Gera um payload sintético de `sport/football/scheduled-events/{data}` com 3.000
+jogos (poucas centenas de torneios/países, horários espalhados pelo dia UTC) e mede
+o tempo médio de montagem, o pico de memória durante a montagem e a memória do
+DataFrame final, comparando as colunas categóricas com as mesmas colunas em texto.
+
+Uso:
+  python -m scripts.bench_schedule [n_eventos]
+"""
+import random
+import sys
+import os
+import timeit
+import tracemalloc
+from datetime import date, datetime, timezone
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from samsbet.services.match_service import CATEGORICAL_COLUMNS, _user_timezone, schedule_to_dataframe
+
+
+_STATUSES = [('Not started', 'notstarted'), ('Ended', 'finished'), ('1st half', 'inprogress'),
+             ('Halftime', 'inprogress'), ('Postponed', 'postponed')]
+
+
+def _fake_schedule(n: int, day: date, seed: int = 3):
+    rng = random.Random(seed)
+    day_start = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+    countries = [f'País {i}' for i in range(120)]
+    events = []
+    for event_id in range(1, n + 1):
+        tournament = rng.randint(1, 400)
+        events.append({
+            'id': event_id,
+            'customId': f'c{event_id}',
+            'startTimestamp': day_start + rng.randint(0, 86399),
+            'tournament': {
+                'id': tournament,
+                'name': f'Torneio {tournament}',
+                'category': {'name': countries[tournament % len(countries)]},
+                'uniqueTournament': {'id': 1000 + tournament},
+            },
+            'season': {'id': 50000 + tournament},
+            'homeTeam': {'id': 2 * event_id, 'name': f'Time {2 * event_id}'},
+            'awayTeam': {'id': 2 * event_id + 1, 'name': f'Time {2 * event_id + 1}'},
+            'status': dict(zip(('description', 'type'), rng.choice(_STATUSES))),
+        })
+    return events
+
+
+def main() -> None:
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    day = date(2025, 5, 10)
+    events = _fake_schedule(n_events, day)
+    user_tz = _user_timezone()
+    runs = 20
+
+    elapsed = timeit.timeit(lambda: schedule_to_dataframe(events, day, user_tz), number=runs) / runs
+    tracemalloc.start()
+    df = schedule_to_dataframe(events, day, user_tz)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    as_text = df.astype({column: object for column in CATEGORICAL_COLUMNS})
+    print(f"{n_events} eventos -> {len(df)} jogos no dia local: {elapsed * 1000:.1f} ms, pico {peak / 1e6:.2f} MB")
+    print(f"DataFrame: {df.memory_usage(deep=True).sum() / 1e6:.2f} MB "
+          f"(texto: {as_text.memory_usage(deep=True).sum() / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark do parser de estatísticas de evento (`event/{id}/statistics` e `event/{id}/lineups`).
+
+Mede quantos payloads por segundo `SofaScoreClient.get_team_stats_for_event` e
+`get_player_stats_for_event` conseguem processar, sem rede: a requisição é
+substituída pelo payload carregado.
+
+Por padrão usa payloads sintéticos no formato da API. Para usar respostas gravadas,
+salve os JSONs em um diretório com nomes terminando em `statistics.json` e
+`lineups.json` e passe o caminho:
+  python -m scripts.bench_stats_parser caminho/para/payloads
+"""
+import glob
+import json
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from samsbet.api.sofascore_client import SofaScoreClient
+
+_GROUPS = {
+    'Match overview': ['ballPossession', 'expectedGoals', 'bigChanceCreated', 'totalShotsOnGoal', 'goalkeeperSaves',
+                       'cornerKicks', 'fouls', 'passes', 'totalTackle', 'freeKicks', 'yellowCards', 'redCards'],
+    'Shots': ['totalShotsOnGoal', 'shotsOnGoal', 'hitWoodwork', 'shotsOffGoal', 'blockedScoringAttempt',
+              'totalShotsInsideBox', 'totalShotsOutsideBox'],
+    'Attack': ['bigChanceScored', 'bigChanceMissed', 'touchesInOppBox', 'fouledFinalThird', 'offsides'],
+    'Passes': ['accuratePasses', 'throwIns', 'finalThirdEntries', 'finalThirdPhaseStatistic', 'accurateLongBalls',
+               'accurateCross'],
+    'Duels': ['duelWonPercent', 'dispossessed', 'groundDuelsPercentage', 'aerialDuelsPercentage', 'dribblesPercentage'],
+    'Defending': ['wonTacklePercent', 'totalTackle', 'interceptionWon', 'ballRecovery', 'totalClearance'],
+    'Goalkeeping': ['goalkeeperSaves', 'goalsPrevented', 'goalKicks'],
+}
+
+
+def _synthetic_statistics() -> dict:
+    periods = []
+    for period in ('ALL', '1ST', '2ND'):
+        groups = []
+        for group_name, keys in _GROUPS.items():
+            items = [{'key': key, 'name': key, 'homeValue': 3, 'awayValue': 2,
+                      'home': '3', 'away': '2', 'compareCode': 1, 'statisticsType': 'positive'} for key in keys]
+            if group_name == 'Match overview':
+                for item in items:
+                    if item['key'] == 'expectedGoals':
+                        item['homeValue'], item['awayValue'] = 1.23, 0.87
+                    if item['key'] == 'ballPossession':
+                        item['homeValue'], item['awayValue'] = 55, 45
+            groups.append({'groupName': group_name, 'statisticsItems': items})
+        periods.append({'period': period, 'groups': groups})
+    return {'statistics': periods}
+
+
+def _synthetic_lineups() -> dict:
+    def team(offset):
+        players = []
+        for i in range(20):
+            stats = {'totalPass': 30, 'accuratePass': 25, 'minutesPlayed': 90, 'touches': 50, 'rating': 7.1}
+            if i % 2:
+                stats.update({'onTargetScoringAttempt': 1, 'shotOffTarget': 2, 'blockedScoringAttempt': 1})
+            if i == 0:
+                stats['saves'] = 4
+            players.append({'player': {'id': offset + i, 'name': f'Jogador {offset + i}'}, 'statistics': stats})
+        return {'players': players}
+    return {'home': team(0), 'away': team(100)}
+
+
+def _load_payloads(directory: str | None):
+    if not directory:
+        return [_synthetic_statistics()], [_synthetic_lineups()]
+    statistics = [json.load(open(p, encoding='utf-8')) for p in glob.glob(os.path.join(directory, '*statistics.json'))]
+    lineups = [json.load(open(p, encoding='utf-8')) for p in glob.glob(os.path.join(directory, '*lineups.json'))]
+    return statistics or [_synthetic_statistics()], lineups or [_synthetic_lineups()]
+
+
+def main() -> None:
+    statistics, lineups = _load_payloads(sys.argv[1] if len(sys.argv) > 1 else None)
+    client = SofaScoreClient()
+    runs = 2000
+
+    for label, payloads, parse in (
+        ("event/{id}/statistics", statistics, client.get_team_stats_for_event),
+        ("event/{id}/lineups", lineups, client.get_player_stats_for_event),
+    ):
+        def run():
+            for payload in payloads:
+                client._make_request = lambda endpoint, payload=payload: payload
+                parse(0)
+        elapsed = timeit.timeit(run, number=runs)
+        total = runs * len(payloads)
+        print(f"{label}: {total / elapsed:,.0f} payloads/s ({elapsed / total * 1e6:.1f} µs/payload)")
+
+
+if __name__ == "__main__":
+    main()
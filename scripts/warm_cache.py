@@ -4,95 +4,93 @@ Script de aquecimento de cache para a aplicação SamsBet.
 Objetivo: Pré-carregar no cache (st.cache_data/HTTP cache interno do client) os dados
 necessários para que a página de análise de um jogo abra rapidamente durante o dia.
 
+As partidas rodam em paralelo (`--workers`) dividindo o mesmo limite de requisições,
+e cada etapa concluída fica num checkpoint: se a execução cair, rodar de novo no mesmo
+dia retoma de onde parou (`--fresh` ignora o checkpoint).
+
+Com `--schedule`, em vez de aquecer tudo de uma vez, segue a agenda do dia: cada
+partida é aquecida algumas horas antes do início e reaquecida perto do jogo, quando
+saem as escalações (o processo fica ativo até o último jogo).
+
+`--days N` aquece também os próximos N dias (amanhã completo; os demais de forma leve:
+evento, classificação, H2H e totais de temporada). `--leagues 17,8` troca as ligas
+principais por outra lista e `--all-leagues` inclui as demais, com prioridade menor.
+
 Execução sugerida: diariamente às 01:00 via agendador (cron/Linux, Task Scheduler/Windows, ou GitHub Actions).
+O dashboard já aquece em segundo plano (`warm_scheduler.get_warm_daemon`); as duas formas
+dividem a mesma trava de líder, então só um processo aquece por vez.
 
 Uso local (Windows PowerShell):
-  python -m scripts.warm_cache
+  python -m scripts.warm_cache [--workers 4] [--fresh] [--schedule] [--days 6] [--leagues 17,8] [--all-leagues]
 """
-from datetime import date
-from typing import Dict
+import argparse
 import sys
+from datetime import date
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 
 # Importa serviços diretamente (sem depender do Streamlit runner)
-from src.samsbet.constants import PRINCIPAL_LEAGUES_IDS
-from src.samsbet.services.match_service import get_daily_matches_dataframe
-from src.samsbet.services.stats_service import (
-    get_match_analysis_data,
-    get_goalkeeper_stats_for_match,
-    get_h2h_data,
-    get_summary_stats_for_event,
-    get_h2h_goalkeeper_analysis,
+from samsbet.core.leader_lock import LeaderLock
+from samsbet.services.warm_scheduler import WarmScheduler, schedule_daily_warm, schedule_lookahead
+from samsbet.services.warm_service import (
+    DEFAULT_LEAGUE_TIERS,
+    WARM_WORKERS,
+    LeagueTiers,
+    day_checkpoint,
+    run_daily_warm,
 )
 
 
-def warm_single_match(event_id: int, home_team: str, away_team: str, custom_id: str | None) -> None:
-    """Executa todas as consultas pesadas de uma partida para aquecer o cache."""
-    # 1) Dados de análise principal (times, jogadores, resumos, standings)
-    analysis = get_match_analysis_data(event_id, filter_by_location=False)
+def _acquire_leadership() -> LeaderLock | None:
+    # Mesma trava do daemon do dashboard: nunca aquecem dois processos ao mesmo tempo
+    lock = LeaderLock("warm_leader")
+    if lock.try_acquire():
+        return lock
+    print("Outro processo já está aquecendo o cache; nada a fazer.")
+    return None
 
-    # 2) Estatísticas de goleiros por time (temporada)
-    home_last_event_id = analysis.get("home_last_event_id") if analysis else None
-    away_last_event_id = analysis.get("away_last_event_id") if analysis else None
-    last_match_saves_map = analysis.get("last_match_saves_map") if analysis else None
-    _ = get_goalkeeper_stats_for_match(
-        event_id,
-        home_last_event_id=home_last_event_id,
-        away_last_event_id=away_last_event_id,
-        last_match_saves_map_prefetched=last_match_saves_map,
-    )
 
-    if not custom_id:
+def main(workers: int = WARM_WORKERS, resume: bool = True, days: int = 0,
+         league_tiers: LeagueTiers = DEFAULT_LEAGUE_TIERS) -> None:
+    lock = _acquire_leadership()
+    if lock is None:
         return
+    try:
+        run_daily_warm(workers=workers, resume=resume, days=days, league_tiers=league_tiers)
+    finally:
+        lock.release()
 
-    # 3) H2H básico (lista)
-    h2h_df = get_h2h_data(custom_id, home_team, away_team)
-    if h2h_df is None or h2h_df.empty:
-        return
 
-    # 4) Para cada H2H, carregar summary stats do evento (utilizado em várias seções)
-    detailed_stats_cache: Dict[int, Dict] = {}
-    for _, row in h2h_df.iterrows():
-        event_id_row = row.get("event_id")
-        # Skip quando o H2H indica ausência OU não fornece a flag
-        if row.get("hasEventPlayerStatistics") is not True:
-            continue
-        if event_id_row:
-            detailed_stats_cache[event_id_row] = get_summary_stats_for_event(event_id_row)
-
-    # 5) Análise específica de goleiros baseada no H2H (usa cache acima)
-    # Observação: aqui não passamos h2h_events brutos, pois o serviço já se vira com o custom_id
-    _ = get_h2h_goalkeeper_analysis(custom_id, home_team, away_team, h2h_events=None)
-
-
-def main() -> None:
-    today = date.today()
-    matches_df = get_daily_matches_dataframe(today)
-    if matches_df is None or matches_df.empty:
-        print("Nenhum jogo encontrado para hoje.")
+def run_schedule(workers: int = WARM_WORKERS, resume: bool = True, days: int = 0,
+                 league_tiers: LeagueTiers = DEFAULT_LEAGUE_TIERS) -> None:
+    lock = _acquire_leadership()
+    if lock is None:
         return
-
-    # Filtra pelas ligas principais
-    main_leagues_df = matches_df[matches_df["uniqueTournament_id"].isin(PRINCIPAL_LEAGUES_IDS)]
-
-    print(f"Aquecendo cache para {len(main_leagues_df)} partidas de ligas principais...")
-    for _, match in main_leagues_df.iterrows():
-        try:
-            event_id = match["event_id"]
-            home_team = match["home_team"]
-            away_team = match["away_team"]
-            custom_id = match.get("customId")
-            print(f" - {home_team} vs {away_team} (event_id={event_id})")
-            warm_single_match(event_id, home_team, away_team, custom_id)
-        except Exception as e:
-            print(f"Falha ao aquecer cache para o jogo event_id={match.get('event_id')}: {e}")
-
-    print("Aquecimento concluído.")
+    try:
+        scheduler = WarmScheduler(workers=workers, checkpoint=day_checkpoint(date.today(), resume=resume),
+                                  league_tiers=league_tiers)
+        print(f"{schedule_daily_warm(scheduler)} tarefas agendadas.")
+        if days:
+            print(f"{schedule_lookahead(scheduler, days=days)} jogos dos próximos {days} dias na fila.")
+        scheduler.run_until_idle()
+    finally:
+        lock.release()
 
 
 if __name__ == "__main__":
-    main()
-
-
+    parser = argparse.ArgumentParser(description="Aquece o cache das partidas do dia.")
+    parser.add_argument("--workers", type=int, default=WARM_WORKERS, help="partidas aquecidas em paralelo")
+    parser.add_argument("--fresh", action="store_true", help="ignora o checkpoint da rodada do dia")
+    parser.add_argument("--schedule", action="store_true", help="aquece cada partida conforme o horário do jogo")
+    parser.add_argument("--days", type=int, default=0, help="dias à frente aquecidos além de hoje")
+    parser.add_argument("--leagues", help="uniqueTournament_ids separados por vírgula (padrão: ligas principais)")
+    parser.add_argument("--all-leagues", action="store_true", help="inclui as demais ligas, com prioridade menor")
+    args = parser.parse_args()
+    tiers = ({int(ut) for ut in args.leagues.split(",")},) if args.leagues else tuple(DEFAULT_LEAGUE_TIERS)
+    if args.all_leagues:
+        tiers += (None,)
+    if args.schedule:
+        run_schedule(workers=args.workers, resume=not args.fresh, days=args.days, league_tiers=tiers)
+    else:
+        main(workers=args.workers, resume=not args.fresh, days=args.days, league_tiers=tiers)
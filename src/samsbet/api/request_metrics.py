@@ -0,0 +1,122 @@
+# samsbet/api/request_metrics.py
+
+import contextvars
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple, TypeVar
+
+import numpy as np
+
+# Métricas por família de endpoint (`event/{id}/lineups`, `team/{id}/events/last/{id}`...)
+# registradas pelo SofaScoreClient enquanto houver um RequestRecorder ativo. Servem aos
+# relatórios de aquecimento: requisições à rede vs. cache, bytes, espera no espaçamento
+# entre requisições, latência e falhas. O recorder vale só para o contexto de quem o
+# ativou (ContextVar): as páginas e o poller ao vivo do mesmo processo não entram no
+# relatório; os pools do aquecimento repassam o contexto com `bind_context`.
+_ID_SEGMENT = re.compile(r"(?<=/)(\d+|\d{4}-\d{2}-\d{2})(?=/|$)")
+_EVENT_SEGMENT = re.compile(r"^event/[^/]+")
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Endpoint sem os identificadores (ids numéricos, datas e o customId do H2H)."""
+    path = endpoint.split("?", 1)[0]
+    return _ID_SEGMENT.sub("{id}", _EVENT_SEGMENT.sub("event/{id}", path))
+
+
+class RequestRecorder:
+    """Acumula as métricas das requisições feitas enquanto está ativo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families: Dict[str, Dict[str, Any]] = {}
+
+    def _family(self, endpoint: str) -> Dict[str, Any]:
+        family = endpoint_family(endpoint)
+        if family not in self._families:
+            self._families[family] = {
+                "network": 0, "memory_hits": 0, "disk_hits": 0, "failures": 0,
+                "bytes": 0, "rate_wait_seconds": 0.0, "latencies": [],
+            }
+        return self._families[family]
+
+    def cache_hit(self, endpoint: str, kind: str) -> None:
+        with self._lock:
+            self._family(endpoint)[kind] += 1
+
+    def network(self, endpoint: str, latency: float, size: int, rate_wait: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._family(endpoint)
+            stats["network"] += 1
+            stats["failures"] += int(failed)
+            stats["bytes"] += size
+            stats["rate_wait_seconds"] += rate_wait
+            stats["latencies"].append(latency)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Família -> contagens, bytes, espera e percentis de latência (ms), mais a linha `total`."""
+        with self._lock:
+            families = {family: dict(stats, latencies=list(stats["latencies"]))
+                        for family, stats in self._families.items()}
+        all_latencies: List[float] = []
+        report = {}
+        for family, stats in sorted(families.items(), key=lambda item: -item[1]["network"]):
+            latencies = stats.pop("latencies")
+            all_latencies += latencies
+            report[family] = {**stats, **_latency_percentiles(latencies)}
+        totals = {key: sum(stats[key] for stats in report.values())
+                  for key in ("network", "memory_hits", "disk_hits", "failures", "bytes", "rate_wait_seconds")}
+        report["total"] = {**totals, **_latency_percentiles(all_latencies)}
+        for stats in report.values():
+            stats["rate_wait_seconds"] = round(stats["rate_wait_seconds"], 2)
+        return report
+
+
+def _latency_percentiles(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"latency_p50_ms": 0.0, "latency_p90_ms": 0.0, "latency_p99_ms": 0.0, "latency_max_ms": 0.0}
+    p50, p90, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 90, 99])
+    return {
+        "latency_p50_ms": round(float(p50), 1),
+        "latency_p90_ms": round(float(p90), 1),
+        "latency_p99_ms": round(float(p99), 1),
+        "latency_max_ms": round(max(latencies) * 1000, 1),
+    }
+
+
+_active: contextvars.ContextVar[Tuple[RequestRecorder, ...]] = contextvars.ContextVar(
+    "samsbet_request_recorders", default=()
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def active_recorders() -> List[RequestRecorder]:
+    return list(_active.get())
+
+
+@contextmanager
+def recording() -> Iterator[RequestRecorder]:
+    """
+    Registra as requisições feitas durante o bloco por este contexto (e pelas tarefas
+    que ele submete via `bind_context`).
+    """
+    recorder = RequestRecorder()
+    token = _active.set(_active.get() + (recorder,))
+    try:
+        yield recorder
+    finally:
+        _active.reset(token)
+
+
+def bind_context(fn: F) -> F:
+    """
+    `fn` rodando com as variáveis de contexto de quem chamou `bind_context` (ex.: o
+    recorder ativo), para submeter a um pool de threads. Cada chamada usa a sua própria
+    cópia do contexto, então a mesma função pode rodar em várias threads ao mesmo tempo.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run  # type: ignore[return-value]
@@ -2,6 +2,7 @@
 
 import time
 import os
+import threading
 import random
 import requests
 from typing import Dict, Any, List, Optional
@@ -9,15 +10,42 @@ from datetime import date
 import logging
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from samsbet.core.disk_cache import get_from_disk_cache, set_to_disk_cache
+from samsbet.core.disk_cache import delete_from_disk_cache, get_from_disk_cache, set_to_disk_cache
+from samsbet.api.request_metrics import active_recorders
+from samsbet.api.stats_parser import (
+    EVENT_STATISTICS_PARSER,
+    LINEUP_PLAYER_PARSER,
+    PlayerEventStats,
+    TeamEventStats,
+)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class SofaScoreClient:
     API_BASE_URL =  "https://samsbet-proxy.onrender.com" #"https://www.sofascore.com/api/v1"
     REQUEST_INTERVAL_SECONDS = 0.2
+    REQUEST_JITTER_SECONDS = 0.5
     # TTL máximo para persistência em disco (padrão: 24h)
     MAX_DISK_CACHE_TTL = int(os.environ.get("SAMSBET_DISK_CACHE_MAX_TTL", "86400"))
+    # Campos das consultas de `unique-tournament/{ut}/season/{s}/statistics`
+    PLAYER_STAT_FIELDS = ["totalShots", "shotsOnTarget", "appearances", "matchesStarted", "minutesPlayed"]
+    GOALKEEPER_STAT_FIELDS = ["saves", "savedShotsFromInsideTheBox", "savedShotsFromOutsideTheBox", "appearances", "cleanSheet"]
+    # Limite das consultas multi-time (elencos completos de dois times cabem folgados)
+    MULTI_TEAM_STATS_LIMIT = 100
+
+    # Espaçamento entre requisições compartilhado por TODAS as instâncias do processo:
+    # vários clients (um por MatchContext, workers em paralelo) dividem o mesmo orçamento
+    _rate_lock = threading.Lock()
+    _last_request_time = 0.0
+    # Contadores do processo: requisições à rede e acertos de cache (relatórios de aquecimento)
+    _stats_lock = threading.Lock()
+    _request_stats: Dict[str, int] = {"network": 0, "memory_hits": 0, "disk_hits": 0}
+
+    # Cache em memória do processo, compartilhado por todas as instâncias (como o rate
+    # limiter): endpoint -> (expires_at_epoch, data_json). Assim `invalidate` alcança
+    # também os clientes de vida longa (contextos de partida, poller ao vivo).
+    MAX_MEMORY_CACHE_ENTRIES = 5000
+    _cache: Dict[str, Any] = {}
 
     # ... (métodos __init__, _rate_limit, _make_request, get_scheduled_events, get_event_details não mudam) ...
     def __init__(self):
@@ -30,10 +58,6 @@ class SofaScoreClient:
             "Referer": "https://www.sofascore.com/",
             "Origin": "https://www.sofascore.com",
         })
-        self._last_request_time = 0
-        # Cache simples em memória: endpoint -> (expires_at_epoch, data_json)
-        self._cache: Dict[str, Any] = {}
-
         # Configura retries com backoff para erros transitórios e bloqueios temporários
         retry_strategy = Retry(
             total=3,
@@ -47,13 +71,38 @@ class SofaScoreClient:
         self.session.mount("http://", adapter)
 
     def _rate_limit(self):
+        # Serializa o espaçamento entre requisições de todas as threads e instâncias
+        with SofaScoreClient._rate_lock:
+            self._wait_for_slot()
+
+    def _wait_for_slot(self):
         current_time = time.time()
-        elapsed_time = current_time - self._last_request_time
+        elapsed_time = current_time - SofaScoreClient._last_request_time
         # Aplica jitter para evitar padrões previsíveis
-        interval_with_jitter = self.REQUEST_INTERVAL_SECONDS + random.uniform(0.0, 0.5)
+        interval_with_jitter = self.REQUEST_INTERVAL_SECONDS + random.uniform(0.0, self.REQUEST_JITTER_SECONDS)
         if elapsed_time < interval_with_jitter:
             time.sleep(interval_with_jitter - elapsed_time)
-        self._last_request_time = time.time()
+        SofaScoreClient._last_request_time = time.time()
+
+    @classmethod
+    def _count(cls, kind: str, endpoint: Optional[str] = None) -> None:
+        with cls._stats_lock:
+            cls._request_stats[kind] += 1
+        if endpoint is not None:
+            for recorder in active_recorders():
+                recorder.cache_hit(endpoint, kind)
+
+    @staticmethod
+    def _record_network(endpoint: str, started: float, size: int, rate_wait: float, failed: bool) -> None:
+        latency = time.time() - started
+        for recorder in active_recorders():
+            recorder.network(endpoint, latency, size, rate_wait, failed)
+
+    @classmethod
+    def request_stats(cls) -> Dict[str, int]:
+        """Totais do processo: requisições à rede e acertos dos caches em memória/disco."""
+        with cls._stats_lock:
+            return dict(cls._request_stats)
 
     def _get_ttl_for_endpoint(self, endpoint: str) -> int:
         """Define TTLs diferentes por tipo de recurso."""
@@ -73,17 +122,17 @@ class SofaScoreClient:
             return self.MAX_DISK_CACHE_TTL  # 15 min para detalhes de evento
         return self.MAX_DISK_CACHE_TTL  # padrão
 
-    def _make_request(self, endpoint: str) -> Dict[str, Any]:
-        self._rate_limit()
+    def _make_request(self, endpoint: str, refresh: bool = False) -> Dict[str, Any]:
+        """`refresh=True` ignora os caches na leitura (a resposta nova os substitui)."""
         url = f"{self.API_BASE_URL}/{endpoint}"
-        logging.info(f"Fazendo requisição para: {url}")
-        # Tenta cache primeiro
+        # Tenta cache primeiro (acertos de cache não consomem o espaçamento entre requisições)
         current_time = time.time()
-        cached = self._cache.get(endpoint)
+        cached = None if refresh else self._cache.get(endpoint)
         if cached:
             expires_at, data = cached
             if current_time < expires_at:
                 logging.info(f"Servindo do cache: {url}")
+                self._count("memory_hits", endpoint)
                 return data
             else:
                 # Expirou
@@ -91,12 +140,21 @@ class SofaScoreClient:
 
         # Tenta cache em disco compartilhado (namespaced p/ invalidar versões antigas)
         cache_key = f"v2:{endpoint}"
-        disk_cached = get_from_disk_cache(cache_key)
+        disk_cached = None if refresh else get_from_disk_cache(cache_key)
         if isinstance(disk_cached, dict) and disk_cached:
             logging.info(f"Servindo do cache em disco: {url}")
+            self._count("disk_hits", endpoint)
             return disk_cached
+
+        wait_started = time.time()
+        self._rate_limit()
+        rate_wait = time.time() - wait_started
+        logging.info(f"Fazendo requisição para: {url}")
+        self._count("network")
+        started, size, failed = time.time(), 0, True
         try:
             response = self.session.get(url, timeout=15)
+            size = len(response.content)
             # Trata bloqueios/rate-limit de forma graciosa para não derrubar o app
             if response.status_code in (403, 429):
                 logging.warning(
@@ -105,10 +163,11 @@ class SofaScoreClient:
                 return {}
             response.raise_for_status()
             data = response.json()
+            failed = False
             # Armazena no cache somente respostas não vazias
             if isinstance(data, dict) and data:
                 ttl = self._get_ttl_for_endpoint(endpoint)
-                self._cache[endpoint] = (current_time + ttl, data)
+                self._remember(endpoint, current_time + ttl, data)
                 # Persiste também em disco para compartilhar entre processos
                 try:
                     set_to_disk_cache(cache_key, data, min(ttl, self.MAX_DISK_CACHE_TTL))
@@ -126,16 +185,37 @@ class SofaScoreClient:
             except Exception:
                 pass
             return {}
+        finally:
+            self._record_network(endpoint, started, size, rate_wait, failed)
+
+    @classmethod
+    def _remember(cls, endpoint: str, expires_at: float, data: Dict[str, Any]) -> None:
+        """Guarda no cache em memória; acima do limite descarta os expirados e depois os mais antigos."""
+        cache = cls._cache
+        cache.pop(endpoint, None)
+        cache[endpoint] = (expires_at, data)
+        if len(cache) > cls.MAX_MEMORY_CACHE_ENTRIES:
+            now = time.time()
+            for key in [k for k, (expires, _) in list(cache.items()) if expires <= now]:
+                cache.pop(key, None)
+            while len(cache) > cls.MAX_MEMORY_CACHE_ENTRIES:
+                cache.pop(next(iter(cache)), None)
 
-    def get_scheduled_events(self, event_date: date) -> List[Dict[str, Any]]:
+    def invalidate(self, endpoints: List[str]) -> None:
+        """Descarta os endpoints dos caches em memória e em disco (a próxima leitura vai à API)."""
+        for endpoint in endpoints:
+            self._cache.pop(endpoint, None)
+            delete_from_disk_cache(f"v2:{endpoint}")
+
+    def get_scheduled_events(self, event_date: date, refresh: bool = False) -> List[Dict[str, Any]]:
         date_str = event_date.strftime('%Y-%m-%d')
         endpoint = f"sport/football/scheduled-events/{date_str}"
-        data = self._make_request(endpoint)
+        data = self._make_request(endpoint, refresh=refresh)
         return data.get("events", [])
     
-    def get_event_details(self, event_id: int) -> Dict[str, Any]:
+    def get_event_details(self, event_id: int, refresh: bool = False) -> Dict[str, Any]:
         endpoint = f"event/{event_id}"
-        data = self._make_request(endpoint)
+        data = self._make_request(endpoint, refresh=refresh)
         return data.get("event", {})
 
     def get_player_stats_for_team(
@@ -165,10 +245,12 @@ class SofaScoreClient:
         data = self._make_request(endpoint)
         return data.get("results", [])
 
-    def get_team_stats(self, team_id: int, uniqueTournament_id: int, season_id: int) -> Dict[str, Any]:
+    def get_team_stats(
+        self, team_id: int, uniqueTournament_id: int, season_id: int, refresh: bool = False
+    ) -> Dict[str, Any]:
         """Busca as estatísticas gerais de um time em um torneio/temporada."""
         endpoint = f"team/{team_id}/unique-tournament/{uniqueTournament_id}/season/{season_id}/statistics/overall"
-        data = self._make_request(endpoint)
+        data = self._make_request(endpoint, refresh=refresh)
         return data.get("statistics", {})
 
     def get_league_standings(self, tournament_id: int, season_id: int) -> Dict[str, Any]:
@@ -176,69 +258,32 @@ class SofaScoreClient:
         endpoint = f"tournament/{tournament_id}/season/{season_id}/standings/total"
         return self._make_request(endpoint)
 
+    def get_team_last_events(self, team_id: int, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Página inteira dos últimos eventos de um time (ordem cronológica)."""
+        endpoint = f"team/{team_id}/events/last/0"
+        data = self._make_request(endpoint, refresh=refresh)
+        return data.get("events", [])
+
     def get_team_last_event(self, team_id: int) -> Dict[str, Any]:
         """Busca a lista dos últimos eventos de um time e retorna o mais recente."""
-        endpoint = f"team/{team_id}/events/last/0"
-        data = self._make_request(endpoint)
-        events = data.get("events", [])
+        events = self.get_team_last_events(team_id)
         if events:
             return events[-1]
         return {}
 
-    def get_team_stats_for_event(self, event_id: int) -> Dict[str, Dict[str, Any]]:
+    def get_team_stats_for_event(self, event_id: int, refresh: bool = False) -> Dict[str, TeamEventStats]:
         """
         Obtém dados de estatísticas gerais de um evento (apenas tempo regulamentar - 1ST + 2ND).
+        O mapeamento (grupo, chave) -> campo fica em `stats_parser.EVENT_STATISTICS_SPEC`.
         """
         endpoint = f"event/{event_id}/statistics"
         default_stats = {
-            'home': {
-                #Shots
-                'total_shots': 0,
-                'shots_on_target': 0,
-                'hit_woodwork': 0, #chutes na trave
-                #Match overview
-                'expected_goals': 0.0, #expectativa de gols (float)
-                'corner_kicks': 0, #escanteios
-                'fouls': 0,
-                'yellow_cards': 0,
-                'red_cards': 0,
-                'ball_possession': 0,
-                #Attack
-                'offsides': 0, #impedimento
-                #Passes
-                'throw_ins': 0, #laterais
-                #Defending
-                'total_tackles': 0, #desarmes
-                #Goalkeeping
-                'goal_kicks': 0, #tiro de meta
-                'saves': 0
-            },
-            'away': {
-                #Shots
-                'total_shots': 0,
-                'shots_on_target': 0,
-                'hit_woodwork': 0, #chutes na trave
-                #Match overview
-                'expected_goals': 0.0, #expectativa de gols (float)
-                'corner_kicks': 0, #escanteios
-                'fouls': 0,
-                'yellow_cards': 0,
-                'red_cards': 0,
-                'ball_possession': 0,
-                #Attack
-                'offsides': 0, #impedimento
-                #Passes
-                'throw_ins': 0, #laterais
-                #Defending
-                'total_tackles': 0, #desarmes
-                #Goalkeeping
-                'goal_kicks': 0, #tiro de meta
-                'saves': 0
-            }
-        }   
+            'home': dict(EVENT_STATISTICS_PARSER.defaults),
+            'away': dict(EVENT_STATISTICS_PARSER.defaults),
+        }
 
         try:
-            data = self._make_request(endpoint)
+            data = self._make_request(endpoint, refresh=refresh)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 logging.warning(f"Dados de estatísticas não encontrados para o evento {event_id} (404).")
@@ -249,155 +294,36 @@ class SofaScoreClient:
         if not data or 'statistics' not in data or not data.get('statistics'):
             return default_stats
 
-        # Função auxiliar para processar um período
-        def process_period(period_groups, stats_dict):
-            for group in period_groups:
-                group_name = group.get('groupName', '')
-                
-                # Extrai estatísticas de Shots
-                if group_name == 'Shots':
-                    for stat in group.get('statisticsItems', []):
-                        key = stat.get('key', '')
-                        home_value = stat.get('homeValue', 0)
-                        away_value = stat.get('awayValue', 0)
-                        
-                        if key == 'totalShotsOnGoal':
-                            stats_dict['home']['total_shots'] += home_value
-                            stats_dict['away']['total_shots'] += away_value
-                        elif key == 'shotsOnGoal':
-                            stats_dict['home']['shots_on_target'] += home_value
-                            stats_dict['away']['shots_on_target'] += away_value
-                        elif key == 'hitWoodwork':
-                            stats_dict['home']['hit_woodwork'] += home_value
-                            stats_dict['away']['hit_woodwork'] += away_value
-                
-                # Extrai estatísticas de Goalkeeping
-                elif group_name == 'Goalkeeping':
-                    for stat in group.get('statisticsItems', []):
-                        key = stat.get('key', '')
-                        home_value = stat.get('homeValue', 0)
-                        away_value = stat.get('awayValue', 0)
-                        
-                        if key == 'goalkeeperSaves':
-                            stats_dict['home']['saves'] += home_value
-                            stats_dict['away']['saves'] += away_value
-                        elif key == 'goalKicks':
-                            stats_dict['home']['goal_kicks'] += home_value
-                            stats_dict['away']['goal_kicks'] += away_value
-
-                # Extrai estatísticas de Match Overview
-                elif group_name == 'Match overview':
-                    for stat in group.get('statisticsItems', []):
-                        key = stat.get('key', '')
-                        home_value = stat.get('homeValue', 0)
-                        away_value = stat.get('awayValue', 0)
-
-                        if key == 'expectedGoals':
-                            stats_dict['home']['expected_goals'] += float(home_value)
-                            stats_dict['away']['expected_goals'] += float(away_value)
-                        elif key == 'cornerKicks':
-                            stats_dict['home']['corner_kicks'] += home_value
-                            stats_dict['away']['corner_kicks'] += away_value
-                        elif key == 'fouls':
-                            stats_dict['home']['fouls'] += home_value
-                            stats_dict['away']['fouls'] += away_value
-                        elif key == 'yellowCards':
-                            stats_dict['home']['yellow_cards'] += home_value
-                            stats_dict['away']['yellow_cards'] += away_value
-                        elif key == 'redCards':
-                            stats_dict['home']['red_cards'] += home_value
-                            stats_dict['away']['red_cards'] += away_value
-                        elif key == 'ballPossession':
-                            # Para posse de bola, fazemos média ao invés de somar
-                            stats_dict['home']['ball_possession'] += home_value / 2
-                            stats_dict['away']['ball_possession'] += away_value / 2
-        
-                # Extrai estatísticas de Attack
-                elif group_name == 'Attack':
-                    for stat in group.get('statisticsItems', []):
-                        key = stat.get('key', '')
-                        home_value = stat.get('homeValue', 0)
-                        away_value = stat.get('awayValue', 0)
-
-                        if key == 'offsides':
-                            stats_dict['home']['offsides'] += home_value
-                            stats_dict['away']['offsides'] += away_value
-
-                # Extrai estatísticas de Passes
-                elif group_name == 'Passes':
-                    for stat in group.get('statisticsItems', []):
-                        key = stat.get('key', '')
-                        home_value = stat.get('homeValue', 0)
-                        away_value = stat.get('awayValue', 0)
-                        
-                        if key == 'throwIns':
-                            stats_dict['home']['throw_ins'] += home_value
-                            stats_dict['away']['throw_ins'] += away_value
-                
-                # Extrai estatísticas de Defending
-                elif group_name == 'Defending':
-                    for stat in group.get('statisticsItems', []):
-                        key = stat.get('key', '')
-                        home_value = stat.get('homeValue', 0)
-                        away_value = stat.get('awayValue', 0)
-                        
-                        if key == 'totalTackle':
-                            stats_dict['home']['total_tackles'] += home_value
-                            stats_dict['away']['total_tackles'] += away_value
-
-        # Alguns eventos trazem apenas período agregado (ex.: 'ALL')
-        periods = data['statistics']
-        has_first_second = any(p.get('period') in ['1ST', '2ND'] for p in periods)
-        for period_data in periods:
-            period = period_data.get('period')
-            if has_first_second:
-                if period in ['1ST', '2ND']:
-                    groups = period_data.get('groups', [])
-                    process_period(groups, default_stats)
-            else:
-                # Se não houver 1ST/2ND, processa todos os períodos disponíveis (ex.: 'ALL')
-                groups = period_data.get('groups', ['ALL'])
-                process_period(groups, default_stats)
-        
-        # Arredonda valores finais
-        default_stats['home']['expected_goals'] = round(default_stats['home']['expected_goals'], 2)
-        default_stats['away']['expected_goals'] = round(default_stats['away']['expected_goals'], 2)
-        default_stats['home']['ball_possession'] = round(default_stats['home']['ball_possession'])
-        default_stats['away']['ball_possession'] = round(default_stats['away']['ball_possession'])
-        
-        return default_stats
+        return EVENT_STATISTICS_PARSER.parse_periods(data['statistics'])
 
-    def get_player_stats_for_event(self, event_id: int) -> Dict[str, List[Dict[str, Any]]]:
-        """Obtém dados de estatísticas de um evento, tratando o erro 404 graciosamente."""
+    def get_event_lineups(self, event_id: int, refresh: bool = False) -> Dict[str, Any]:
+        """Escalações do evento como vêm da API (`confirmed`, `home`, `away`); vazio se ainda não publicadas."""
         endpoint = f"event/{event_id}/lineups"
-        event_stats_data = {'home': [], 'away': []}
         try:
-            data = self._make_request(endpoint)
+            return self._make_request(endpoint, refresh=refresh)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 logging.warning(f"Dados de lineup não encontrados para o evento {event_id} (404).")
-                return event_stats_data # Retorna vazio se não encontrar
+                return {} # Retorna vazio se não encontrar
             else:
                 raise # Lança outros erros HTTP
-        
+
+    def get_player_stats_for_event(self, event_id: int, refresh: bool = False) -> Dict[str, List[PlayerEventStats]]:
+        """Obtém dados de estatísticas de um evento, tratando o erro 404 graciosamente."""
+        event_stats_data = {'home': [], 'away': []}
+        data = self.get_event_lineups(event_id, refresh=refresh)
         if not data:
             return event_stats_data
             
         for team_type in ['home', 'away']:
             if team_type in data and 'players' in data[team_type]:
                 for player in data[team_type]['players']:
-                    stats = player.get('statistics', {})
-                    player_info = player.get('player', {})
-                    shots_on_target = stats.get('onTargetScoringAttempt', 0)
-                    shots_off_target = stats.get('shotOffTarget', 0)
-                    shots_blocked = stats.get('blockedScoringAttempt', 0)
-                    total_shots = shots_on_target + shots_off_target + shots_blocked
-                    saves = stats.get('saves', 0)
-
-                    if total_shots > 0 or saves > 0:
+                    stats = LINEUP_PLAYER_PARSER.parse_values(player.get('statistics', {}))
+                    if stats['total_shots'] > 0 or stats['saves'] > 0:
+                        player_info = player.get('player', {})
                         event_stats_data[team_type].append({
                             'player_id': player_info.get('id'), 'player_name': player_info.get('name'),
-                            'shots_on_target': shots_on_target, 'total_shots': total_shots, 'saves': saves
+                            **stats
                         })
         return event_stats_data
 
@@ -425,6 +351,115 @@ class SofaScoreClient:
         data = self._make_request(endpoint)
         return data.get("results", [])
 
+    def _split_results_by_team(
+        self, results: List[Dict[str, Any]], team_ids: List[int], per_team_limit: Optional[int] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Separa as linhas de `statistics` por `team.id`, mantendo a ordenação da consulta."""
+        split: Dict[int, List[Dict[str, Any]]] = {team_id: [] for team_id in team_ids}
+        for row in results:
+            team_id = row.get("team", {}).get("id")
+            if team_id is None and len(team_ids) == 1:
+                team_id = team_ids[0]
+            rows = split.get(team_id)
+            if rows is not None and (per_team_limit is None or len(rows) < per_team_limit):
+                rows.append(row)
+        return split
+
+    def get_player_stats_for_teams(
+        self,
+        uniqueTournament_id: int,
+        season_id: int,
+        team_ids: List[int],
+        match_type: Optional[str] = None,
+        include_goalkeeper_fields: bool = False,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Estatísticas dos jogadores de vários times em UMA requisição (`team.in.{a}~{b}`),
+        separadas localmente por time (team_id -> linhas, no mesmo formato de
+        `get_player_stats_for_team`, com no máximo 30 jogadores por time).
+
+        Com `include_goalkeeper_fields`, a consulta também traz os campos de goleiro,
+        para que `goalkeepers_from_player_rows` dispense a consulta de goleiros.
+        """
+        team_ids = [team_id for team_id in team_ids if team_id]
+        if not team_ids:
+            return {}
+        filters_list = [f"team.in.{'~'.join(str(team_id) for team_id in team_ids)}"]
+        if match_type in ["home", "away"]:
+            filters_list.insert(0, f"type.EQ.{match_type}")
+        filters_str = "%2C".join(filters_list)
+
+        fields = self.PLAYER_STAT_FIELDS
+        if include_goalkeeper_fields:
+            fields = fields + [f for f in self.GOALKEEPER_STAT_FIELDS if f not in fields]
+
+        # Limite folgado: com o elenco inteiro dos times na resposta, o top 30 de cada um fica completo
+        endpoint = (
+            f"unique-tournament/{uniqueTournament_id}/season/{season_id}/statistics"
+            f"?limit={self.MULTI_TEAM_STATS_LIMIT}&order=-totalShots&accumulation=total"
+            f"&fields={'%2C'.join(fields)}"
+            f"&filters={filters_str}"
+        )
+        data = self._make_request(endpoint)
+        per_team_limit = None if include_goalkeeper_fields else 30
+        return self._split_results_by_team(data.get("results", []), team_ids, per_team_limit)
+
+    def get_goalkeeper_stats_for_teams(
+        self,
+        uniqueTournament_id: int,
+        season_id: int,
+        team_ids: List[int],
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Estatísticas de GOLEIROS de vários times em uma requisição, separadas por time."""
+        team_ids = [team_id for team_id in team_ids if team_id]
+        if not team_ids:
+            return {}
+        filters_str = f"position.in.G%2Cteam.in.{'~'.join(str(team_id) for team_id in team_ids)}"
+        endpoint = (
+            f"unique-tournament/{uniqueTournament_id}/season/{season_id}/statistics"
+            f"?limit={10 * len(team_ids)}&order=-rating&accumulation=total"
+            f"&fields={'%2C'.join(self.GOALKEEPER_STAT_FIELDS)}"
+            f"&filters={filters_str}"
+        )
+        data = self._make_request(endpoint)
+        return self._split_results_by_team(data.get("results", []), team_ids, per_team_limit=10)
+
+    def get_season_player_stats_page(
+        self,
+        uniqueTournament_id: int,
+        season_id: int,
+        fields: List[str],
+        offset: int = 0,
+        limit: int = 100,
+        order: str = "-totalShots",
+        filters: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Uma página das estatísticas de jogadores de TODA a competição/temporada.
+        Retorna o payload bruto (`results`, `page`, `pages`) para que o chamador pagine.
+        """
+        endpoint = (
+            f"unique-tournament/{uniqueTournament_id}/season/{season_id}/statistics"
+            f"?limit={limit}&offset={offset}&order={order}&accumulation=total"
+            f"&fields={'%2C'.join(fields)}"
+        )
+        if filters:
+            endpoint += f"&filters={'%2C'.join(filters)}"
+        return self._make_request(endpoint)
+
+    @staticmethod
+    def goalkeepers_from_player_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Goleiros de uma consulta de jogadores com campos de goleiro: posição 'G' quando a
+        API informa, senão quem registrou defesas ou jogos sem sofrer gol.
+        """
+        goalkeepers = []
+        for row in rows:
+            position = row.get("player", {}).get("position")
+            if position == "G" or (position is None and (row.get("saves") or row.get("cleanSheet"))):
+                goalkeepers.append(row)
+        return goalkeepers
+
     def get_h2h_events(self, custom_id: str) -> List[Dict[str, Any]]:
         """Busca o histórico de confrontos diretos (H2H) para um evento."""
         endpoint = f"event/{custom_id}/h2h/events"
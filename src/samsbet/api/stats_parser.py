@@ -0,0 +1,166 @@
+# samsbet/api/stats_parser.py
+
+from typing import Any, Dict, Hashable, Iterable, List, Tuple, TypedDict
+
+
+class TeamEventStats(TypedDict):
+    """Estatísticas de um time em um evento (tempo regulamentar)."""
+    total_shots: int
+    shots_on_target: int
+    hit_woodwork: int  # chutes na trave
+    shots_inside_box: int  # chutes de dentro da área
+    big_chances: int  # grandes chances criadas
+    expected_goals: float  # expectativa de gols
+    corner_kicks: int  # escanteios
+    fouls: int
+    yellow_cards: int
+    red_cards: int
+    ball_possession: int
+    offsides: int  # impedimento
+    throw_ins: int  # laterais
+    total_tackles: int  # desarmes
+    goal_kicks: int  # tiro de meta
+    saves: int
+
+
+class PlayerEventStats(TypedDict):
+    """Estatísticas de finalização/defesa de um jogador em um evento (via lineups)."""
+    player_id: int
+    player_name: str
+    shots_on_target: int
+    total_shots: int
+    saves: int
+
+
+# Agregações suportadas entre períodos (1ST + 2ND)
+SUM = 'sum'
+MEAN = 'mean'
+
+# (groupName, key) -> (campo, agregação) para `event/{id}/statistics`
+EVENT_STATISTICS_SPEC: List[Tuple[Tuple[str, str], str, str]] = [
+    # Shots
+    (('Shots', 'totalShotsOnGoal'), 'total_shots', SUM),
+    (('Shots', 'shotsOnGoal'), 'shots_on_target', SUM),
+    (('Shots', 'hitWoodwork'), 'hit_woodwork', SUM),
+    (('Shots', 'totalShotsInsideBox'), 'shots_inside_box', SUM),
+    # Goalkeeping
+    (('Goalkeeping', 'goalkeeperSaves'), 'saves', SUM),
+    (('Goalkeeping', 'goalKicks'), 'goal_kicks', SUM),
+    # Match overview
+    (('Match overview', 'expectedGoals'), 'expected_goals', SUM),
+    (('Match overview', 'bigChanceCreated'), 'big_chances', SUM),
+    (('Match overview', 'cornerKicks'), 'corner_kicks', SUM),
+    (('Match overview', 'fouls'), 'fouls', SUM),
+    (('Match overview', 'yellowCards'), 'yellow_cards', SUM),
+    (('Match overview', 'redCards'), 'red_cards', SUM),
+    (('Match overview', 'ballPossession'), 'ball_possession', MEAN),
+    # Attack
+    (('Attack', 'offsides'), 'offsides', SUM),
+    # Passes
+    (('Passes', 'throwIns'), 'throw_ins', SUM),
+    # Defending
+    (('Defending', 'totalTackle'), 'total_tackles', SUM),
+]
+
+# key -> (campo, agregação) para as estatísticas de cada jogador em `event/{id}/lineups`
+LINEUP_PLAYER_SPEC: List[Tuple[str, str, str]] = [
+    ('onTargetScoringAttempt', 'shots_on_target', SUM),
+    ('onTargetScoringAttempt', 'total_shots', SUM),
+    ('shotOffTarget', 'total_shots', SUM),
+    ('blockedScoringAttempt', 'total_shots', SUM),
+    ('saves', 'saves', SUM),
+]
+
+TEAM_EVENT_DEFAULTS: Dict[str, Any] = {
+    'total_shots': 0, 'shots_on_target': 0, 'hit_woodwork': 0, 'shots_inside_box': 0, 'big_chances': 0,
+    'expected_goals': 0.0,
+    'corner_kicks': 0, 'fouls': 0, 'yellow_cards': 0, 'red_cards': 0, 'ball_possession': 0,
+    'offsides': 0, 'throw_ins': 0, 'total_tackles': 0, 'goal_kicks': 0, 'saves': 0,
+}
+
+
+class StatisticsParser:
+    """
+    Parser declarativo: compila uma lista de regras (chave de origem -> campo, agregação)
+    em dicionários de lookup, de modo que cada item do payload custa uma única busca e
+    grupos sem regras são pulados inteiros. Uma mesma chave de origem pode alimentar
+    vários campos (ex.: total de chutes).
+    """
+
+    def __init__(self, spec: Iterable[Tuple[Hashable, str, str]], defaults: Dict[str, Any]):
+        self.defaults = dict(defaults)
+        self._lookup: Dict[Hashable, Tuple[str, ...]] = {}
+        self._mean_fields = set()
+        for source_key, field, aggregation in spec:
+            if aggregation not in (SUM, MEAN):
+                raise ValueError(f"Agregação desconhecida: {aggregation}")
+            self._lookup[source_key] = self._lookup.get(source_key, ()) + (field,)
+            if aggregation == MEAN:
+                self._mean_fields.add(field)
+        self._float_fields = {f for f, v in self.defaults.items() if isinstance(v, float)}
+        # Chaves (grupo, chave) viram um lookup de dois níveis: grupo -> chave -> campos
+        self._groups: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        for source_key, fields in self._lookup.items():
+            if isinstance(source_key, tuple):
+                group_name, key = source_key
+                self._groups.setdefault(group_name, {})[key] = fields
+        # Chaves simples viram pares (chave, campo) achatados, percorridos em ordem fixa
+        self._flat_pairs = [(k, f) for k, fields in self._lookup.items() if not isinstance(k, tuple) for f in fields]
+        self._flat_keys = frozenset(k for k, _ in self._flat_pairs)
+
+    def parse_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Processa um dicionário plano {chave: valor} (ex.: estatísticas de um jogador)."""
+        record = self.defaults.copy()
+        if self._flat_keys.isdisjoint(values):
+            return record
+        get = values.get
+        for key, field in self._flat_pairs:
+            value = get(key)
+            if value:
+                record[field] += value
+        return record
+
+    def parse_periods(self, periods: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Processa `statistics` de um evento em uma única passada, agregando home e away.
+        Usa apenas 1ST + 2ND (tempo regulamentar); se o evento só trouxer o período
+        agregado (ex.: 'ALL'), usa os períodos disponíveis.
+        """
+        home = dict(self.defaults)
+        away = dict(self.defaults)
+        has_first_second = any(p.get('period') in ('1ST', '2ND') for p in periods)
+        selected = [p for p in periods if not has_first_second or p.get('period') in ('1ST', '2ND')]
+
+        groups_lookup = self._groups
+        float_fields = self._float_fields
+        for period_data in selected:
+            for group in period_data.get('groups', []):
+                lookup = groups_lookup.get(group.get('groupName', ''))
+                if not lookup:
+                    continue
+                for stat in group.get('statisticsItems', []):
+                    fields = lookup.get(stat.get('key', ''))
+                    if not fields:
+                        continue
+                    home_value = stat.get('homeValue', 0) or 0
+                    away_value = stat.get('awayValue', 0) or 0
+                    for field in fields:
+                        if field in float_fields:
+                            home[field] += float(home_value)
+                            away[field] += float(away_value)
+                        else:
+                            home[field] += home_value
+                            away[field] += away_value
+
+        # Média entre os períodos processados (ex.: posse de bola) e arredondamento final
+        n_periods = max(len(selected), 1)
+        for record in (home, away):
+            for field in self._mean_fields:
+                record[field] = round(record[field] / n_periods)
+            for field in float_fields:
+                record[field] = round(record[field], 2)
+        return {'home': home, 'away': away}
+
+
+EVENT_STATISTICS_PARSER = StatisticsParser(EVENT_STATISTICS_SPEC, TEAM_EVENT_DEFAULTS)
+LINEUP_PLAYER_PARSER = StatisticsParser(LINEUP_PLAYER_SPEC, {'shots_on_target': 0, 'total_shots': 0, 'saves': 0})
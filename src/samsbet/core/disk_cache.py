@@ -2,7 +2,7 @@ import os
 import json
 import time
 import hashlib
-from typing import Any
+from typing import Any, Optional
 
 
 def _get_cache_dir() -> str:
@@ -52,3 +52,16 @@ def set_to_disk_cache(key: str, value: Any, ttl_seconds: int) -> None:
         pass
 
 
+def get_disk_cache_mtime(key: str) -> Optional[float]:
+    """Horário da última gravação da chave (sem ler o conteúdo), ou None se não existe."""
+    try:
+        return os.path.getmtime(_key_to_path(key))
+    except OSError:
+        return None
+
+
+def delete_from_disk_cache(key: str) -> None:
+    try:
+        os.remove(_key_to_path(key))
+    except OSError:
+        pass
@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from samsbet.core.disk_cache import get_from_disk_cache, set_to_disk_cache
+
+# Índice compacto event_id -> contexto do evento, alimentado pelo payload de
+# `scheduled-events/{date}`. Evita a ida ao `event/{id}` quando o jogo já é conhecido.
+_INDEX_CACHE_KEY = "v2:event_context_index"
+_INDEX_TTL_SECONDS = 7 * 86400
+# Eventos que começaram há mais tempo que isso são descartados do índice
+_INDEX_RETENTION_SECONDS = 3 * 86400
+
+# Releitura do disco em caso de miss (outro processo pode ter indexado o schedule)
+_DISK_RELOAD_INTERVAL_SECONDS = 60
+
+# O índice é compartilhado pelas threads do warm e pelas sessões do Streamlit
+_memory_index: Dict[int, Dict[str, Any]] = {}
+_disk_loaded_at = 0.0
+_index_lock = threading.Lock()
+
+
+def event_context_from_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Extrai o contexto mínimo de um evento (schedule ou `event/{id}`)."""
+    if not event:
+        return {}
+    tournament = event.get("tournament", {})
+    return {
+        "event_id": event.get("id"),
+        "tournament_id": tournament.get("id"),
+        "tournament_name": tournament.get("name"),
+        "uniqueTournament_id": tournament.get("uniqueTournament", {}).get("id"),
+        "season_id": event.get("season", {}).get("id"),
+        "home_team_id": event.get("homeTeam", {}).get("id"),
+        "away_team_id": event.get("awayTeam", {}).get("id"),
+        "customId": event.get("customId"),
+        "start_timestamp": event.get("startTimestamp"),
+    }
+
+
+def _is_complete(context: Dict[str, Any]) -> bool:
+    return all(context.get(k) for k in ("tournament_id", "season_id", "home_team_id", "away_team_id"))
+
+
+def _merge_disk_index() -> None:
+    """Mescla o índice em disco no de memória. Chamar com `_index_lock` adquirido."""
+    global _disk_loaded_at
+    _disk_loaded_at = time.time()
+    stored = get_from_disk_cache(_INDEX_CACHE_KEY)
+    if isinstance(stored, dict):
+        for event_id, context in stored.items():
+            _memory_index.setdefault(int(event_id), context)
+
+
+def _load_disk_index(force: bool = False) -> None:
+    """Releitura limitada por `_DISK_RELOAD_INTERVAL_SECONDS`. Chamar com `_index_lock` adquirido."""
+    if _disk_loaded_at and not (force and time.time() - _disk_loaded_at >= _DISK_RELOAD_INTERVAL_SECONDS):
+        return
+    _merge_disk_index()
+
+
+def store_event_contexts(events: List[Dict[str, Any]]) -> int:
+    """
+    Indexa os eventos do schedule (em memória e no cache em disco compartilhado).
+    Retorna quantos eventos completos foram indexados.
+    """
+    contexts = [event_context_from_event(event) for event in events]
+    contexts = [c for c in contexts if c.get("event_id") and _is_complete(c)]
+
+    with _index_lock:
+        # Sempre relê o disco antes de regravar: outro processo pode ter indexado
+        # outros dias desde a última leitura, e a gravação substitui o arquivo inteiro.
+        _merge_disk_index()
+        for context in contexts:
+            _memory_index[context["event_id"]] = context
+
+        cutoff = time.time() - _INDEX_RETENTION_SECONDS
+        for event_id in [e for e, c in _memory_index.items() if (c.get("start_timestamp") or 0) < cutoff]:
+            _memory_index.pop(event_id, None)
+
+        set_to_disk_cache(_INDEX_CACHE_KEY, {str(k): v for k, v in _memory_index.items()}, _INDEX_TTL_SECONDS)
+    return len(contexts)
+
+
+def get_event_context(event_id: int) -> Optional[Dict[str, Any]]:
+    """Contexto do evento se ele já foi visto em algum schedule; senão None."""
+    if event_id is None:
+        return None
+    with _index_lock:
+        context = _memory_index.get(int(event_id))
+        if context is None:
+            _load_disk_index(force=True)
+            context = _memory_index.get(int(event_id))
+    return context
@@ -0,0 +1,246 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from samsbet.api.stats_parser import TEAM_EVENT_DEFAULTS
+from samsbet.core.disk_cache import _get_cache_dir
+
+# Armazém local e permanente das estatísticas de jogos FINALIZADOS (não mudam mais).
+# Só recebe inserções; H2H e forma leem daqui em vez de refazer a requisição quando
+# o cache de 24h expira. Também guarda os totais de temporada mantidos de forma
+# incremental (`team_season_totals`, atualizados a cada jogo novo).
+TEAM_STAT_COLUMNS = list(TEAM_EVENT_DEFAULTS)
+PLAYER_STAT_COLUMNS = ['shots_on_target', 'total_shots', 'saves']
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS events (
+    event_id INTEGER PRIMARY KEY,
+    start_timestamp INTEGER,
+    unique_tournament_id INTEGER,
+    season_id INTEGER,
+    home_team_id INTEGER,
+    away_team_id INTEGER,
+    home_score INTEGER,
+    away_score INTEGER
+);
+CREATE TABLE IF NOT EXISTS team_event_stats (
+    event_id INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    team_id INTEGER,
+    start_timestamp INTEGER,
+    {', '.join(f'{c} REAL' for c in TEAM_STAT_COLUMNS)},
+    PRIMARY KEY (event_id, side)
+);
+CREATE TABLE IF NOT EXISTS player_event_stats (
+    event_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    team_id INTEGER,
+    player_name TEXT,
+    start_timestamp INTEGER,
+    {', '.join(f'{c} INTEGER' for c in PLAYER_STAT_COLUMNS)},
+    PRIMARY KEY (event_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS player_events_loaded (event_id INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS team_season_totals (
+    team_id INTEGER NOT NULL,
+    unique_tournament_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    totals TEXT NOT NULL,
+    folded_event_ids TEXT NOT NULL,
+    reconciled_at REAL NOT NULL,
+    PRIMARY KEY (team_id, unique_tournament_id, season_id)
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events (start_timestamp);
+CREATE INDEX IF NOT EXISTS idx_team_stats_team ON team_event_stats (team_id, start_timestamp);
+CREATE INDEX IF NOT EXISTS idx_player_stats_player ON player_event_stats (player_id, start_timestamp);
+CREATE INDEX IF NOT EXISTS idx_player_stats_team ON player_event_stats (team_id, start_timestamp);
+"""
+
+_local = threading.local()
+
+
+def _get_store_path() -> str:
+    return os.environ.get("SAMSBET_EVENT_STORE") or os.path.join(_get_cache_dir(), "event_store.sqlite3")
+
+
+def _connection() -> sqlite3.Connection:
+    """Uma conexão por thread (e por caminho), com o schema garantido."""
+    path = _get_store_path()
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != path:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _add_missing_columns(conn)
+        _local.conn, _local.path = conn, path
+    return conn
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    """Bancos criados antes de novos campos do parser ganham as colunas (linhas antigas ficam NULL)."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(team_event_stats)")}
+    with conn:
+        for column in TEAM_STAT_COLUMNS:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE team_event_stats ADD COLUMN {column} REAL")
+
+
+def is_finished(event: Dict[str, Any]) -> bool:
+    return event.get("status", {}).get("type") == "finished"
+
+
+def _store_event(conn: sqlite3.Connection, event: Dict[str, Any]) -> None:
+    tournament = event.get("tournament", {})
+    conn.execute(
+        "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            event.get("id"),
+            event.get("startTimestamp"),
+            tournament.get("uniqueTournament", {}).get("id"),
+            event.get("season", {}).get("id"),
+            event.get("homeTeam", {}).get("id"),
+            event.get("awayTeam", {}).get("id"),
+            event.get("homeScore", {}).get("current"),
+            event.get("awayScore", {}).get("current"),
+        ),
+    )
+
+
+def put_team_event_stats(event: Dict[str, Any], stats: Dict[str, Dict[str, Any]]) -> bool:
+    """Grava as estatísticas de time de um evento finalizado (ignora eventos em andamento ou vazios)."""
+    if not event.get("id") or not is_finished(event):
+        return False
+    # Payload vazio (404/bloqueio) vira só zeros: não pode ser gravado como definitivo
+    if not any(stats.get("home", {}).values()) and not any(stats.get("away", {}).values()):
+        return False
+    conn = _connection()
+    with conn:
+        _store_event(conn, event)
+        placeholders = ", ".join("?" * (4 + len(TEAM_STAT_COLUMNS)))
+        # Jogo já gravado só tem preenchidas as colunas que ainda estavam NULL (linhas antigas)
+        conn.executemany(
+            f"INSERT INTO team_event_stats (event_id, side, team_id, start_timestamp, "
+            f"{', '.join(TEAM_STAT_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT (event_id, side) DO UPDATE SET "
+            f"{', '.join(f'{c} = COALESCE({c}, excluded.{c})' for c in TEAM_STAT_COLUMNS)}",
+            [
+                (event["id"], side, event.get(f"{side}Team", {}).get("id"), event.get("startTimestamp"),
+                 *(stats[side].get(c, 0) for c in TEAM_STAT_COLUMNS))
+                for side in ("home", "away")
+            ],
+        )
+    return True
+
+
+def get_team_event_stats(event_id: int) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Estatísticas de time ({'home': ..., 'away': ...}) de um evento armazenado, ou None.
+    Linhas gravadas antes de uma coluna nova existir (NULL) contam como desconhecidas:
+    retorna None para que o evento seja buscado de novo, em vez de somar 0.
+    """
+    rows = _connection().execute(
+        f"SELECT side, {', '.join(TEAM_STAT_COLUMNS)} FROM team_event_stats WHERE event_id = ?", (int(event_id),)
+    ).fetchall()
+    if not rows or any(v is None for _, *values in rows for v in values):
+        return None
+    stats = {}
+    for side, *values in rows:
+        stats[side] = {
+            c: (float(v) if isinstance(TEAM_EVENT_DEFAULTS[c], float) else int(v))
+            for c, v in zip(TEAM_STAT_COLUMNS, values)
+        }
+    return stats
+
+
+def put_player_event_stats(event: Dict[str, Any], stats: Dict[str, List[Dict[str, Any]]]) -> bool:
+    """Grava as estatísticas de jogadores (lineups) de um evento finalizado."""
+    if not event.get("id") or not is_finished(event) or not (stats.get("home") or stats.get("away")):
+        return False
+    conn = _connection()
+    with conn:
+        _store_event(conn, event)
+        placeholders = ", ".join("?" * (6 + len(PLAYER_STAT_COLUMNS)))
+        conn.executemany(
+            f"INSERT OR IGNORE INTO player_event_stats VALUES ({placeholders})",
+            [
+                (event["id"], player["player_id"], side, event.get(f"{side}Team", {}).get("id"),
+                 player.get("player_name"), event.get("startTimestamp"),
+                 *(player.get(c, 0) for c in PLAYER_STAT_COLUMNS))
+                for side in ("home", "away") for player in stats.get(side, [])
+            ],
+        )
+        conn.execute("INSERT OR IGNORE INTO player_events_loaded VALUES (?)", (event["id"],))
+    return True
+
+
+def get_player_event_stats(event_id: int) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Estatísticas de jogadores de um evento armazenado (formato de `get_player_stats_for_event`), ou None."""
+    conn = _connection()
+    if not conn.execute("SELECT 1 FROM player_events_loaded WHERE event_id = ?", (int(event_id),)).fetchone():
+        return None
+    rows = conn.execute(
+        f"SELECT side, player_id, player_name, {', '.join(PLAYER_STAT_COLUMNS)} "
+        "FROM player_event_stats WHERE event_id = ?", (int(event_id),)
+    ).fetchall()
+    stats: Dict[str, List[Dict[str, Any]]] = {"home": [], "away": []}
+    for side, player_id, player_name, *values in rows:
+        stats[side].append({"player_id": player_id, "player_name": player_name, **dict(zip(PLAYER_STAT_COLUMNS, values))})
+    return stats
+
+
+def team_event_history(team_id: int, limit: Optional[int] = None, since_timestamp: Optional[int] = None) -> pd.DataFrame:
+    """Histórico armazenado de um time (uma linha por jogo, mais recente primeiro)."""
+    query = "SELECT * FROM team_event_stats WHERE team_id = ?"
+    params: List[Any] = [int(team_id)]
+    if since_timestamp is not None:
+        query += " AND start_timestamp >= ?"
+        params.append(int(since_timestamp))
+    query += " ORDER BY start_timestamp DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(int(limit))
+    return pd.read_sql_query(query, _connection(), params=params)
+
+
+def player_event_history(team_id: int, limit_events: Optional[int] = None) -> pd.DataFrame:
+    """Estatísticas por jogador nos jogos armazenados de um time (mais recente primeiro)."""
+    query = "SELECT * FROM player_event_stats WHERE team_id = ?"
+    params: List[Any] = [int(team_id)]
+    if limit_events is not None:
+        query += (
+            " AND event_id IN (SELECT DISTINCT event_id FROM player_event_stats WHERE team_id = ?"
+            " ORDER BY start_timestamp DESC LIMIT ?)"
+        )
+        params += [int(team_id), int(limit_events)]
+    query += " ORDER BY start_timestamp DESC"
+    return pd.read_sql_query(query, _connection(), params=params)
+
+
+def get_season_totals(team_id: int, unique_tournament_id: int, season_id: int) -> Optional[Dict[str, Any]]:
+    """Totais de temporada armazenados ({'totals', 'folded_event_ids', 'reconciled_at'}), ou None."""
+    row = _connection().execute(
+        "SELECT totals, folded_event_ids, reconciled_at FROM team_season_totals "
+        "WHERE team_id = ? AND unique_tournament_id = ? AND season_id = ?",
+        (int(team_id), int(unique_tournament_id), int(season_id)),
+    ).fetchone()
+    if row is None:
+        return None
+    return {"totals": json.loads(row[0]), "folded_event_ids": set(json.loads(row[1])), "reconciled_at": row[2]}
+
+
+def put_season_totals(
+    team_id: int, unique_tournament_id: int, season_id: int,
+    totals: Dict[str, Any], folded_event_ids: Iterable[int], reconciled_at: float,
+) -> None:
+    conn = _connection()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO team_season_totals VALUES (?, ?, ?, ?, ?, ?)",
+            (int(team_id), int(unique_tournament_id), int(season_id),
+             json.dumps(totals), json.dumps(sorted(int(e) for e in folded_event_ids)), reconciled_at),
+        )
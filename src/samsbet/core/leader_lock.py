@@ -0,0 +1,67 @@
+# samsbet/core/leader_lock.py
+
+import os
+import socket
+from typing import IO, Optional
+
+from samsbet.core.disk_cache import _get_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LeaderLock:
+    """
+    Liderança entre processos/réplicas que dividem o diretório de cache: trava exclusiva
+    (não bloqueante) de um arquivo, mantida enquanto o processo estiver vivo. O sistema
+    operacional solta a trava quando o processo morre, então não há lease a expirar nem
+    marcador velho a limpar.
+    """
+
+    def __init__(self, name: str, path: Optional[str] = None):
+        self.path = path or os.path.join(_get_cache_dir(), f"{name}.lock")
+        self._file: Optional[IO] = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """Tenta virar líder sem esperar; True se este processo detém a trava."""
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        # Identifica o líder atual (só diagnóstico; a trava é o que vale)
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"{socket.gethostname()}:{os.getpid()}\n")
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        finally:
+            self._file.close()
+            self._file = None
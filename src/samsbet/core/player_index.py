@@ -0,0 +1,127 @@
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from samsbet.core.disk_cache import get_from_disk_cache, set_to_disk_cache
+
+# Índice compacto de jogadores, compartilhado entre ligas: player_id -> nome, posição e
+# time. Guardado em colunas ordenadas por ID (junções vetorizadas por reindex) e com
+# uma lista ordenada de tokens de nome para busca por prefixo (searchsorted).
+_INDEX_CACHE_KEY = "v2:player_index"
+_INDEX_TTL_SECONDS = 30 * 86400
+COLUMNS = ['player_id', 'name', 'position', 'team_id', 'team_name']
+
+_lock = threading.Lock()
+_state: Dict[str, Any] = {"frame": None, "tokens": None, "token_rows": None}
+
+
+def _normalize(text: str) -> str:
+    """Minúsculas e sem acentos ('Vinícius' -> 'vinicius')."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _set_frame(frame: pd.DataFrame) -> None:
+    frame = frame.sort_values('player_id').reset_index(drop=True)
+    # Cada palavra do nome vira uma entrada ordenada (busca por nome ou sobrenome)
+    tokens, rows = [], []
+    for row, name in enumerate(frame['name'].fillna('')):
+        for token in _normalize(name).split():
+            tokens.append(token)
+            rows.append(row)
+    order = np.argsort(tokens, kind='stable') if tokens else np.array([], dtype=int)
+    _state["frame"] = frame
+    _state["tokens"] = np.asarray(tokens, dtype=object)[order] if tokens else np.array([], dtype=object)
+    _state["token_rows"] = np.asarray(rows, dtype=int)[order] if rows else np.array([], dtype=int)
+
+
+def _disk_frame() -> Optional[pd.DataFrame]:
+    stored = get_from_disk_cache(_INDEX_CACHE_KEY)
+    if isinstance(stored, dict) and stored.get("player_id"):
+        return pd.DataFrame(stored, columns=COLUMNS)
+    return None
+
+
+def _loaded_frame() -> pd.DataFrame:
+    """Índice em memória, carregado do disco na primeira vez (quem chama segura `_lock`)."""
+    if _state["frame"] is None:
+        stored = _disk_frame()
+        _set_frame(stored if stored is not None else pd.DataFrame(columns=COLUMNS))
+    return _state["frame"]
+
+
+def _frame() -> pd.DataFrame:
+    with _lock:
+        return _loaded_frame()
+
+
+def update_player_index(records: Iterable[Dict[str, Any]], only_new: bool = False) -> int:
+    """
+    Acrescenta/atualiza jogadores (dicts com as chaves de COLUMNS; só player_id é
+    obrigatório). Valores ausentes não apagam os já conhecidos. Com `only_new`, só
+    jogadores ainda fora do índice são gravados (consultas da página); o snapshot da
+    liga, montado pelo warmer, atualiza todos. Retorna o tamanho do índice.
+    """
+    incoming = pd.DataFrame([r for r in records if r.get('player_id') is not None], columns=COLUMNS)
+    with _lock:
+        # A checagem de `only_new` e a mescla veem o mesmo índice: nada entra entre as duas
+        if only_new and not incoming.empty:
+            known = _loaded_frame()['player_id'].to_numpy()
+            incoming = incoming[~np.isin(incoming['player_id'].to_numpy(dtype=int), known)]
+        if incoming.empty:
+            return len(_loaded_frame())
+        incoming = incoming.drop_duplicates('player_id', keep='last').set_index('player_id')
+        # Mescla contra o disco relido agora: outro processo pode ter gravado desde a carga
+        current = _loaded_frame().set_index('player_id')
+        stored = _disk_frame()
+        if stored is not None:
+            current = stored.drop_duplicates('player_id', keep='last').set_index('player_id').combine_first(current)
+        # Dados novos têm prioridade; lacunas são preenchidas com o que já existia
+        merged = incoming.combine_first(current)
+        frame = merged.reset_index()[COLUMNS]
+        frame['player_id'] = frame['player_id'].astype(int)
+        _set_frame(frame)
+        set_to_disk_cache(
+            _INDEX_CACHE_KEY,
+            {c: [None if pd.isna(v) else v for v in _state["frame"][c].tolist()] for c in COLUMNS},
+            _INDEX_TTL_SECONDS,
+        )
+        return len(_state["frame"])
+
+
+def lookup_players(player_ids: Iterable[int]) -> pd.DataFrame:
+    """Linhas do índice para os IDs pedidos, na mesma ordem (NaN para desconhecidos)."""
+    ids = pd.Index(list(player_ids), name='player_id')
+    return _frame().set_index('player_id').reindex(ids).reset_index()
+
+
+def _prefix_rows(tokens: np.ndarray, token_rows: np.ndarray, token: str) -> np.ndarray:
+    """Linhas com alguma palavra do nome começando por `token` (já normalizado)."""
+    start = np.searchsorted(tokens, token, side='left')
+    # Todo token com o prefixo fica antes de `token` + maior caractere possível
+    end = np.searchsorted(tokens, token + '\U0010ffff', side='left')
+    return np.unique(token_rows[start:end])
+
+
+def search_players(prefix: str, limit: int = 20, team_id: Optional[int] = None) -> pd.DataFrame:
+    """
+    Jogadores cujo nome tem, para cada palavra da busca, alguma palavra começando por ela
+    ('vini jun' encontra 'Vinícius Júnior'; sem diferenciar acentos).
+    """
+    with _lock:
+        # Tabela e tokens da mesma versão do índice (uma atualização troca os três)
+        frame = _loaded_frame()
+        tokens, token_rows = _state["tokens"], _state["token_rows"]
+    query = _normalize(prefix).split()
+    if not query or frame.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    rows = _prefix_rows(tokens, token_rows, query[0])
+    for token in query[1:]:
+        rows = np.intersect1d(rows, _prefix_rows(tokens, token_rows, token), assume_unique=True)
+    result = frame.iloc[rows]
+    if team_id is not None:
+        result = result[result['team_id'] == team_id]
+    return result.head(limit).reset_index(drop=True)
@@ -0,0 +1,202 @@
+# samsbet/services/form_service.py
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from samsbet.api.request_metrics import bind_context
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.event_store import (
+    get_player_event_stats,
+    get_team_event_stats,
+    is_finished,
+    put_player_event_stats,
+    put_team_event_stats,
+)
+
+# Janelas de forma recente (últimos N jogos finalizados)
+FORM_WINDOWS = (5, 10)
+MAX_WORKERS = 4
+
+# Métrica exibida -> (campo de `get_team_stats_for_event`, perspectiva: pró ou contra)
+TEAM_FORM_METRICS = {
+    'Chutes': ('total_shots', 'pro'),
+    'Chutes no Alvo': ('shots_on_target', 'pro'),
+    'xG': ('expected_goals', 'pro'),
+    'Escanteios': ('corner_kicks', 'pro'),
+    'Defesas': ('saves', 'pro'),
+    'Chutes Cedidos': ('total_shots', 'contra'),
+    'Chutes no Alvo Cedidos': ('shots_on_target', 'contra'),
+    'Escanteios Contra': ('corner_kicks', 'contra'),
+}
+PLAYER_FORM_METRICS = {'Chutes': 'total_shots', 'Chutes Alvo': 'shots_on_target', 'Defesas': 'saves'}
+
+# (team_id, último evento finalizado, janelas) -> resultado; muda sozinho quando sai um jogo novo.
+# LRU limitado: o processo do dashboard vive por dias e passa por centenas de times.
+FORM_CACHE_MAX_ENTRIES = 256
+_form_cache: "OrderedDict[Tuple, Dict[str, pd.DataFrame]]" = OrderedDict()
+_form_cache_lock = threading.Lock()
+
+
+def fetch_team_event_stats(client: SofaScoreClient, event: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Estatísticas de time do evento: event store primeiro; o que vier da API é gravado se o jogo acabou."""
+    stored = get_team_event_stats(event["id"])
+    if stored is not None:
+        return stored
+    stats = client.get_team_stats_for_event(event["id"])
+    put_team_event_stats(event, stats)
+    return stats
+
+
+def fetch_player_event_stats(client: SofaScoreClient, event: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Chutes/defesas por jogador do evento, com a mesma leitura/gravação no event store."""
+    stored = get_player_event_stats(event["id"])
+    if stored is not None:
+        return stored
+    stats = client.get_player_stats_for_event(event["id"])
+    put_player_event_stats(event, stats)
+    return stats
+
+
+def finished_events(events: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """Os `limit` jogos finalizados mais recentes da página de eventos (mais recente primeiro)."""
+    done = [e for e in events if is_finished(e) and e.get("id")]
+    done.sort(key=lambda e: e.get("startTimestamp") or 0, reverse=True)
+    return done[:limit]
+
+
+def _fetch_all(client: SofaScoreClient, events: List[Dict[str, Any]], max_workers: int):
+    """Estatísticas de time e jogadores de todos os eventos; só os que faltam no store vão à API, em paralelo."""
+    def load(event):
+        return fetch_team_event_stats(client, event), fetch_player_event_stats(client, event)
+    if len(events) <= 1 or max_workers <= 1:
+        return [load(e) for e in events]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(bind_context(load), events))
+
+
+def _team_frame(team_id: int, events: List[Dict[str, Any]], team_stats: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Uma linha por jogo, na perspectiva do time, em ordem cronológica."""
+    is_home = np.array([e.get("homeTeam", {}).get("id") == team_id for e in events])
+    home_score = np.array([e.get("homeScore", {}).get("current") or 0 for e in events], dtype=float)
+    away_score = np.array([e.get("awayScore", {}).get("current") or 0 for e in events], dtype=float)
+
+    columns: Dict[str, Any] = {
+        'event_id': [e["id"] for e in events],
+        'Data': pd.to_datetime([e.get("startTimestamp") for e in events], unit='s'),
+        'Mando': np.where(is_home, 'Casa', 'Fora'),
+        'Adversário': [
+            ((e.get("awayTeam") if home else e.get("homeTeam")) or {}).get("name") for e, home in zip(events, is_home)
+        ],
+        'Gols Pró': np.where(is_home, home_score, away_score),
+        'Gols Contra': np.where(is_home, away_score, home_score),
+    }
+    for label, (field, perspective) in TEAM_FORM_METRICS.items():
+        home_values = np.array([s.get('home', {}).get(field, 0) for s in team_stats], dtype=float)
+        away_values = np.array([s.get('away', {}).get(field, 0) for s in team_stats], dtype=float)
+        own = is_home if perspective == 'pro' else ~is_home
+        columns[label] = np.where(own, home_values, away_values)
+
+    df = pd.DataFrame(columns)
+    return df.sort_values('Data').reset_index(drop=True)
+
+
+def _player_frame(team_id: int, events: List[Dict[str, Any]], lineups: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Formato longo: uma linha por jogador e jogo (só o lado do time), com a posição do jogo na janela."""
+    records = []
+    for rank, (event, lineup) in enumerate(zip(events, lineups)):
+        side = 'home' if event.get("homeTeam", {}).get("id") == team_id else 'away'
+        for player in lineup.get(side, []):
+            records.append((rank, player.get('player_id'), player.get('player_name'),
+                            *(player.get(field, 0) for field in PLAYER_FORM_METRICS.values())))
+    return pd.DataFrame(records, columns=['rank', 'player_id', 'Jogador', *PLAYER_FORM_METRICS])
+
+
+def compute_team_form(team_df: pd.DataFrame, windows: Sequence[int] = FORM_WINDOWS) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Médias móveis por janela (colunas '{métrica} (Últ. N)' em cada jogo) e o resumo
+    atual: uma linha por janela com a média dos últimos N jogos.
+    """
+    metrics = ['Gols Pró', 'Gols Contra', *TEAM_FORM_METRICS]
+    rolling = team_df.copy()
+    summary = {}
+    for n in windows:
+        means = team_df[metrics].rolling(n, min_periods=1).mean().round(2)
+        rolling[[f'{m} (Últ. {n})' for m in metrics]] = means.to_numpy()
+        summary[f'Últimos {n}'] = means.iloc[-1] if not means.empty else pd.Series(0.0, index=metrics)
+    summary_df = pd.DataFrame(summary).T
+    summary_df.insert(0, 'Jogos', [min(n, len(team_df)) for n in windows])
+    return rolling, summary_df
+
+
+def compute_player_form(player_df: pd.DataFrame, n_games: int, windows: Sequence[int] = FORM_WINDOWS) -> pd.DataFrame:
+    """
+    Totais e médias por jogo do time em cada janela, indexados por player_id
+    (pronto para junção por ID com as tabelas de temporada).
+    """
+    if player_df.empty:
+        return pd.DataFrame()
+    names = player_df.groupby('player_id')['Jogador'].first()
+    blocks = [names]
+    for n in windows:
+        window = player_df[player_df['rank'] < n]
+        totals = window.groupby('player_id')[list(PLAYER_FORM_METRICS)].sum()
+        games = max(min(n, n_games), 1)
+        totals.columns = [f'{m} (Últ. {n})' for m in PLAYER_FORM_METRICS]
+        per_game = (totals / games).round(2)
+        per_game.columns = [f'{m}/J (Últ. {n})' for m in PLAYER_FORM_METRICS]
+        blocks += [totals, per_game]
+    result = pd.concat(blocks, axis=1)
+    value_columns = [c for c in result.columns if c != 'Jogador']
+    result[value_columns] = result[value_columns].fillna(0)
+    return result.sort_values(f'Chutes (Últ. {windows[0]})', ascending=False)
+
+
+def get_team_form(
+    team_id: int,
+    client: Optional[SofaScoreClient] = None,
+    events: Optional[List[Dict[str, Any]]] = None,
+    windows: Sequence[int] = FORM_WINDOWS,
+    max_workers: int = MAX_WORKERS,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Forma recente do time a partir da página `team/{id}/events/last/0` inteira:
+    estatísticas de time e de jogadores dos últimos max(janelas) jogos finalizados.
+
+    Retorna {'jogos': jogo a jogo com médias móveis, 'time': resumo por janela,
+    'jogadores': agregados por jogador}. Jogos finalizados ficam no event store, então
+    cada atualização só busca os jogos novos.
+    """
+    client = client or SofaScoreClient()
+    if events is None:
+        events = client.get_team_last_events(team_id)
+    recent = finished_events(events, max(windows))
+    if not recent:
+        return {'jogos': pd.DataFrame(), 'time': pd.DataFrame(), 'jogadores': pd.DataFrame()}
+
+    cache_key = (team_id, recent[0]["id"], tuple(windows))
+    with _form_cache_lock:
+        if cache_key in _form_cache:
+            _form_cache.move_to_end(cache_key)
+            return _form_cache[cache_key]
+
+    fetched = _fetch_all(client, recent, max_workers)
+    team_stats = [team for team, _ in fetched]
+    lineups = [players for _, players in fetched]
+
+    team_games, team_summary = compute_team_form(_team_frame(team_id, recent, team_stats), windows)
+    player_summary = compute_player_form(_player_frame(team_id, recent, lineups), len(recent), windows)
+
+    result = {'jogos': team_games, 'time': team_summary, 'jogadores': player_summary}
+    with _form_cache_lock:
+        # Entradas do mesmo time com um último jogo anterior nunca mais serão pedidas
+        for stale in [k for k in _form_cache if k[0] == team_id and k[2] == cache_key[2]]:
+            del _form_cache[stale]
+        _form_cache[cache_key] = result
+        while len(_form_cache) > FORM_CACHE_MAX_ENTRIES:
+            _form_cache.popitem(last=False)
+    return result
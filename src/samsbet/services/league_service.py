@@ -0,0 +1,137 @@
+# samsbet/services/league_service.py
+
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.disk_cache import get_from_disk_cache, set_to_disk_cache
+from samsbet.core.event_store import get_season_totals
+from samsbet.services.stats_service import (
+    TEAM_SUMMARY_HIGHER_IS_BETTER,
+    TEAM_SUMMARY_LABELS,
+    team_summary_matrix,
+    team_summary_sources,
+)
+
+# Índice de métricas de TODOS os times de uma competição/temporada: matriz densa
+# times x métricas (as mesmas dos cards de resumo), com percentis e posições
+# pré-calculados. Só o aquecimento monta o índice, depois que o plano buscou a tabela e
+# os totais de temporada de cada time; a página só o lê, em O(1). Percentil 100 e
+# posição 1 são sempre o melhor time da métrica: nas métricas cedidas/contra, o que
+# tem o menor valor.
+INDEX_TTL_SECONDS = 86400
+
+_memory_indexes: Dict[Tuple[int, int], Tuple[float, Dict[str, Any]]] = {}
+
+
+def _index_key(unique_tournament_id: int, season_id: int) -> str:
+    return f"v3:league_team_index:{unique_tournament_id}:{season_id}"
+
+
+def percentile_matrix(
+    values: np.ndarray, higher_is_better: Optional[Sequence[bool]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Percentis (0-100, empates pela média) e posições (1 = melhor) de cada coluna,
+    calculados de uma vez para a matriz inteira. Colunas com `higher_is_better` False
+    são ordenadas ao contrário (menor valor = percentil 100 e posição 1).
+    """
+    n = values.shape[0]
+    if n == 0:
+        return values.copy(), values.copy()
+    if higher_is_better is not None:
+        values = values * np.where(np.asarray(higher_is_better, dtype=bool), 1.0, -1.0)
+    ranks = rankdata(values, method='average', axis=0)
+    percentiles = np.round((ranks - 1) / (n - 1) * 100, 1) if n > 1 else np.full_like(values, 100.0)
+    positions = rankdata(-values, method='min', axis=0).astype(int)
+    return percentiles, positions
+
+
+def build_league_team_index(
+    tournament_id: int,
+    unique_tournament_id: int,
+    season_id: int,
+    client: Optional[SofaScoreClient] = None,
+) -> Dict[str, Any]:
+    """
+    Monta e persiste o índice da liga: tabela + totais de temporada de cada time já
+    gravados pelo `season_service` -> matriz de métricas, percentis e posições.
+
+    Lê só o que está em cache (a tabela e o event store), sem requisições por time: times
+    ainda sem totais gravados ficam fora do índice até a próxima montagem.
+    """
+    client = client or SofaScoreClient()
+    standings_data = client.get_league_standings(tournament_id, season_id)
+    rows = standings_data.get('standings', [{}])[0].get('rows', []) if standings_data else []
+
+    team_ids, sources = [], []
+    for row in rows:
+        team_id = row.get('team', {}).get('id')
+        if not team_id or not row.get('matches'):
+            continue
+        stored = get_season_totals(team_id, unique_tournament_id, season_id)
+        if stored is None:
+            continue
+        team_ids.append(team_id)
+        sources.append(team_summary_sources(stored["totals"], row))
+
+    values = team_summary_matrix(sources)
+    percentiles, positions = percentile_matrix(values, TEAM_SUMMARY_HIGHER_IS_BETTER)
+    index = {
+        "created_at": time.time(),
+        "team_ids": team_ids,
+        "metrics": TEAM_SUMMARY_LABELS,
+        "values": values.tolist(),
+        "percentiles": percentiles.tolist(),
+        "positions": positions.tolist(),
+    }
+    if team_ids:
+        set_to_disk_cache(_index_key(unique_tournament_id, season_id), index, INDEX_TTL_SECONDS)
+        _memory_indexes[(unique_tournament_id, season_id)] = (time.time() + INDEX_TTL_SECONDS, _prepare(index))
+    return index
+
+
+def _prepare(index: Dict[str, Any]) -> Dict[str, Any]:
+    """Versão de consulta: arrays NumPy e mapa team_id -> linha."""
+    return {
+        "row_of": {team_id: i for i, team_id in enumerate(index["team_ids"])},
+        "metrics": index["metrics"],
+        "values": np.asarray(index["values"], dtype=float),
+        "percentiles": np.asarray(index["percentiles"], dtype=float),
+        "positions": np.asarray(index["positions"], dtype=int),
+    }
+
+
+def _load_index(unique_tournament_id: int, season_id: int) -> Optional[Dict[str, Any]]:
+    key = (unique_tournament_id, season_id)
+    cached = _memory_indexes.get(key)
+    if cached and time.time() < cached[0]:
+        return cached[1]
+    stored = get_from_disk_cache(_index_key(unique_tournament_id, season_id))
+    if not isinstance(stored, dict) or not stored.get("team_ids"):
+        return None
+    prepared = _prepare(stored)
+    _memory_indexes[key] = (stored.get("created_at", time.time()) + INDEX_TTL_SECONDS, prepared)
+    return prepared
+
+
+def get_team_league_context(unique_tournament_id: int, season_id: int, team_id: int) -> pd.DataFrame:
+    """
+    Contexto do time na liga (valor, percentil e posição por métrica), lido do índice
+    pré-calculado. DataFrame vazio se o índice ainda não foi montado ou o time não consta.
+    """
+    index = _load_index(unique_tournament_id, season_id)
+    if index is None or team_id not in index["row_of"]:
+        return pd.DataFrame()
+    i = index["row_of"][team_id]
+    n_teams = len(index["row_of"])
+    return pd.DataFrame({
+        'Métrica': index["metrics"],
+        'Valor': index["values"][i],
+        'Percentil': index["percentiles"][i],
+        'Posição': [f"{p}º de {n_teams}" for p in index["positions"][i]],
+    })
@@ -0,0 +1,279 @@
+# samsbet/services/live_service.py
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.disk_cache import get_from_disk_cache, set_to_disk_cache
+from samsbet.core.event_store import is_finished, put_team_event_stats
+
+# Modo ao vivo: um agendador em segundo plano acompanha os jogos em andamento (e os que
+# estão para começar), consultando `event/{id}` e `event/{id}/statistics` em intervalos
+# que dependem do momento do jogo. Cada consulta é publicada no cache em disco
+# (`v2:live:{id}`), compartilhado entre réplicas: quem encontra uma publicação ainda
+# válida não consulta a API de novo, então o total de chamadas não cresce com as réplicas.
+PRE_KICKOFF_WINDOW_SECONDS = 15 * 60
+PRE_KICKOFF_INTERVAL_SECONDS = 60
+LIVE_INTERVAL_SECONDS = 30
+FINAL_MINUTES_INTERVAL_SECONDS = 15
+HALFTIME_INTERVAL_SECONDS = 120
+FINAL_MINUTES_FROM = 80
+# Jogos iniciados há mais que isso e ainda "não começados" (adiados sem aviso) são ignorados
+STALE_KICKOFF_SECONDS = 3 * 3600
+
+MAX_TRACKED_EVENTS = 40
+MAX_REQUESTS_PER_MINUTE = 90
+LIVE_UPDATE_TTL_SECONDS = 6 * 3600
+
+# Códigos de `status.code` da API
+STATUS_FIRST_HALF = 6
+STATUS_SECOND_HALF = 7
+STATUS_HALFTIME = 31
+STATUS_EXTRA_TIME = (41, 42)
+
+
+def _live_key(event_id: int) -> str:
+    return f"v2:live:{event_id}"
+
+
+def match_minute(event: Dict[str, Any], now: float) -> Optional[int]:
+    """Minuto de jogo a partir do início do período atual (None fora do 1º/2º tempo)."""
+    code = event.get("status", {}).get("code")
+    period_start = (event.get("time") or {}).get("currentPeriodStartTimestamp")
+    if not period_start or code not in (STATUS_FIRST_HALF, STATUS_SECOND_HALF):
+        return None
+    elapsed = int((now - period_start) // 60) + 1
+    return elapsed + (45 if code == STATUS_SECOND_HALF else 0)
+
+
+def next_poll_delay(event: Dict[str, Any], now: float) -> Optional[float]:
+    """
+    Segundos até a próxima consulta do evento, conforme o momento do jogo; None quando
+    não há mais o que acompanhar (encerrado, adiado, cancelado).
+    """
+    status = event.get("status", {})
+    status_type = status.get("type")
+    if status_type == "notstarted":
+        until_window = (event.get("startTimestamp") or 0) - PRE_KICKOFF_WINDOW_SECONDS - now
+        return max(until_window, PRE_KICKOFF_INTERVAL_SECONDS)
+    if status_type != "inprogress":
+        return None
+    if status.get("code") == STATUS_HALFTIME:
+        return HALFTIME_INTERVAL_SECONDS
+    minute = match_minute(event, now)
+    if status.get("code") in STATUS_EXTRA_TIME or (minute is not None and minute >= FINAL_MINUTES_FROM):
+        return FINAL_MINUTES_INTERVAL_SECONDS
+    return LIVE_INTERVAL_SECONDS
+
+
+def get_live_update(event_id: int) -> Optional[Dict[str, Any]]:
+    """Última publicação ao vivo do evento (de qualquer réplica), ou None."""
+    update = get_from_disk_cache(_live_key(event_id))
+    return update if isinstance(update, dict) else None
+
+
+def is_live_candidate(status_type: Optional[str], start_timestamp: Optional[float], now: float) -> bool:
+    """
+    Em andamento, ou não começado (ou com status desconhecido) com início entre
+    STALE_KICKOFF_SECONDS atrás e PRE_KICKOFF_WINDOW_SECONDS à frente.
+    """
+    if status_type == 'inprogress':
+        return True
+    if status_type not in ('notstarted', None) or not start_timestamp:
+        return False
+    return now - STALE_KICKOFF_SECONDS <= start_timestamp <= now + PRE_KICKOFF_WINDOW_SECONDS
+
+
+def live_candidates(matches_df: pd.DataFrame, now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Jogos do schedule a acompanhar ({'event_id', 'status_type', 'start_timestamp'}):
+    em andamento ou começando em até PRE_KICKOFF_WINDOW_SECONDS.
+    """
+    if matches_df.empty or 'status_type' not in matches_df:
+        return []
+    now = now or time.time()
+    start_ts = (matches_df['start_time'] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+    status_type = matches_df['status_type'].astype(object)
+    soon = (status_type == 'notstarted') & (start_ts <= now + PRE_KICKOFF_WINDOW_SECONDS) \
+        & (start_ts >= now - STALE_KICKOFF_SECONDS)
+    mask = (status_type == 'inprogress') | soon
+    return [
+        {"event_id": int(event_id), "status_type": status, "start_timestamp": int(ts)}
+        for event_id, status, ts in zip(matches_df.loc[mask, 'event_id'], status_type[mask], start_ts[mask])
+    ]
+
+
+class LivePoller:
+    """
+    Agendador dos jogos ao vivo: cada evento acompanhado tem um horário de próxima
+    consulta; uma thread em segundo plano consulta os que venceram e publica o resultado.
+    """
+
+    def __init__(self, client: Optional[SofaScoreClient] = None, max_tracked: int = MAX_TRACKED_EVENTS):
+        self.client = client or SofaScoreClient()
+        self.max_tracked = max_tracked
+        self.requests_made = 0
+        self._due: Dict[int, float] = {}
+        # event_id -> (status_type, início): decide quem sai quando as vagas acabam
+        self._states: Dict[int, Tuple[Optional[str], float]] = {}
+        self._recent_requests: deque = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, candidates: Iterable[Dict[str, Any]], now: Optional[float] = None) -> None:
+        """
+        Passa a acompanhar os eventos ({'event_id', 'status_type', 'start_timestamp'}, como
+        em `live_candidates`); quem não está ao vivo nem perto do início é ignorado. Os já
+        acompanhados mantêm a agenda. Sem vagas (`max_tracked`), um jogo em andamento
+        toma a vaga do não começado com início mais distante.
+        """
+        now = now or time.time()
+        with self._lock:
+            for candidate in candidates:
+                event_id = int(candidate["event_id"])
+                status_type = candidate.get("status_type")
+                start_timestamp = candidate.get("start_timestamp") or 0
+                if event_id in self._due or not is_live_candidate(status_type, start_timestamp, now):
+                    continue
+                if len(self._due) >= self.max_tracked and not self._evict_for(status_type):
+                    continue
+                self._due[event_id] = 0.0
+                self._states[event_id] = (status_type, start_timestamp)
+        self._wake.set()
+
+    def _evict_for(self, status_type: Optional[str]) -> bool:
+        """Libera uma vaga para um jogo em andamento (chamar com `_lock` adquirido)."""
+        if status_type != 'inprogress':
+            return False
+        waiting = [e for e in self._due if self._states.get(e, (None, 0))[0] != 'inprogress']
+        if not waiting:
+            return False
+        latest = max(waiting, key=lambda e: self._states.get(e, (None, 0))[1])
+        self._due.pop(latest, None)
+        self._states.pop(latest, None)
+        return True
+
+    def _set_status(self, event_id: int, status_type: Optional[str]) -> None:
+        with self._lock:
+            if event_id in self._states:
+                self._states[event_id] = (status_type, self._states[event_id][1])
+
+    def tracked(self) -> List[int]:
+        with self._lock:
+            return list(self._due)
+
+    def _within_budget(self, now: float, cost: int) -> bool:
+        while self._recent_requests and now - self._recent_requests[0] >= 60:
+            self._recent_requests.popleft()
+        return len(self._recent_requests) + cost <= MAX_REQUESTS_PER_MINUTE
+
+    def _request(self, now: float) -> None:
+        self._recent_requests.append(now)
+        self.requests_made += 1
+
+    def poll(self, event_id: int, now: Optional[float] = None) -> Optional[float]:
+        """Consulta e publica um evento. Retorna o horário da próxima consulta (None: parar de acompanhar)."""
+        now = now or time.time()
+        published = get_live_update(event_id)
+        if published and published.get("next_poll_at", 0) > now:
+            # Outra réplica (ou esta) já publicou uma versão ainda válida
+            self._set_status(event_id, published.get("status_type"))
+            return None if published.get("finished") else published["next_poll_at"]
+        if not self._within_budget(now, 2):
+            return now + FINAL_MINUTES_INTERVAL_SECONDS
+
+        event = self.client.get_event_details(event_id, refresh=True)
+        self._request(now)
+        if not event:
+            return now + LIVE_INTERVAL_SECONDS
+
+        finished = is_finished(event)
+        status = event.get("status", {})
+        self._set_status(event_id, status.get("type"))
+        statistics = (published or {}).get("statistics")
+        # No intervalo e antes do início as estatísticas não mudam: só o status é consultado
+        if finished or (status.get("type") == "inprogress" and status.get("code") != STATUS_HALFTIME):
+            statistics = self.client.get_team_stats_for_event(event_id, refresh=True)
+            self._request(now)
+            if finished:
+                put_team_event_stats(event, statistics)
+
+        delay = next_poll_delay(event, now)
+        if status.get("type") == "notstarted" and now - (event.get("startTimestamp") or now) > STALE_KICKOFF_SECONDS:
+            # Passou muito do início sem começar (atraso sem status novo): para de acompanhar
+            delay = None
+        next_poll_at = now + delay if delay is not None else now + LIVE_UPDATE_TTL_SECONDS
+        set_to_disk_cache(_live_key(event_id), {
+            "event_id": event_id,
+            "updated_at": now,
+            "next_poll_at": next_poll_at,
+            "finished": delay is None,
+            "status": status.get("description"),
+            "status_type": status.get("type"),
+            "minute": match_minute(event, now),
+            "home_score": event.get("homeScore", {}).get("current"),
+            "away_score": event.get("awayScore", {}).get("current"),
+            "statistics": statistics,
+        }, LIVE_UPDATE_TTL_SECONDS)
+        return None if delay is None else next_poll_at
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Consulta todos os eventos vencidos; retorna quantos foram processados."""
+        now = now or time.time()
+        with self._lock:
+            due = [event_id for event_id, due_at in self._due.items() if due_at <= now]
+        for event_id in sorted(due, key=lambda e: self._due.get(e, 0)):
+            try:
+                next_at = self.poll(event_id, now)
+            except Exception:
+                next_at = now + LIVE_INTERVAL_SECONDS
+            with self._lock:
+                if next_at is None:
+                    self._due.pop(event_id, None)
+                    self._states.pop(event_id, None)
+                else:
+                    self._due[event_id] = next_at
+        return len(due)
+
+    def _seconds_until_next(self) -> float:
+        with self._lock:
+            if not self._due:
+                return 60.0
+            return max(0.0, min(self._due.values()) - time.time())
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._wake.wait(timeout=min(self._seconds_until_next(), 60.0))
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="samsbet-live-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+
+_poller: Optional[LivePoller] = None
+_poller_lock = threading.Lock()
+
+
+def get_live_poller() -> LivePoller:
+    """Agendador único do processo (compartilhado pelas páginas do dashboard), já iniciado."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = LivePoller()
+            _poller.start()
+        return _poller
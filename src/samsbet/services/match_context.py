@@ -0,0 +1,260 @@
+# samsbet/services/match_context.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.disk_cache import get_from_disk_cache, set_to_disk_cache
+from samsbet.core.event_context import get_event_context, event_context_from_event
+from samsbet.services.season_service import get_team_season_stats
+from samsbet.services.form_service import fetch_player_event_stats, fetch_team_event_stats, get_team_form
+from samsbet.services.snapshot_service import (
+    load_league_player_snapshot,
+    team_goalkeeper_rows,
+    team_player_rows,
+)
+
+# Versão dos dados de uma partida, compartilhada pelos processos via cache em disco.
+# A invalidação por mudança no schedule e o reaquecimento perto do início a avançam;
+# quem guarda um MatchContext (ou algo derivado dele) inclui a versão na chave.
+_VERSION_KEY = "match_cache_version:{event_id}"
+_VERSION_TTL_SECONDS = 7 * 86400
+
+# Jogadores por time exibidos na análise (o mesmo top 30 da consulta por time)
+PLAYERS_PER_TEAM = 30
+
+
+def match_cache_version(event_id: int) -> float:
+    """Versão atual dos dados da partida (0 se nunca foi invalidada)."""
+    return get_from_disk_cache(_VERSION_KEY.format(event_id=event_id)) or 0.0
+
+
+def bump_match_cache_version(event_ids: Iterable[int]) -> None:
+    """Avança a versão das partidas: contextos e view models antigos deixam de ser usados."""
+    version = time.time()
+    for event_id in event_ids:
+        set_to_disk_cache(_VERSION_KEY.format(event_id=event_id), version, _VERSION_TTL_SECONDS)
+
+
+class MatchContext:
+    """
+    Contexto compartilhado de uma partida: resolve uma única vez (e sob demanda) cada
+    recurso usado pelas seções da análise — contexto do evento, classificação, último
+    jogo de cada time, lineups, estatísticas de temporada de jogadores/goleiros/times,
+    H2H e estatísticas dos eventos do H2H.
+
+    Os orquestradores de `stats_service` recebem o mesmo contexto, então nenhum
+    endpoint é requisitado (nem parseado) duas vezes para a mesma partida. As
+    estatísticas de temporada dos dois times saem do snapshot da liga, quando já
+    existe, ou de consultas combinadas (`team.in.{casa}~{fora}`).
+    """
+
+    def __init__(
+        self,
+        event_id: int,
+        custom_id: Optional[str] = None,
+        client: Optional[SofaScoreClient] = None,
+        merge_goalkeeper_query: bool = False,
+    ):
+        self.event_id = event_id
+        # Goleiros a partir da mesma consulta dos jogadores (1 requisição em vez de 2)
+        self.merge_goalkeeper_query = merge_goalkeeper_query
+        self._custom_id = custom_id
+        self.client = client or SofaScoreClient()
+        self._memo: Dict[Any, Any] = {}
+        # Um lock por chave: carregamentos de recursos diferentes (cada um com sua
+        # requisição) correm em paralelo; só quem pede a mesma chave espera.
+        self._locks: Dict[Any, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _key_lock(self, key: Any) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _get(self, key: Any, loader: Callable[[], Any]) -> Any:
+        """Memoiza `loader()` sob `key` (thread-safe; o contexto pode ser compartilhado entre sessões)."""
+        if key in self._memo:
+            return self._memo[key]
+        with self._key_lock(key):
+            if key not in self._memo:
+                self._memo[key] = loader()
+            return self._memo[key]
+
+    # --- Evento ---
+
+    @property
+    def event(self) -> Dict[str, Any]:
+        """Contexto do evento vindo do índice do schedule; só busca `event/{id}` se for desconhecido."""
+        def load():
+            context = get_event_context(self.event_id)
+            if context:
+                return context
+            return event_context_from_event(self.client.get_event_details(self.event_id))
+        return self._get("event", load)
+
+    @property
+    def is_complete(self) -> bool:
+        return all(self.event.get(k) for k in ("tournament_id", "season_id", "home_team_id", "away_team_id"))
+
+    @property
+    def tournament_id(self) -> Optional[int]:
+        return self.event.get("tournament_id")
+
+    @property
+    def unique_tournament_id(self) -> Optional[int]:
+        return self.event.get("uniqueTournament_id")
+
+    @property
+    def season_id(self) -> Optional[int]:
+        return self.event.get("season_id")
+
+    @property
+    def custom_id(self) -> Optional[str]:
+        return self._custom_id or self.event.get("customId")
+
+    def team_id(self, side: str) -> Optional[int]:
+        """ID do time de um lado da partida ('home' ou 'away')."""
+        return self.event.get(f"{side}_team_id")
+
+    # --- Temporada ---
+
+    @property
+    def standings_info_map(self) -> Dict[int, Dict[str, Any]]:
+        """team_id -> posição, jogos e gols pró/contra na tabela da competição."""
+        def load():
+            standings_data = self.client.get_league_standings(self.tournament_id, self.season_id)
+            standings_info_map = {}
+            if standings_data and 'standings' in standings_data and standings_data['standings']:
+                for row in standings_data['standings'][0].get('rows', []):
+                    team_id = row.get('team', {}).get('id')
+                    if team_id:
+                        standings_info_map[team_id] = {
+                            "position": row.get('position'),
+                            "matches": row.get('matches'),
+                            "scoresFor": row.get('scoresFor'),
+                            "scoresAgainst": row.get('scoresAgainst')
+                        }
+            return standings_info_map
+        return self._get("standings", load)
+
+    def team_stats(self, side: str) -> Dict[str, Any]:
+        """Estatísticas agregadas do time na temporada (totais incrementais; ver `season_service`)."""
+        return self._get(("team_stats", side), lambda: get_team_season_stats(
+            self.team_id(side), self.unique_tournament_id, self.season_id,
+            events=self.last_events(side), client=self.client))
+
+    def _season_player_rows(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Jogadores dos dois times em uma única consulta (com campos de goleiro se `merge_goalkeeper_query`)."""
+        return self._get("season_player_rows", lambda: self.client.get_player_stats_for_teams(
+            self.unique_tournament_id, self.season_id, [self.team_id("home"), self.team_id("away")],
+            include_goalkeeper_fields=self.merge_goalkeeper_query))
+
+    def league_snapshot(self, match_type: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Snapshot da liga inteira, se o warmer já o montou (não dispara requisições)."""
+        return self._get(("league_snapshot", match_type), lambda: load_league_player_snapshot(
+            self.unique_tournament_id, self.season_id, match_type))
+
+    def player_stats(self, side: str, match_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Estatísticas de temporada dos jogadores do time (opcionalmente só casa/fora). Time
+        sem linhas no snapshot da liga cai nas consultas à API.
+        """
+        snapshot = self.league_snapshot(match_type)
+        if snapshot is not None:
+            rows = team_player_rows(snapshot, self.team_id(side))[:PLAYERS_PER_TEAM]
+            if rows:
+                return rows
+        if match_type is None:
+            # Sem filtro de mando os dois times saem da mesma consulta
+            return self._season_player_rows().get(self.team_id(side), [])[:PLAYERS_PER_TEAM]
+        return self._get(("player_stats", side, match_type), lambda: self.client.get_player_stats_for_team(
+            self.unique_tournament_id, self.season_id, self.team_id(side), match_type=match_type))
+
+    def goalkeeper_stats(self, side: str) -> List[Dict[str, Any]]:
+        """Estatísticas de temporada dos goleiros do time (snapshot da liga, senão API)."""
+        snapshot = self.league_snapshot()
+        if snapshot is not None:
+            rows = team_goalkeeper_rows(snapshot, self.team_id(side))
+            if rows:
+                return rows
+        if self.merge_goalkeeper_query:
+            rows = self._season_player_rows().get(self.team_id(side), [])
+            return self.client.goalkeepers_from_player_rows(rows)
+        rows_by_team = self._get("season_goalkeeper_rows", lambda: self.client.get_goalkeeper_stats_for_teams(
+            self.unique_tournament_id, self.season_id, [self.team_id("home"), self.team_id("away")]))
+        return rows_by_team.get(self.team_id(side), [])
+
+    # --- Último jogo ---
+
+    def last_events(self, side: str) -> List[Dict[str, Any]]:
+        """Página inteira de últimos eventos do time (`team/{id}/events/last/0`)."""
+        return self._get(("last_events", side), lambda: self.client.get_team_last_events(self.team_id(side)))
+
+    def last_event(self, side: str) -> Dict[str, Any]:
+        """Último evento disputado pelo time."""
+        events = self.last_events(side)
+        return events[-1] if events else {}
+
+    def last_event_id(self, side: str) -> Optional[int]:
+        return self.last_event(side).get("id")
+
+    def _known_event(self, event_id: int) -> Dict[str, Any]:
+        """Evento bruto já carregado (H2H ou último jogo), usado para gravar no event store."""
+        candidates = list(self.h2h_events)
+        for side in ('home', 'away'):
+            candidates += self._memo.get(("last_events", side), [])
+        return next((e for e in candidates if e.get("id") == event_id), {})
+
+    def lineup_stats(self, event_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Chutes/defesas por jogador de um evento (via lineups; jogos finalizados vêm do event store)."""
+        return self._get(("lineup", event_id), lambda: fetch_player_event_stats(
+            self.client, self._known_event(event_id) or {"id": event_id}))
+
+    @property
+    def last_match_player_map(self) -> Dict[int, Dict[str, Any]]:
+        """player_id -> estatísticas do último jogo, unindo os últimos eventos dos dois times."""
+        def load():
+            player_map = {}
+            for side in ('home', 'away'):
+                if last_event_id := self.last_event_id(side):
+                    stats_data = self.lineup_stats(last_event_id)
+                    for team_type in ['home', 'away']:
+                        for player in stats_data[team_type]:
+                            # Adiciona ou sobrescreve, mantendo o dado do evento mais recente de cada jogador
+                            player_map[player['player_id']] = player
+            return player_map
+        return self._get("last_match_player_map", load)
+
+    @property
+    def last_match_saves_map(self) -> Dict[int, int]:
+        """player_id -> defesas no último jogo (apenas quem fez defesas)."""
+        def load():
+            return {
+                player_id: player['saves']
+                for player_id, player in self.last_match_player_map.items()
+                if player.get('saves', 0) > 0
+            }
+        return self._get("last_match_saves_map", load)
+
+    def form(self, side: str) -> Dict[str, pd.DataFrame]:
+        """Forma recente do time (últimos 5/10 jogos), reaproveitando a página de últimos eventos."""
+        return self._get(("form", side), lambda: get_team_form(
+            self.team_id(side), client=self.client, events=self.last_events(side)))
+
+    # --- H2H ---
+
+    @property
+    def h2h_events(self) -> List[Dict[str, Any]]:
+        """Eventos brutos do confronto direto (vazio sem customId)."""
+        custom_id = self.custom_id
+        if not custom_id:
+            return []
+        return self._get("h2h_events", lambda: self.client.get_h2h_events(custom_id) or [])
+
+    def event_stats(self, event_id: int) -> Dict[str, Dict[str, Any]]:
+        """Estatísticas de time (tempo regulamentar) de um evento, ex.: jogos do H2H (event store primeiro)."""
+        return self._get(("event_stats", event_id), lambda: fetch_team_event_stats(
+            self.client, self._known_event(event_id) or {"id": event_id}))
@@ -1,73 +1,360 @@
 # samsbet/services/match_service.py
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from datetime import date, datetime
-from typing import List, Dict, Any
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, TypedDict
 
 # A biblioteca padrão do Python para lidar com fusos horários (IANA)
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 # Importamos nosso cliente da camada de API
+from samsbet.api.request_metrics import bind_context
 from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.event_context import store_event_contexts
+from samsbet.services.view_model_service import invalidate_match_view_models
 
-def get_daily_matches_dataframe(event_date: date) -> pd.DataFrame:
-    """
-    Busca os jogos de uma data específica e os retorna em um DataFrame Pandas estruturado,
-    respeitando o fuso horário local do usuário para a definição do "dia".
-    """
-    client = SofaScoreClient()
-    
+SCHEDULE_COLUMNS = [
+    'event_id', 'tournament_name', 'country', 'home_team', 'away_team', 'start_time', 'status', 'status_type',
+    'home_score', 'away_score', 'home_team_id', 'away_team_id', 'tournament_id', 'uniqueTournament_id',
+    'season_id', 'customId',
+]
+# Textos muito repetidos no dia (milhares de jogos, poucas centenas de torneios/países)
+CATEGORICAL_COLUMNS = ['tournament_name', 'country', 'status', 'status_type']
+
+# O endpoint `scheduled-events/{data}` é por dia UTC: um dia local em America/Sao_Paulo
+# cobre dois dias UTC. As datas UTC são buscadas em paralelo e o DataFrame montado
+# para o intervalo local fica em memória por SCHEDULE_TTL_SECONDS.
+SCHEDULE_TTL_SECONDS = 600
+MAX_WORKERS = 4
+
+# Atualização incremental: o schedule é rebaixado a cada SCHEDULE_REFRESH_SECONDS e só
+# as linhas de jogos que mudaram (status, placar ou horário) são refeitas
+SCHEDULE_REFRESH_SECONDS = 60
+# Um DataFrame vencido ainda serve de base para a atualização incremental (o daemon
+# atualiza a cada 30 min); vencido há mais que isso, ninguém mais acompanha o intervalo
+# e ele sai da memória na próxima gravação
+SCHEDULE_KEEP_EXPIRED_SECONDS = 3600
+# Recursos por jogo que ficam desatualizados quando o status/placar muda
+MATCH_ENDPOINTS_ON_CHANGE = ("event/{event_id}", "event/{event_id}/statistics", "event/{event_id}/lineups")
+
+_schedule_lock = threading.Lock()
+_schedule_frames: Dict[Tuple[date, date], Tuple[float, pd.DataFrame]] = {}
+_schedule_refreshed_at: Dict[Tuple[date, date], float] = {}
+_schedule_signatures: Dict[Tuple[date, date], Dict[int, Tuple[Any, ...]]] = {}
+
+
+def _store_schedule(key: Tuple[date, date], df: pd.DataFrame) -> None:
+    """Guarda o DataFrame do intervalo e descarta os intervalos abandonados (chamar com `_schedule_lock`)."""
+    now = time.time()
+    _schedule_frames[key] = (now + SCHEDULE_TTL_SECONDS, df)
+    for stale in [k for k, (expires_at, _) in _schedule_frames.items()
+                  if expires_at + SCHEDULE_KEEP_EXPIRED_SECONDS <= now]:
+        del _schedule_frames[stale]
+        _schedule_signatures.pop(stale, None)
+        _schedule_refreshed_at.pop(stale, None)
+
+
+class ScheduleChanges(TypedDict):
+    """Diferenças entre duas versões do schedule, por event_id."""
+    added: List[int]
+    removed: List[int]
+    status_changed: List[int]
+    score_changed: List[int]
+    kickoff_changed: List[int]
+
+
+def _user_timezone() -> ZoneInfo:
     try:
         # Definimos o fuso horário de referência para a nossa aplicação.
         # Isso garante que "dia 8" significa dia 8 no Brasil, não em UTC.
-        user_tz = ZoneInfo("America/Sao_Paulo")
+        return ZoneInfo("America/Sao_Paulo")
     except ZoneInfoNotFoundError:
         # Fallback para sistemas (especialmente Windows mais antigos) que podem não ter o db de timezone.
-        # Em caso de erro, avise o usuário ou use um fuso padrão.
         # pip install tzdata pode ser necessário nesses sistemas.
-        user_tz = ZoneInfo("Etc/GMT+3")
-
-
-    raw_events: List[Dict[str, Any]] = client.get_scheduled_events(event_date)
-
-    if not raw_events:
-        return pd.DataFrame(columns=[
-            'event_id', 'tournament_name', 'home_team', 'away_team', 
-            'start_time', 'status', 'home_team_id', 'away_team_id', 'tournament_id', 'customId'
-        ])
-
-    processed_matches = []
-    for event in raw_events:
-        start_timestamp = event.get('startTimestamp')
-        
-        if start_timestamp:
-            # 1. Criamos um datetime "ciente" (aware) de que o timestamp é UTC.
-            start_time_utc = datetime.fromtimestamp(start_timestamp, tz=ZoneInfo("UTC"))
-            
-            # 2. Convertemos o horário UTC para o fuso horário do usuário (ex: America/Sao_Paulo).
-            start_time_local = start_time_utc.astimezone(user_tz)
-
-            # 3. AGORA SIM: Filtramos comparando a data na visão do usuário.
-            if start_time_local.date() == event_date:
-                processed_matches.append({
-                    'event_id': event.get('id'),
-                    'tournament_name': event.get('tournament', {}).get('name'),
-                    'country': event.get('tournament', {}).get('category', {}).get('name'),
-                    'home_team': event.get('homeTeam', {}).get('name'),
-                    'away_team': event.get('awayTeam', {}).get('name'),
-                    # Armazenamos o horário local, que é mais útil para exibição.
-                    'start_time': start_time_local,
-                    'status': event.get('status', {}).get('description'),
-                    'home_team_id': event.get('homeTeam', {}).get('id'),
-                    'away_team_id': event.get('awayTeam', {}).get('id'),
-                    'tournament_id': event.get('tournament', {}).get('id'),
-                    'uniqueTournament_id': event.get('tournament', {}).get('uniqueTournament', {}).get('id'),
-                    'customId': event.get('customId'),
-                })
-
-    df = pd.DataFrame(processed_matches)
-
-    if not df.empty:
-        df = df.sort_values(by=['country', 'tournament_name', 'start_time']).reset_index(drop=True)
+        return ZoneInfo("Etc/GMT+3")
+
+
+def _local_day_bounds(start_date: date, end_date: date, user_tz: ZoneInfo) -> Tuple[float, float]:
+    """Início de `start_date` e fim de `end_date` (epoch, fim exclusivo) no fuso do usuário."""
+    start = pd.Timestamp(start_date).tz_localize(user_tz)
+    end = pd.Timestamp(end_date + timedelta(days=1)).tz_localize(user_tz)
+    return start.timestamp(), end.timestamp()
+
+
+def utc_dates_for_local_range(start_date: date, end_date: date, user_tz: ZoneInfo) -> List[date]:
+    """Datas UTC cujos schedules contêm algum instante do intervalo local [start_date, end_date]."""
+    day_start, day_end = _local_day_bounds(start_date, end_date, user_tz)
+    first = datetime.fromtimestamp(day_start, tz=timezone.utc).date()
+    last = datetime.fromtimestamp(day_end - 1, tz=timezone.utc).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def schedule_to_dataframe(
+    raw_events: List[Dict[str, Any]],
+    event_date: date,
+    user_tz: ZoneInfo,
+    end_date: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Achata o payload do schedule coluna a coluna e mantém só os jogos cuja data local
+    está entre `event_date` e `end_date` (padrão: o próprio `event_date`): o filtro é
+    uma máscara sobre os timestamps e a conversão UTC -> fuso do usuário é feita de uma
+    vez para a coluna inteira.
+    """
+    timestamps = np.array([e.get('startTimestamp') or np.nan for e in raw_events], dtype=float)
+    day_start, day_end = _local_day_bounds(event_date, end_date or event_date, user_tz)
+    mask = (timestamps >= day_start) & (timestamps < day_end)
+    events = [e for e, keep in zip(raw_events, mask) if keep]
+    if not events:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+    # Sub-dicionários extraídos uma vez por evento; cada coluna sai deles
+    tournaments = [e.get('tournament') or {} for e in events]
+    home_teams = [e.get('homeTeam') or {} for e in events]
+    away_teams = [e.get('awayTeam') or {} for e in events]
+
+    df = pd.DataFrame({
+        'event_id': [e.get('id') for e in events],
+        'tournament_name': [t.get('name') for t in tournaments],
+        'country': [(t.get('category') or {}).get('name') for t in tournaments],
+        'home_team': [t.get('name') for t in home_teams],
+        'away_team': [t.get('name') for t in away_teams],
+        # Armazenamos o horário local, que é mais útil para exibição.
+        'start_time': pd.to_datetime(timestamps[mask], unit='s', utc=True).tz_convert(user_tz),
+        'status': [(e.get('status') or {}).get('description') for e in events],
+        'status_type': [(e.get('status') or {}).get('type') for e in events],
+        'home_score': np.array([(e.get('homeScore') or {}).get('current') for e in events], dtype=float),
+        'away_score': np.array([(e.get('awayScore') or {}).get('current') for e in events], dtype=float),
+        'home_team_id': [t.get('id') for t in home_teams],
+        'away_team_id': [t.get('id') for t in away_teams],
+        'tournament_id': [t.get('id') for t in tournaments],
+        'uniqueTournament_id': [(t.get('uniqueTournament') or {}).get('id') for t in tournaments],
+        'season_id': [(e.get('season') or {}).get('id') for e in events],
+        'customId': [e.get('customId') for e in events],
+    }, columns=SCHEDULE_COLUMNS)
+    df = df.astype({column: 'category' for column in CATEGORICAL_COLUMNS})
+
+    return df.sort_values(by=['country', 'tournament_name', 'start_time']).reset_index(drop=True)
+
+
+def _fetch_utc_pages(client: SofaScoreClient, utc_dates: List[date], refresh: bool = False) -> List[List[Dict[str, Any]]]:
+    """Schedule de cada data UTC, buscados em paralelo."""
+    def fetch(utc_date: date) -> List[Dict[str, Any]]:
+        return client.get_scheduled_events(utc_date, refresh=refresh)
+    if len(utc_dates) == 1:
+        return [fetch(utc_dates[0])]
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(utc_dates))) as executor:
+        return list(executor.map(bind_context(fetch), utc_dates))
+
+
+def _merge_pages(pages: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Une os schedules sem repetição por event_id."""
+    # A API repete jogos perto da virada do dia em datas vizinhas: fica a versão mais recente
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for page in pages:
+        for event in page:
+            merged[event.get('id')] = event
+    return list(merged.values())
+
+
+def get_matches_dataframe(start_date: date, end_date: Optional[date] = None) -> pd.DataFrame:
+    """
+    Jogos do intervalo local [start_date, end_date] (ex.: um fim de semana inteiro), com
+    os dias definidos no fuso horário do usuário. Busca todas as datas UTC que cobrem o
+    intervalo, então jogos da noite no Brasil (já no dia seguinte em UTC) não se perdem.
+    """
+    end_date = end_date or start_date
+    key = (start_date, end_date)
+    with _schedule_lock:
+        cached = _schedule_frames.get(key)
+        if cached and time.time() < cached[0]:
+            return cached[1]
+
+    client = SofaScoreClient()
+    user_tz = _user_timezone()
+
+    raw_events = _merge_pages(_fetch_utc_pages(client, utc_dates_for_local_range(start_date, end_date, user_tz)))
+    # O schedule já traz torneio, temporada e times: indexamos para que as análises
+    # não precisem buscar `event/{id}` de novo
+    store_event_contexts(raw_events)
 
+    df = schedule_to_dataframe(raw_events, start_date, user_tz, end_date=end_date)
+    with _schedule_lock:
+        _store_schedule(key, df)
     return df
+
+
+def _empty_changes() -> ScheduleChanges:
+    return {'added': [], 'removed': [], 'status_changed': [], 'score_changed': [], 'kickoff_changed': []}
+
+
+def _score(value: Any) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def _event_signature(event: Dict[str, Any]) -> Tuple[Any, ...]:
+    """(status, placar da casa, placar do visitante, início em epoch) de um evento do schedule."""
+    return (
+        (event.get('status') or {}).get('description'),
+        _score((event.get('homeScore') or {}).get('current')),
+        _score((event.get('awayScore') or {}).get('current')),
+        int(event.get('startTimestamp') or 0),
+    )
+
+
+def _frame_signatures(df: pd.DataFrame) -> Dict[int, Tuple[Any, ...]]:
+    """As mesmas assinaturas, a partir de um DataFrame já montado."""
+    start_ts = (df['start_time'] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+    return {
+        int(event_id): (status, _score(home), _score(away), int(ts))
+        for event_id, status, home, away, ts in zip(
+            df['event_id'], df['status'].astype(object), df['home_score'], df['away_score'], start_ts
+        )
+    }
+
+
+def diff_schedule(
+    old_signatures: Dict[int, Tuple[Any, ...]], new_signatures: Dict[int, Tuple[Any, ...]]
+) -> ScheduleChanges:
+    """Compara duas versões do schedule (assinaturas por event_id)."""
+    changes = _empty_changes()
+    changes['removed'] = [event_id for event_id in old_signatures if event_id not in new_signatures]
+    for event_id, (status, home, away, start_ts) in new_signatures.items():
+        before = old_signatures.get(event_id)
+        if before is None:
+            changes['added'].append(event_id)
+            continue
+        if before[0] != status:
+            changes['status_changed'].append(event_id)
+        if before[1:3] != (home, away):
+            changes['score_changed'].append(event_id)
+        if before[3] != start_ts:
+            changes['kickoff_changed'].append(event_id)
+    return changes
+
+
+def _patch_frame(
+    old: pd.DataFrame,
+    events_by_id: Dict[int, Dict[str, Any]],
+    changes: ScheduleChanges,
+    start_date: date,
+    end_date: date,
+    user_tz: ZoneInfo,
+) -> pd.DataFrame:
+    """Aplica as mudanças ao DataFrame: remove, atualiza as células das linhas alteradas e acrescenta as novas."""
+    df = old[~old['event_id'].isin(changes['removed'])] if changes['removed'] else old.copy()
+
+    updated = list(dict.fromkeys(changes['status_changed'] + changes['score_changed'] + changes['kickoff_changed']))
+    if updated:
+        rows = pd.Index(df['event_id']).get_indexer(updated)
+        events = [events_by_id[event_id] for event_id in updated]
+        column = df.columns.get_loc
+        for name, field in (('status', 'description'), ('status_type', 'type')):
+            values = [(e.get('status') or {}).get(field) for e in events]
+            new_categories = {v for v in values if v is not None} - set(df[name].cat.categories)
+            if new_categories:
+                df[name] = df[name].cat.add_categories(sorted(new_categories))
+            df.iloc[rows, column(name)] = values
+        for side in ('home', 'away'):
+            scores = [(e.get(f'{side}Score') or {}).get('current') for e in events]
+            df.iloc[rows, column(f'{side}_score')] = np.array(scores, dtype=float)
+        start_ts = np.array([e.get('startTimestamp') or np.nan for e in events], dtype=float)
+        df.iloc[rows, column('start_time')] = pd.to_datetime(start_ts, unit='s', utc=True).tz_convert(user_tz)
+
+    if changes['added']:
+        added = [events_by_id[event_id] for event_id in changes['added']]
+        store_event_contexts(added)
+        df = pd.concat([df, schedule_to_dataframe(added, start_date, user_tz, end_date=end_date)], ignore_index=True)
+        # Torneios/países novos mudam as categorias: reaplica os tipos
+        df = df.astype({c: 'category' for c in CATEGORICAL_COLUMNS})
+    if changes['added'] or changes['kickoff_changed'] or changes['removed']:
+        df = df.sort_values(by=['country', 'tournament_name', 'start_time']).reset_index(drop=True)
+    return df
+
+
+def refresh_matches_dataframe(
+    start_date: date, end_date: Optional[date] = None, force: bool = False
+) -> Tuple[pd.DataFrame, ScheduleChanges]:
+    """
+    Atualização incremental do DataFrame de jogos do intervalo local.
+
+    Sem versão em cache, monta tudo (`get_matches_dataframe`). Com versão em cache, a cada
+    SCHEDULE_REFRESH_SECONDS (ou com `force`) rebaixa o schedule ignorando os caches,
+    compara status/placar/horário por event_id e corrige só as linhas alteradas ou novas.
+    Retorna o DataFrame e o conjunto de mudanças (vazio quando nada mudou).
+    """
+    end_date = end_date or start_date
+    key = (start_date, end_date)
+    with _schedule_lock:
+        cached = _schedule_frames.get(key)
+        refreshed_at = _schedule_refreshed_at.get(key, 0.0)
+    if cached is None:
+        df = get_matches_dataframe(start_date, end_date)
+        with _schedule_lock:
+            _schedule_refreshed_at[key] = time.time()
+        return df, _empty_changes()
+    old = cached[1]
+    if not force and time.time() - refreshed_at < SCHEDULE_REFRESH_SECONDS:
+        return old, _empty_changes()
+
+    client = SofaScoreClient()
+    user_tz = _user_timezone()
+    pages = _fetch_utc_pages(client, utc_dates_for_local_range(start_date, end_date, user_tz), refresh=True)
+    if not all(pages):
+        # Falha/bloqueio na API em alguma data: mantém a versão anterior em vez de
+        # tratar os jogos dela como removidos
+        return old, _empty_changes()
+
+    day_start, day_end = _local_day_bounds(start_date, end_date, user_tz)
+    events_by_id = {
+        e.get('id'): e for e in _merge_pages(pages) if day_start <= (e.get('startTimestamp') or 0) < day_end
+    }
+    new_signatures = {event_id: _event_signature(e) for event_id, e in events_by_id.items()}
+    with _schedule_lock:
+        old_signatures = _schedule_signatures.get(key)
+    if old_signatures is None:
+        old_signatures = _frame_signatures(old) if not old.empty else {}
+    changes = diff_schedule(old_signatures, new_signatures)
+
+    if any(changes.values()):
+        df = _patch_frame(old, events_by_id, changes, start_date, end_date, user_tz)
+    else:
+        df = old
+
+    with _schedule_lock:
+        _store_schedule(key, df)
+        _schedule_signatures[key] = new_signatures
+        _schedule_refreshed_at[key] = time.time()
+    return df, changes
+
+
+def invalidate_match_caches(changes: ScheduleChanges, client: Optional[SofaScoreClient] = None) -> List[str]:
+    """
+    Descarta dos caches só os recursos por jogo afetados pelas mudanças: detalhes,
+    estatísticas e escalações de jogos com status/placar novo; detalhes dos jogos
+    remarcados. O cache em memória do cliente é do processo, então vale para todos os
+    clientes abertos. Também descarta os view models dessas partidas, o que avança a
+    versão delas (ver `match_context`), então contextos guardados pelo dashboard são recriados.
+    Retorna os endpoints invalidados.
+    """
+    client = client or SofaScoreClient()
+    live_ids = set(changes['status_changed']) | set(changes['score_changed'])
+    endpoints = [template.format(event_id=event_id) for event_id in sorted(live_ids)
+                 for template in MATCH_ENDPOINTS_ON_CHANGE]
+    endpoints += [f"event/{event_id}" for event_id in sorted(set(changes['kickoff_changed']) - live_ids)]
+    client.invalidate(endpoints)
+    affected = sorted(live_ids | set(changes['kickoff_changed']))
+    invalidate_match_view_models(affected)
+    return endpoints
+
+
+def get_daily_matches_dataframe(event_date: date) -> pd.DataFrame:
+    """
+    Busca os jogos de uma data específica e os retorna em um DataFrame Pandas estruturado,
+    respeitando o fuso horário local do usuário para a definição do "dia".
+    """
+    return get_matches_dataframe(event_date)
@@ -0,0 +1,244 @@
+# samsbet/services/odds_service.py
+
+import numpy as np
+import pandas as pd
+from scipy.stats import poisson, nbinom
+from typing import List, Sequence, Optional, Union
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# Linhas padrão usadas pela página de análise
+OVER_UNDER_LINES = [0.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5]
+ASIAN_LINES = [1.0, 1.25, 1.75, 2.0, 2.25, 2.75, 3.0, 3.25, 3.75, 4.0]
+GOALKEEPER_LINES = [0.5, 1.5, 2.5, 3.5, 4.5]
+
+MARKET_COLUMNS = ['partida', 'mercado', 'linha', 'lado', 'prob', 'odd']
+
+
+def dynamic_lines(avg: float, num_lines: int = 3) -> List[float]:
+    """Gera uma lista de linhas de aposta '.5' centradas em torno da média."""
+    if not avg or avg <= 0:
+        return []
+    # Encontra a linha .5 mais próxima da média
+    center_line = round(avg - 0.5) + 0.5
+    lines = [center_line + i for i in range(-num_lines, num_lines + 1)]
+    # Garante que as linhas sejam sempre positivas
+    return [line for line in lines if line > 0]
+
+
+def _default_max_count(mu: np.ndarray) -> int:
+    """Suporte suficiente para que a cauda truncada seja desprezível."""
+    if mu.size == 0:
+        return 1
+    top = float(np.nanmax(mu))
+    if not np.isfinite(top) or top <= 0:
+        return 1
+    return int(np.ceil(top + 10 * np.sqrt(top) + 10))
+
+
+def _fold_tail(pmf: np.ndarray, tail: np.ndarray) -> np.ndarray:
+    """Soma a massa acima de max_count no último valor (a distribuição continua somando 1)."""
+    pmf[:, -1] += tail
+    return pmf
+
+
+def empirical_pmf(samples: Sequence, max_count: Optional[int] = None) -> np.ndarray:
+    """
+    Distribuição empírica de contagens (ex.: gols de cada jogo do H2H).
+
+    Aceita uma lista de amostras (retorna vetor 1D) ou uma lista de listas,
+    uma por partida (retorna matriz n_partidas x (max_count + 1)).
+    """
+    if len(samples) > 0 and all(isinstance(s, (list, tuple, np.ndarray, pd.Series)) for s in samples):
+        groups = [np.asarray([x for x in s if x is not None], dtype=float) for s in samples]
+        single = False
+    else:
+        groups = [np.asarray([x for x in samples if x is not None], dtype=float)]
+        single = True
+
+    groups = [g[np.isfinite(g)].astype(int).clip(min=0) for g in groups]
+    if max_count is None:
+        max_count = max([int(g.max()) for g in groups if g.size] or [0])
+    width = max_count + 1
+
+    # Um único bincount para todas as partidas: cada linha ganha um deslocamento próprio
+    rows = np.repeat(np.arange(len(groups)), [g.size for g in groups])
+    values = np.concatenate(groups) if groups else np.array([], dtype=int)
+    counts = np.bincount(rows * width + values.clip(max=max_count), minlength=len(groups) * width)
+    counts = counts.reshape(len(groups), width).astype(float)
+
+    sizes = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pmf = np.where(sizes > 0, counts / sizes, 0.0)
+    return pmf[0] if single else pmf
+
+
+def poisson_pmf(mu: ArrayLike, max_count: Optional[int] = None) -> np.ndarray:
+    """Distribuição de Poisson com média `mu` (escalar -> 1D, vetor -> uma linha por média)."""
+    single = np.ndim(mu) == 0
+    mu_arr = np.nan_to_num(np.atleast_1d(np.asarray(mu, dtype=float)), nan=0.0).clip(min=0)
+    if max_count is None:
+        max_count = _default_max_count(mu_arr)
+    k = np.arange(max_count + 1)
+    pmf = poisson.pmf(k[None, :], mu_arr[:, None])
+    pmf = _fold_tail(pmf, poisson.sf(max_count, mu_arr))
+    return pmf[0] if single else pmf
+
+
+def negative_binomial_pmf(mu: ArrayLike, var: ArrayLike, max_count: Optional[int] = None) -> np.ndarray:
+    """
+    Binomial negativa parametrizada por média e variância, para contagens com
+    sobredispersão (variância > média). Onde não há sobredispersão, usa Poisson.
+    """
+    single = np.ndim(mu) == 0 and np.ndim(var) == 0
+    mu_arr = np.nan_to_num(np.atleast_1d(np.asarray(mu, dtype=float)), nan=0.0).clip(min=0)
+    var_arr = np.broadcast_to(np.nan_to_num(np.asarray(var, dtype=float), nan=0.0), mu_arr.shape)
+    if max_count is None:
+        max_count = _default_max_count(np.maximum(mu_arr, var_arr))
+    k = np.arange(max_count + 1)
+
+    overdispersed = var_arr > mu_arr
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n = np.where(overdispersed, mu_arr ** 2 / (var_arr - mu_arr), 1.0)
+        p = np.where(overdispersed, n / (n + mu_arr), 0.5)
+    nb = _fold_tail(nbinom.pmf(k[None, :], n[:, None], p[:, None]), nbinom.sf(max_count, n, p))
+    pois = _fold_tail(poisson.pmf(k[None, :], mu_arr[:, None]), poisson.sf(max_count, mu_arr))
+    pmf = np.where(overdispersed[:, None], nb, pois)
+    return pmf[0] if single else pmf
+
+
+def empirical_btts(home_goals: Sequence, away_goals: Sequence) -> float:
+    """Frequência de jogos em que ambos marcaram (amostras pareadas)."""
+    home = np.asarray(home_goals, dtype=float)
+    away = np.asarray(away_goals, dtype=float)
+    if home.size == 0:
+        return 0.0
+    return float(((home > 0) & (away > 0)).mean())
+
+
+def independent_btts(home_pmf: np.ndarray, away_pmf: np.ndarray) -> np.ndarray:
+    """P(ambas marcam) supondo gols independentes: (1 - P(casa=0)) * (1 - P(fora=0))."""
+    home_pmf = np.atleast_2d(home_pmf)
+    away_pmf = np.atleast_2d(away_pmf)
+    return (1 - home_pmf[:, 0]) * (1 - away_pmf[:, 0])
+
+
+def _fair_odd(numerator: np.ndarray, prob: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        odd = np.where(prob > 0, numerator / prob, np.inf)
+    return np.round(odd, 2)
+
+
+def _line_outcomes(cdf: np.ndarray, pmf: np.ndarray, lines: np.ndarray):
+    """
+    Probabilidades de vitória (over/under) e devolução para cada linha.
+
+    Linhas de quarto (x.25/x.75) são tratadas como duas meias apostas nas linhas
+    vizinhas (ex.: 2.25 = metade em 2.0 e metade em 2.5), o que reproduz as regras de
+    meia vitória/meia derrota. A odd justa de cada lado é então
+    (2 - devolução_baixa - devolução_alta) / (vitória_baixa + vitória_alta).
+    """
+    is_quarter = (lines * 4) % 2 == 1
+    halves = np.stack([np.where(is_quarter, lines - 0.25, lines),
+                       np.where(is_quarter, lines + 0.25, lines)])
+    max_count = cdf.shape[1] - 1
+
+    base = np.floor(halves).astype(int)
+    is_whole = halves == base
+    idx = base.clip(0, max_count)
+    # P(X <= base) e P(X == base), com índices negativos tratados como massa zero
+    cdf_at = np.where(base[None] >= 0, cdf[:, idx], 0.0)
+    pmf_at = np.where((base[None] >= 0) & (base[None] <= max_count), pmf[:, idx], 0.0)
+
+    push = np.where(is_whole[None], pmf_at, 0.0)
+    win_over = 1 - cdf_at
+    win_under = cdf_at - push
+
+    push_sum = push.sum(axis=1)
+    over_sum = win_over.sum(axis=1)
+    under_sum = win_under.sum(axis=1)
+    return over_sum / 2, under_sum / 2, push_sum / 2, _fair_odd(2 - push_sum, over_sum), _fair_odd(2 - push_sum, under_sum)
+
+
+def _block(mercado: str, lado: str, lines: np.ndarray, prob: np.ndarray, odd: np.ndarray) -> pd.DataFrame:
+    n, n_lines = prob.shape
+    return pd.DataFrame({
+        'partida': np.repeat(np.arange(n), n_lines),
+        'mercado': mercado,
+        'linha': np.tile(lines, n),
+        'lado': lado,
+        'prob': prob.ravel(),
+        'odd': odd.ravel(),
+    })
+
+
+def compute_markets(
+    pmf: np.ndarray,
+    over_under_lines: Optional[Sequence[float]] = None,
+    asian_lines: Optional[Sequence[float]] = None,
+    exact_totals: Optional[Sequence[int]] = None,
+    p_btts: Optional[ArrayLike] = None,
+) -> pd.DataFrame:
+    """
+    Calcula probabilidades e odds justas de todos os mercados a partir de uma
+    distribuição discreta de contagens (gols, chutes, escanteios, defesas...).
+
+    `pmf` pode ser um vetor (uma partida) ou uma matriz com uma distribuição por linha,
+    e tudo é avaliado de uma vez. Retorna uma tabela longa com as colunas
+    `partida, mercado, linha, lado, prob, odd`, onde `mercado` é 'over_under',
+    'asiatico', 'total_exato' ou 'ambas'. Odds sem probabilidade são `inf`.
+    """
+    pmf_2d = np.atleast_2d(np.asarray(pmf, dtype=float))
+    n = pmf_2d.shape[0]
+    cdf = pmf_2d.cumsum(axis=1)
+    blocks = []
+
+    if over_under_lines is None:
+        over_under_lines = OVER_UNDER_LINES
+    if asian_lines is None:
+        asian_lines = ASIAN_LINES
+
+    for mercado, lines in (('over_under', over_under_lines), ('asiatico', asian_lines)):
+        lines = np.asarray(lines, dtype=float)
+        if lines.size == 0:
+            continue
+        p_over, p_under, p_push, odd_over, odd_under = _line_outcomes(cdf, pmf_2d, lines)
+        blocks.append(_block(mercado, 'over', lines, p_over, odd_over))
+        blocks.append(_block(mercado, 'under', lines, p_under, odd_under))
+        if mercado == 'asiatico':
+            blocks.append(_block(mercado, 'devolucao', lines, p_push, np.full_like(p_push, np.nan)))
+
+    if exact_totals is not None and len(exact_totals) > 0:
+        totals = np.asarray(exact_totals, dtype=int)
+        inside = (totals >= 0) & (totals < pmf_2d.shape[1])
+        p_exact = np.where(inside[None], pmf_2d[:, totals.clip(0, pmf_2d.shape[1] - 1)], 0.0)
+        blocks.append(_block('total_exato', 'exato', totals.astype(float), p_exact, _fair_odd(1.0, p_exact)))
+
+    if p_btts is not None:
+        p_yes = np.broadcast_to(np.asarray(p_btts, dtype=float), (n,)).reshape(n, 1)
+        p_both = np.hstack([p_yes, 1 - p_yes])
+        odds = _fair_odd(1.0, p_both)
+        blocks.append(_block('ambas', 'sim', np.array([np.nan]), p_both[:, :1], odds[:, :1]))
+        blocks.append(_block('ambas', 'nao', np.array([np.nan]), p_both[:, 1:], odds[:, 1:]))
+
+    if not blocks:
+        return pd.DataFrame(columns=MARKET_COLUMNS)
+
+    table = pd.concat(blocks, ignore_index=True)
+    return table.sort_values('partida', kind='stable').reset_index(drop=True)
+
+
+def market_view(table: pd.DataFrame, mercado: str, value: str = 'odd', partida: int = 0) -> pd.DataFrame:
+    """Recorte de um mercado em formato largo (linha x lado), pronto para exibição."""
+    subset = table[(table['mercado'] == mercado) & (table['partida'] == partida)]
+    if subset.empty:
+        return pd.DataFrame()
+    return subset.pivot(index='linha', columns='lado', values=value)
+
+
+def poisson_over_under(mu: float, lines: Sequence[float]) -> pd.DataFrame:
+    """Atalho para o caso mais comum da página: odds Over/Under de Poisson por linha."""
+    if not lines:
+        return pd.DataFrame()
+    table = compute_markets(poisson_pmf(mu), over_under_lines=lines, asian_lines=[])
+    return market_view(table, 'over_under')
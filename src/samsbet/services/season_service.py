@@ -0,0 +1,137 @@
+# samsbet/services/season_service.py
+
+import time
+from typing import Any, Dict, List, Optional
+
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.event_store import get_season_totals, is_finished, put_season_totals
+from samsbet.services.form_service import fetch_team_event_stats
+
+# Totais de temporada mantidos de forma incremental: o `statistics/overall` completo só
+# é buscado na primeira vez e para reconciliação periódica; entre uma e outra, cada
+# jogo novo do time tem suas estatísticas somadas aos totais armazenados.
+RECONCILE_INTERVAL_SECONDS = 7 * 86400
+# O agregado demora a incluir um jogo recém-terminado: só depois disso (contado do início
+# do jogo) um jogo anterior à busca é considerado coberto por ela
+AGGREGATE_SETTLE_SECONDS = 6 * 3600
+# Espera mínima entre buscas do agregado feitas para cobrir jogos que ele ainda não tinha
+RECONCILE_RETRY_SECONDS = 3600
+
+# Campo de `statistics/overall` -> (campo de `get_team_stats_for_event`, perspectiva)
+SEASON_FIELDS_FROM_EVENT = {
+    'shots': ('total_shots', 'pro'),
+    'shotsOnTarget': ('shots_on_target', 'pro'),
+    'shotsFromInsideTheBox': ('shots_inside_box', 'pro'),
+    'bigChancesCreated': ('big_chances', 'pro'),
+    'saves': ('saves', 'pro'),
+    'corners': ('corner_kicks', 'pro'),
+    'bigChancesAgainst': ('big_chances', 'contra'),
+    'shotsOnTargetAgainst': ('shots_on_target', 'contra'),
+    'cornersAgainst': ('corner_kicks', 'contra'),
+}
+
+
+def _season_events(events: List[Dict[str, Any]], unique_tournament_id: int, season_id: int) -> List[Dict[str, Any]]:
+    """Jogos finalizados da página de últimos eventos que pertencem à competição/temporada."""
+    return [
+        e for e in events
+        if is_finished(e) and e.get("id")
+        and e.get("season", {}).get("id") == season_id
+        and e.get("tournament", {}).get("uniqueTournament", {}).get("id") == unique_tournament_id
+    ]
+
+
+def fold_event_into_totals(
+    totals: Dict[str, Any], team_id: int, event: Dict[str, Any], event_stats: Dict[str, Dict[str, Any]]
+) -> None:
+    """Soma as estatísticas de um jogo finalizado aos totais de temporada do time (in place)."""
+    own, other = ('home', 'away') if event.get("homeTeam", {}).get("id") == team_id else ('away', 'home')
+    for season_field, (event_field, perspective) in SEASON_FIELDS_FROM_EVENT.items():
+        side = own if perspective == 'pro' else other
+        totals[season_field] = totals.get(season_field, 0) + event_stats.get(side, {}).get(event_field, 0)
+    totals['goalsScored'] = totals.get('goalsScored', 0) + (event.get(f"{own}Score", {}).get("current") or 0)
+    totals['goalsConceded'] = totals.get('goalsConceded', 0) + (event.get(f"{other}Score", {}).get("current") or 0)
+    totals['matches'] = totals.get('matches', 0) + 1
+
+
+def _start(event: Dict[str, Any]) -> int:
+    return event.get("startTimestamp") or 0
+
+
+def covered_events(
+    season_events: List[Dict[str, Any]], totals: Dict[str, Any], fetched_at: float
+) -> List[Dict[str, Any]]:
+    """
+    Jogos que um agregado buscado em `fetched_at` já inclui: os que começaram há mais de
+    AGGREGATE_SETTLE_SECONDS, limitados aos `matches` mais antigos que o agregado declara.
+    """
+    settled = sorted((e for e in season_events if _start(e) + AGGREGATE_SETTLE_SECONDS <= fetched_at), key=_start)
+    matches = totals.get('matches')
+    if matches is not None:
+        settled = settled[:max(0, int(matches))]
+    return settled
+
+
+def _reconcile(
+    client: SofaScoreClient, team_id: int, unique_tournament_id: int, season_id: int,
+    season_events: List[Dict[str, Any]], stored: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Busca o agregado completo (sem cache) e o grava como nova base, marcando só os jogos que ele cobre."""
+    fetched_at = time.time()
+    totals = client.get_team_stats(team_id, unique_tournament_id, season_id, refresh=True)
+    if not totals:
+        # Sem agregado (bloqueio/erro): usa os totais antigos, se houver, sem marcar reconciliação
+        return stored["totals"] if stored else {}
+    folded = [e["id"] for e in covered_events(season_events, totals, fetched_at)]
+    put_season_totals(team_id, unique_tournament_id, season_id, totals, folded, fetched_at)
+    return totals
+
+
+def get_team_season_stats(
+    team_id: int,
+    unique_tournament_id: int,
+    season_id: int,
+    events: Optional[List[Dict[str, Any]]] = None,
+    client: Optional[SofaScoreClient] = None,
+) -> Dict[str, Any]:
+    """
+    Estatísticas agregadas do time na temporada (mesmas chaves de `get_team_stats`).
+
+    `events` é a página de últimos eventos do time. Jogos finalizados da temporada que
+    começaram depois da última busca do agregado são somados aos totais (estatísticas do
+    event store quando possível). Jogos anteriores à busca que ela não cobria não são
+    somados à mão (o agregado pode já tê-los incluído): quando assentam, o agregado é
+    buscado de novo. Sem totais armazenados, ou a cada RECONCILE_INTERVAL_SECONDS, o
+    agregado completo também é buscado e passa a ser a nova base.
+    """
+    client = client or SofaScoreClient()
+    if events is None:
+        events = client.get_team_last_events(team_id)
+    season_events = _season_events(events, unique_tournament_id, season_id)
+
+    stored = get_season_totals(team_id, unique_tournament_id, season_id)
+    now = time.time()
+    if stored is None or now - stored["reconciled_at"] >= RECONCILE_INTERVAL_SECONDS:
+        return _reconcile(client, team_id, unique_tournament_id, season_id, season_events, stored)
+
+    reconciled_at = stored["reconciled_at"]
+    folded = stored["folded_event_ids"]
+    pending = [e for e in season_events if e["id"] not in folded]
+    uncertain = [e for e in pending if _start(e) < reconciled_at]
+    if (any(_start(e) + AGGREGATE_SETTLE_SECONDS <= now for e in uncertain)
+            and now - reconciled_at >= RECONCILE_RETRY_SECONDS):
+        return _reconcile(client, team_id, unique_tournament_id, season_id, season_events, stored)
+
+    totals = dict(stored["totals"])
+    new_events = [e for e in pending if _start(e) >= reconciled_at]
+    if not new_events:
+        return totals
+
+    for event in sorted(new_events, key=_start):
+        event_stats = fetch_team_event_stats(client, event)
+        if not any(event_stats.get("home", {}).values()) and not any(event_stats.get("away", {}).values()):
+            continue  # estatísticas indisponíveis agora: o jogo é somado numa próxima chamada
+        fold_event_into_totals(totals, team_id, event, event_stats)
+        folded.add(event["id"])
+    put_season_totals(team_id, unique_tournament_id, season_id, totals, folded, reconciled_at)
+    return totals
@@ -0,0 +1,174 @@
+# samsbet/services/snapshot_service.py
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.disk_cache import get_from_disk_cache, set_to_disk_cache
+from samsbet.core.player_index import update_player_index
+
+# Snapshot das estatísticas de temporada de TODOS os jogadores de uma competição,
+# montado uma vez por liga (paginando o endpoint de statistics) e fatiado por time
+# localmente. Fica no cache em disco em formato colunar (uma lista por coluna).
+SNAPSHOT_TTL_SECONDS = 86400
+PAGE_SIZE = 100
+MAX_PAGES = 30
+
+ID_COLUMNS = ['player_id', 'player_name', 'team_id', 'team_name', 'is_goalkeeper', 'goalkeeper_rank']
+STAT_COLUMNS = list(dict.fromkeys(SofaScoreClient.PLAYER_STAT_FIELDS + SofaScoreClient.GOALKEEPER_STAT_FIELDS))
+
+_memory_snapshots: Dict[Tuple, Tuple[float, pd.DataFrame]] = {}
+
+
+def _snapshot_key(uniqueTournament_id: int, season_id: int, match_type: Optional[str]) -> str:
+    return f"v2:league_players:{uniqueTournament_id}:{season_id}:{match_type or 'total'}"
+
+
+def _fetch_all_pages(
+    client: SofaScoreClient,
+    uniqueTournament_id: int,
+    season_id: int,
+    fields: List[str],
+    order: str,
+    filters: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Percorre todas as páginas (`page`/`pages`) de uma consulta de statistics. Retorna as
+    linhas e se a consulta chegou ao fim: uma página que volta vazia antes da última
+    (bloqueio/erro, o cliente devolve `{}`) deixa o resultado incompleto.
+    """
+    results: List[Dict[str, Any]] = []
+    for page_index in range(MAX_PAGES):
+        data = client.get_season_player_stats_page(
+            uniqueTournament_id, season_id, fields,
+            offset=page_index * PAGE_SIZE, limit=PAGE_SIZE, order=order, filters=filters,
+        )
+        if "results" not in data:
+            return results, False
+        page_results = data["results"]
+        results.extend(page_results)
+        if len(page_results) < PAGE_SIZE or data.get("page", 0) >= data.get("pages", 0):
+            break
+    return results, True
+
+
+def _rows_to_frame(rows: List[Dict[str, Any]], goalkeeper_order: Dict[int, int]) -> pd.DataFrame:
+    """Linhas da API -> tabela colunar (ids, nomes, flag de goleiro e campos numéricos)."""
+    columns: Dict[str, Any] = {
+        'player_id': [r.get('player', {}).get('id') for r in rows],
+        'player_name': [r.get('player', {}).get('name') for r in rows],
+        'team_id': [r.get('team', {}).get('id') for r in rows],
+        'team_name': [r.get('team', {}).get('name') for r in rows],
+    }
+    columns['is_goalkeeper'] = [pid in goalkeeper_order for pid in columns['player_id']]
+    columns['goalkeeper_rank'] = [goalkeeper_order.get(pid, -1) for pid in columns['player_id']]
+    for field in STAT_COLUMNS:
+        columns[field] = np.array([r.get(field) or 0 for r in rows], dtype=float)
+    return pd.DataFrame(columns, columns=ID_COLUMNS + STAT_COLUMNS)
+
+
+def build_league_player_snapshot(
+    uniqueTournament_id: int,
+    season_id: int,
+    match_type: Optional[str] = None,
+    client: Optional[SofaScoreClient] = None,
+) -> pd.DataFrame:
+    """
+    Busca as estatísticas de temporada de todos os jogadores da competição (todas as
+    páginas, campos de linha e de goleiro juntos) e grava o snapshot.
+
+    Sem `match_type`, faz também uma consulta `position.in.G` para marcar os goleiros
+    (e sua ordem por nota); os snapshots de casa/fora servem só aos jogadores de linha.
+
+    Se alguma página (ou a consulta de goleiros) falhar, nada é gravado e o retorno é
+    vazio: um snapshot parcial seria lido como completo pelas análises por um dia.
+    """
+    client = client or SofaScoreClient()
+    filters = [f"type.EQ.{match_type}"] if match_type in ("home", "away") else None
+    rows, complete = _fetch_all_pages(client, uniqueTournament_id, season_id, STAT_COLUMNS, "-totalShots", filters)
+    if not complete:
+        return pd.DataFrame(columns=ID_COLUMNS + STAT_COLUMNS)
+
+    goalkeeper_order: Dict[int, int] = {}
+    if filters is None:
+        goalkeepers, complete = _fetch_all_pages(
+            client, uniqueTournament_id, season_id, SofaScoreClient.GOALKEEPER_STAT_FIELDS, "-rating", ["position.in.G"]
+        )
+        if not complete:
+            return pd.DataFrame(columns=ID_COLUMNS + STAT_COLUMNS)
+        for rank, row in enumerate(goalkeepers):
+            goalkeeper_order.setdefault(row.get('player', {}).get('id'), rank)
+        # Goleiros fora do top de chutes não aparecem na primeira consulta
+        known = {r.get('player', {}).get('id') for r in rows}
+        rows = rows + [r for r in goalkeepers if r.get('player', {}).get('id') not in known]
+
+    df = _rows_to_frame(rows, goalkeeper_order)
+    if df.empty:
+        return df
+    if filters is None:
+        update_player_index(
+            {'player_id': r.player_id, 'name': r.player_name, 'team_id': r.team_id, 'team_name': r.team_name,
+             'position': 'G' if r.is_goalkeeper else None}
+            for r in df.itertuples(index=False)
+        )
+
+    set_to_disk_cache(
+        _snapshot_key(uniqueTournament_id, season_id, match_type),
+        {"created_at": time.time(), "columns": {c: df[c].tolist() for c in df.columns}},
+        SNAPSHOT_TTL_SECONDS,
+    )
+    _memory_snapshots[(uniqueTournament_id, season_id, match_type)] = (time.time() + SNAPSHOT_TTL_SECONDS, df)
+    return df
+
+
+def load_league_player_snapshot(
+    uniqueTournament_id: int, season_id: int, match_type: Optional[str] = None
+) -> Optional[pd.DataFrame]:
+    """Snapshot já montado (memória ou disco), ou None — nunca dispara requisições."""
+    key = (uniqueTournament_id, season_id, match_type)
+    cached = _memory_snapshots.get(key)
+    if cached and time.time() < cached[0]:
+        return cached[1]
+
+    stored = get_from_disk_cache(_snapshot_key(uniqueTournament_id, season_id, match_type))
+    if not isinstance(stored, dict) or not stored.get("columns"):
+        return None
+    df = pd.DataFrame(stored["columns"], columns=ID_COLUMNS + STAT_COLUMNS)
+    expires_at = stored.get("created_at", time.time()) + SNAPSHOT_TTL_SECONDS
+    _memory_snapshots[key] = (expires_at, df)
+    return df
+
+
+def _frame_to_rows(df: pd.DataFrame, fields: List[str]) -> List[Dict[str, Any]]:
+    """Fatia do snapshot -> linhas no formato da API (`player`, `team` e campos)."""
+    rows = []
+    for record in df[['player_id', 'player_name', 'team_id', 'team_name'] + fields].to_dict('records'):
+        row = {
+            'player': {'id': record.pop('player_id'), 'name': record.pop('player_name')},
+            'team': {'id': record.pop('team_id'), 'name': record.pop('team_name')},
+        }
+        row.update({field: int(value) for field, value in record.items()})
+        rows.append(row)
+    return rows
+
+
+def team_player_rows(snapshot: pd.DataFrame, team_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Jogadores do time ordenados por chutes (mesmo formato de `get_player_stats_for_team`).
+    Sem `limit` devolve o elenco inteiro; quem exibe o top N corta a lista.
+    """
+    team_df = snapshot[snapshot['team_id'] == team_id]
+    team_df = team_df.sort_values('totalShots', ascending=False, kind='stable')
+    if limit is not None:
+        team_df = team_df.head(limit)
+    return _frame_to_rows(team_df, SofaScoreClient.PLAYER_STAT_FIELDS)
+
+
+def team_goalkeeper_rows(snapshot: pd.DataFrame, team_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+    """Goleiros do time na ordem da consulta por nota (mesmo formato de `get_goalkeeper_stats_for_team`)."""
+    team_df = snapshot[(snapshot['team_id'] == team_id) & snapshot['is_goalkeeper']]
+    team_df = team_df.sort_values('goalkeeper_rank', kind='stable').head(limit)
+    return _frame_to_rows(team_df, SofaScoreClient.GOALKEEPER_STAT_FIELDS)
@@ -3,8 +3,12 @@
 import pandas as pd
 import numpy as np
 from scipy.stats import poisson
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.core.event_store import get_team_event_stats
+from samsbet.core.player_index import update_player_index
+from samsbet.services.match_context import MatchContext
+from samsbet.services.odds_service import compute_markets, market_view, poisson_pmf, GOALKEEPER_LINES
 
 def get_variation_level(data: list) -> str:
     """
@@ -35,216 +39,251 @@ def get_variation_level(data: list) -> str:
         return "Média"
     return "Alta"
 
-def _process_player_stats_to_dataframe(
-    raw_player_stats: List[Dict[str, Any]],
-    last_match_shots_map: Dict[int, Dict[str, int]]
-) -> pd.DataFrame:
+def _column(records: List[Dict[str, Any]], key: str, dtype=float) -> np.ndarray:
+    """Extrai um campo numérico de todos os registros brutos como um array NumPy."""
+    return np.fromiter((r.get(key) or 0 for r in records), dtype=dtype, count=len(records))
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1, decimals: int = 2) -> np.ndarray:
+    """Divisão vetorizada arredondada; 0/0 vira 0 (divisões por zero com numerador > 0 continuam inf)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.round(numerator / denominator * scale, decimals)
+    return np.where(np.isnan(values), 0.0, values)
+
+
+def _poisson_lines(lam: np.ndarray, valid: np.ndarray, lines: List[float]):
     """
-    Processa os dados brutos de jogadores e adiciona uma camada rica de análise estatística
-    e probabilidades para apostas esportivas.
+    Probabilidades Over/Under de Poisson para todas as linhas de uma vez
+    (matrizes jogadores x linhas). Linhas de jogadores sem amostra mínima ficam NaN.
     """
-    if not raw_player_stats:
-        return pd.DataFrame()
-    
-    
-
-    all_data = []
-    for player_data in raw_player_stats:
-        player_info = player_data.get("player", {})
-        player_id = player_info.get("id")
+    k = np.floor(lines).astype(int)
+    prob_under = poisson.cdf(k[None, :], np.where(valid, lam, 0)[:, None])
+    prob_under = np.where(valid[:, None], prob_under, np.nan)
+    return 1 - prob_under, prob_under
 
-        last_match_stats = last_match_shots_map.get(player_id, {})
 
-        all_data.append({
-            'Jogador': player_info.get('name'),
-            'Total de chutes': player_data.get('totalShots', 0),
-            'Chutes no alvo': player_data.get('shotsOnTarget', 0),
-            'Partidas jogadas': player_data.get('appearances', 0),
-            'Min/Jogados': player_data.get('minutesPlayed', 0),
-            'Chutes (Última)': last_match_stats.get('total_shots', 0),
-            'Chutes Alvo (Última)': last_match_stats.get('shots_on_target', 0)
-        })
+def _fair_odds(prob: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore'):
+        return np.round(1 / prob, 2)
 
-    if not all_data:
-        return pd.DataFrame()
 
-    df = pd.DataFrame(all_data)
+def _last_match_columns(player_ids: List[Any], last_match_map: Dict[int, Any], fields: List[str]) -> pd.DataFrame:
+    """
+    Junção vetorizada por player_id com as estatísticas do último jogo (uma linha por ID,
+    na ordem pedida; quem não jogou fica com 0). Aceita valores dict ou escalares.
+    """
+    if last_match_map and not isinstance(next(iter(last_match_map.values())), dict):
+        last_match_map = {pid: {fields[0]: value} for pid, value in last_match_map.items()}
+    last_df = pd.DataFrame.from_dict(last_match_map, orient='index') if last_match_map else pd.DataFrame()
+    aligned = last_df.reindex(index=pd.Index(player_ids), columns=fields)
+    return aligned.fillna(0).astype(int)
 
-    with np.errstate(divide='ignore', invalid='ignore'):
-        df['Chutes/P'] = (df['Total de chutes'] / df['Partidas jogadas']).round(2)
-        df['Chutes Alvo/P'] = (df['Chutes no alvo'] / df['Partidas jogadas']).round(2)
-        df['Min/Chute'] = (df['Min/Jogados'] / df['Total de chutes']).round(2)
-        df['Min/Chute Alvo'] = (df['Min/Jogados'] / df['Chutes no alvo']).round(2)
-        df['Min/Partida'] = (df['Min/Jogados'] / df['Partidas jogadas']).round(2)
-        df['Eficiência %'] = (df['Chutes no alvo'] / df['Total de chutes'] * 100).round(1)
-    df = df.fillna(0)
 
-    min_jogos = 5
-    jogos_validos = df['Partidas jogadas'] >= min_jogos
-    lambda_chutes_alvo = df.loc[jogos_validos, 'Chutes Alvo/P']
+def _index_players(rows: List[Dict[str, Any]], position: str | None = None) -> None:
+    """
+    Registra no índice de jogadores (player_id -> nome/posição/time) quem ainda não está
+    nele; o snapshot da liga montado pelo warmer é quem atualiza os já conhecidos.
+    """
+    update_player_index(
+        ({
+            'player_id': row.get('player', {}).get('id'),
+            'name': row.get('player', {}).get('name'),
+            'position': position or row.get('player', {}).get('position'),
+            'team_id': row.get('team', {}).get('id'),
+            'team_name': row.get('team', {}).get('name'),
+        }
+        for row in rows),
+        only_new=True,
+    )
 
-    df['Prob_Over_0.5'] = np.nan
-    df.loc[jogos_validos, 'Prob_Over_0.5'] = 1 - poisson.cdf(0, lambda_chutes_alvo)
 
-    df['Prob_Over_1.5'] = np.nan
-    df.loc[jogos_validos, 'Prob_Over_1.5'] = 1 - poisson.cdf(1, lambda_chutes_alvo)
+def _process_player_stats_to_dataframe(
+    raw_player_stats: List[Dict[str, Any]],
+    last_match_shots_map: Dict[int, Dict[str, int]]
+) -> pd.DataFrame:
+    """
+    Processa os dados brutos de jogadores e adiciona uma camada rica de análise estatística
+    e probabilidades para apostas esportivas.
 
-    df['Odd_Over_0.5'] = (1 / df['Prob_Over_0.5']).round(2)
-    df['Odd_Over_1.5'] = (1 / df['Prob_Over_1.5']).round(2)
+    Pipeline colunar: extrai arrays NumPy direto dos `results`, calcula todas as métricas
+    e odds em bloco e aloca o DataFrame final uma única vez.
+    """
+    if not raw_player_stats:
+        return pd.DataFrame()
 
-    erro_padrao = np.sqrt(df['Chutes Alvo/P'] / df['Partidas jogadas'])
-    df['IC_Inferior'] = np.nan
-    df.loc[jogos_validos, 'IC_Inferior'] = (df['Chutes Alvo/P'] - 1.96 * erro_padrao).round(2)
-    
-    df['IC_Superior'] = np.nan
-    df.loc[jogos_validos, 'IC_Superior'] = (df['Chutes Alvo/P'] + 1.96 * erro_padrao).round(2)
-
-    condicoes_alta = (jogos_validos) & (df['Chutes Alvo/P'] > 0.8) & (df['IC_Inferior'] > 0.4)
-    condicoes_media = (jogos_validos) & (df['Chutes Alvo/P'] > 0.4)
-    df['Consistência'] = np.select(
-        [condicoes_alta, condicoes_media],
-        ['Alta', 'Média'],
-        default='Baixa'
-    )
+    players = [p.get("player", {}) for p in raw_player_stats]
+    last_match = _last_match_columns([p.get("id") for p in players], last_match_shots_map,
+                                     ['total_shots', 'shots_on_target'])
 
-    df = df.sort_values(by="Chutes Alvo/P", ascending=False).reset_index(drop=True)
+    total_chutes = _column(raw_player_stats, 'totalShots')
+    chutes_alvo = _column(raw_player_stats, 'shotsOnTarget')
+    partidas = _column(raw_player_stats, 'appearances')
+    minutos = _column(raw_player_stats, 'minutesPlayed')
 
-    ordem_colunas = [
-        'Jogador', 'Chutes Alvo/P', 'Partidas jogadas', 'Min/Partida', 'Consistência', 'Chutes (Última)', 'Chutes Alvo (Última)',
-        'Odd_Over_0.5', 'Odd_Over_1.5', 'Prob_Over_0.5', 'Prob_Over_1.5', 'Eficiência %', 'Total de chutes', 'Chutes no alvo',
-        'Chutes/P', 'Min/Jogados', 'Min/Chute', 'Min/Chute Alvo', 'IC_Inferior', 'IC_Superior'
-    ]
-    
-    # <<< MUDANÇA AQUI >>>
-    # Apenas reordenamos as colunas. Não usamos mais o .fillna('-') aqui.
-    # O DataFrame agora manterá os valores NaN, que são numericamente corretos.
-    df_final = df.reindex(columns=ordem_colunas)
+    chutes_p = _ratio(total_chutes, partidas)
+    chutes_alvo_p = _ratio(chutes_alvo, partidas)
 
-    df_final = df_final.fillna(0)
+    min_jogos = 5
+    jogos_validos = partidas >= min_jogos
+    lines = [0.5, 1.5]
+    prob_over, _ = _poisson_lines(chutes_alvo_p, jogos_validos, lines)
 
-    return df_final
+    with np.errstate(divide='ignore', invalid='ignore'):
+        erro_padrao = np.sqrt(chutes_alvo_p / partidas)
+        ic_inferior = np.where(jogos_validos, np.round(chutes_alvo_p - 1.96 * erro_padrao, 2), np.nan)
+        ic_superior = np.where(jogos_validos, np.round(chutes_alvo_p + 1.96 * erro_padrao, 2), np.nan)
+
+    with np.errstate(invalid='ignore'):
+        condicoes_alta = jogos_validos & (chutes_alvo_p > 0.8) & (ic_inferior > 0.4)
+    condicoes_media = jogos_validos & (chutes_alvo_p > 0.4)
+    consistencia = np.select([condicoes_alta, condicoes_media], ['Alta', 'Média'], default='Baixa')
+
+    # Mantemos os NaN só até aqui: a tabela final usa 0 para jogadores sem amostra mínima
+    df = pd.DataFrame({
+        'Jogador': [p.get('name') for p in players],
+        'Chutes Alvo/P': chutes_alvo_p,
+        'Partidas jogadas': partidas.astype(int),
+        'Min/Partida': _ratio(minutos, partidas),
+        'Consistência': consistencia,
+        'Chutes (Última)': last_match['total_shots'].to_numpy(),
+        'Chutes Alvo (Última)': last_match['shots_on_target'].to_numpy(),
+        'Odd_Over_0.5': np.nan_to_num(_fair_odds(prob_over[:, 0]), nan=0.0, posinf=np.inf),
+        'Odd_Over_1.5': np.nan_to_num(_fair_odds(prob_over[:, 1]), nan=0.0, posinf=np.inf),
+        'Prob_Over_0.5': np.nan_to_num(prob_over[:, 0], nan=0.0),
+        'Prob_Over_1.5': np.nan_to_num(prob_over[:, 1], nan=0.0),
+        'Eficiência %': _ratio(chutes_alvo, total_chutes, scale=100, decimals=1),
+        'Total de chutes': total_chutes.astype(int),
+        'Chutes no alvo': chutes_alvo.astype(int),
+        'Chutes/P': chutes_p,
+        'Min/Jogados': minutos.astype(int),
+        'Min/Chute': _ratio(minutos, total_chutes),
+        'Min/Chute Alvo': _ratio(minutos, chutes_alvo),
+        'IC_Inferior': np.nan_to_num(ic_inferior, nan=0.0),
+        'IC_Superior': np.nan_to_num(ic_superior, nan=0.0),
+    })
+
+    return df.sort_values(by="Chutes Alvo/P", ascending=False).reset_index(drop=True)
 
 def _process_goalkeeper_stats_to_dataframe(
     raw_gk_stats: List[Dict[str, Any]],
-    last_match_saves_map: Dict[str, int] # O mapa usa NOME (str) como chave
+    last_match_saves_map: Dict[int, int] # O mapa usa o player_id como chave
 ) -> pd.DataFrame:
     """
     Processa a lista bruta de estatísticas de goleiros e a transforma em um DataFrame,
-    adicionando as defesas da última partida.
+    adicionando as defesas da última partida e as odds de Poisson de todas as linhas.
     """
     if not raw_gk_stats:
         return pd.DataFrame()
 
-    all_data = []
-    for gk_data in raw_gk_stats:
-        player_info = gk_data.get("player", {})
-        player_name = player_info.get("name")
-        
-        all_data.append({
-            'Goleiro': player_name,
-            'Partidas': gk_data.get('appearances', 0),
-            'Sem Sofrer Gol': gk_data.get('cleanSheet', 0),
-            'Defesas': gk_data.get('saves', 0),
-            'Defesas (Dentro da Área)': gk_data.get('savedShotsFromInsideTheBox', 0),
-            'Defesas (Fora da Área)': gk_data.get('savedShotsFromOutsideTheBox', 0),
-            'Defesas (Última)': last_match_saves_map.get(player_name, 0)
-        })
-    
-    df = pd.DataFrame(all_data)
-    
-    with np.errstate(divide='ignore', invalid='ignore'):
-        df['Defesas/J'] = (df['Defesas'] / df['Partidas']).round(2)
-        df['Jogos s/ Sofrer Gol (%)'] = (df['Sem Sofrer Gol'] / df['Partidas'] * 100).round(1)
-    
-    df = df.fillna(0)
+    names = [gk.get("player", {}).get("name") for gk in raw_gk_stats]
+    last_match = _last_match_columns([gk.get("player", {}).get("id") for gk in raw_gk_stats],
+                                     last_match_saves_map, ['saves'])
+    partidas = _column(raw_gk_stats, 'appearances')
+    sem_sofrer_gol = _column(raw_gk_stats, 'cleanSheet')
+    defesas = _column(raw_gk_stats, 'saves')
+    defesas_j = _ratio(defesas, partidas)
+
+    columns = {
+        'Goleiro': names,
+        'Partidas': partidas.astype(int),
+        'Sem Sofrer Gol': sem_sofrer_gol.astype(int),
+        'Defesas': defesas.astype(int),
+        'Defesas (Dentro da Área)': _column(raw_gk_stats, 'savedShotsFromInsideTheBox', dtype=int),
+        'Defesas (Fora da Área)': _column(raw_gk_stats, 'savedShotsFromOutsideTheBox', dtype=int),
+        'Defesas (Última)': last_match['saves'].to_numpy(),
+        'Defesas/J': defesas_j,
+        'Jogos s/ Sofrer Gol (%)': _ratio(sem_sofrer_gol, partidas, scale=100, decimals=1),
+    }
 
-    # <<< NOVO BLOCO DE ANÁLISE DE ODDS >>>
+    # Linhas de aposta calculadas de uma vez (Over = 1 - P(defesas <= k), Under = P(defesas <= k))
     min_jogos = 5
-    jogos_validos = df['Partidas'] >= min_jogos
-    lambda_defesas = df.loc[jogos_validos, 'Defesas/J']
-
-    # Linhas de aposta que vamos calcular (1.5, 2.5, 3.5)
-    for line in [0.5, 1.5, 2.5, 3.5, 4.5]:
-        k = int(line) # O valor para o CDF (ex: para Over 2.5, k=2)
-        
-        # Probabilidade de Over (1 - P(defesas <= k))
-        prob_over = 1 - poisson.cdf(k, lambda_defesas)
-        df[f'Prob_Over_{line}'] = np.nan
-        df.loc[jogos_validos, f'Prob_Over_{line}'] = prob_over
-
-        # Probabilidade de Under (P(defesas <= k))
-        prob_under = poisson.cdf(k, lambda_defesas)
-        df[f'Prob_Under_{line}'] = np.nan
-        df.loc[jogos_validos, f'Prob_Under_{line}'] = prob_under
-
-        # Odds Justas
-        df[f'Odd_Over_{line}'] = (1 / df[f'Prob_Over_{line}']).round(2)
-        df[f'Odd_Under_{line}'] = (1 / df[f'Prob_Under_{line}']).round(2)
-    
-    df = df.fillna(0)
+    lines = [0.5, 1.5, 2.5, 3.5, 4.5]
+    prob_over, prob_under = _poisson_lines(defesas_j, partidas >= min_jogos, lines)
+    odd_over, odd_under = _fair_odds(prob_over), _fair_odds(prob_under)
+    for i, line in enumerate(lines):
+        columns[f'Prob_Over_{line}'] = np.nan_to_num(prob_over[:, i], nan=0.0)
+        columns[f'Prob_Under_{line}'] = np.nan_to_num(prob_under[:, i], nan=0.0)
+        columns[f'Odd_Over_{line}'] = np.nan_to_num(odd_over[:, i], nan=0.0, posinf=np.inf)
+        columns[f'Odd_Under_{line}'] = np.nan_to_num(odd_under[:, i], nan=0.0, posinf=np.inf)
+
+    df = pd.DataFrame(columns)
     return df.sort_values(by="Partidas", ascending=False).reset_index(drop=True)
 
+# Métricas dos cards de resumo: (rótulo, numerador, denominador, escala, casas decimais).
+# Campos vêm de `statistics/overall` + tabela (matches, scoresFor, scoresAgainst);
+# `nonPenaltyGoals` é derivado. Denominador zero resulta em 0.
+TEAM_SUMMARY_METRICS = [
+    # (rótulo, numerador, denominador, escala, casas decimais, maior é melhor)
+    # --- Métricas Ofensivas (Pró) ---
+    ('Média Chutes/J', 'shots', 'matches', 1, 2, True),
+    ('Média Chutes Alvo/J', 'shotsOnTarget', 'matches', 1, 2, True),
+    ('Grandes Chances Criadas/J', 'bigChancesCreated', 'matches', 1, 2, True),
+    ('Média Gols Pró/J', 'scoresFor', 'matches', 1, 2, True),
+    ('Índice de Perigo (%)', 'shotsFromInsideTheBox', 'shots', 100, 1, True),
+    ('Conversão de Grandes Chances (%)', 'nonPenaltyGoals', 'bigChancesCreated', 100, 1, True),
+    # --- Métricas Defensivas (Contra) ---
+    ('Grandes Chances Cedidas/J', 'bigChancesAgainst', 'matches', 1, 2, False),
+    ('Média Chutes Alvo Cedidos/J', 'shotsOnTargetAgainst', 'matches', 1, 2, False),
+    ('Média Defesas/J', 'saves', 'matches', 1, 2, True),
+    ('Média Gols Contra/J', 'scoresAgainst', 'matches', 1, 2, False),
+    # Média de escanteios
+    ('Média Escanteios/J', 'corners', 'matches', 1, 2, True),
+    ('Média Escanteios Contra/J', 'cornersAgainst', 'matches', 1, 2, False),
+]
+TEAM_SUMMARY_LABELS = [m[0] for m in TEAM_SUMMARY_METRICS]
+TEAM_SUMMARY_HIGHER_IS_BETTER = [m[5] for m in TEAM_SUMMARY_METRICS]
+
+
+def team_summary_sources(stats: Dict[str, Any], standings_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Junta as estatísticas de temporada e a linha da tabela de um time numa única fonte."""
+    source = dict(stats or {})
+    source['nonPenaltyGoals'] = source.get('goalsScored', 0) - source.get('penaltyGoals', 0)
+    # Jogos e gols pró/contra vêm da tabela (mais confiável), como a contagem exibida
+    for key in ('matches', 'scoresFor', 'scoresAgainst'):
+        source[key] = standings_info.get(key) or 0
+    return source
+
+
+def team_summary_matrix(sources: List[Dict[str, Any]]) -> np.ndarray:
+    """Matriz densa times x métricas (ordem de TEAM_SUMMARY_METRICS), calculada em bloco."""
+    numerators = np.array([[s.get(m[1]) or 0 for m in TEAM_SUMMARY_METRICS] for s in sources], dtype=float)
+    denominators = np.array([[s.get(m[2]) or 0 for m in TEAM_SUMMARY_METRICS] for s in sources], dtype=float)
+    scales = np.array([m[3] for m in TEAM_SUMMARY_METRICS], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(denominators > 0, numerators / denominators * scales, 0.0)
+    decimals = [m[4] for m in TEAM_SUMMARY_METRICS]
+    return np.column_stack([np.round(values[:, i], d) for i, d in enumerate(decimals)]).reshape(len(sources), -1)
+
 def get_match_analysis_data(
-    event_id: int, filter_by_location: bool = False
+    event_id: int, filter_by_location: bool = False, context: Optional[MatchContext] = None
 ) -> Dict[str, Any]:
     """
     Orquestrador que busca DADOS COMPLETOS (jogadores, time e posição) para a análise.
+    Recebe opcionalmente o `MatchContext` da partida para reaproveitar o que já foi buscado.
     """
-    client = SofaScoreClient()
-    event_details = client.get_event_details(event_id)
-    if not event_details: return {}
-
-    tournament = event_details.get("tournament", {})
-    tournament_id = event_details.get("tournament", {}).get("id")
-    uniqueTournament_id = event_details.get("tournament", {}).get("uniqueTournament", {}).get("id")
-    season_id = event_details.get("season", {}).get("id")
-    home_team_id = event_details.get("homeTeam", {}).get("id")
-    away_team_id = event_details.get("awayTeam", {}).get("id")
-    if not all([tournament_id, season_id, home_team_id, away_team_id]): return {}
-
-    # <<< PASSO ADICIONAL 1: Buscar a tabela de classificação >>>
-    # <<< MUDANÇA 1: Criamos um mapa mais completo para os dados da tabela >>>
-    standings_data = client.get_league_standings(tournament_id, season_id)
-    standings_info_map = {} # De 'positions_map' para 'standings_info_map'
-    if standings_data and 'standings' in standings_data and standings_data['standings']:
-        rows = standings_data['standings'][0].get('rows', [])
-        for row in rows:
-            team_id = row.get('team', {}).get('id')
-            if team_id:
-                standings_info_map[team_id] = {
-                    "position": row.get('position'),
-                    "matches": row.get('matches'),
-                    "scoresFor": row.get('scoresFor'),
-                    "scoresAgainst": row.get('scoresAgainst')
-                }
-
-    home_last_event = client.get_team_last_event(home_team_id)
-    away_last_event = client.get_team_last_event(away_team_id)
-
-    # 2. Construir um mapa unificado de chutes da última partida (player_id -> stats)
-    last_match_shots_map = {}
-    if home_last_event_id := home_last_event.get("id"):
-        shots_data = client.get_player_stats_for_event(home_last_event_id)
-        for team_type in ['home', 'away']:
-            for player in shots_data[team_type]:
-                last_match_shots_map[player['player_id']] = player
-
-    if away_last_event_id := away_last_event.get("id"):
-        shots_data = client.get_player_stats_for_event(away_last_event_id)
-        for team_type in ['home', 'away']:
-            for player in shots_data[team_type]:
-                # Adiciona ou sobrescreve, garantindo os dados do evento mais recente de cada jogador
-                last_match_shots_map[player['player_id']] = player            
+    context = context or MatchContext(event_id)
+    event_context = context.event
+    if not event_context or not context.is_complete: return {}
+
+    home_team_id = context.team_id("home")
+    away_team_id = context.team_id("away")
+
+    standings_info_map = context.standings_info_map
+
+    # Mapa unificado de chutes da última partida (player_id -> stats)
+    last_match_shots_map = context.last_match_player_map
 
     home_match_type = "home" if filter_by_location else None
     away_match_type = "away" if filter_by_location else None
-    
-    raw_players_home = client.get_player_stats_for_team(uniqueTournament_id, season_id, home_team_id, match_type=home_match_type)
-    raw_players_away = client.get_player_stats_for_team(uniqueTournament_id, season_id, away_team_id, match_type=away_match_type)
 
-    team_stats_home = client.get_team_stats(home_team_id, uniqueTournament_id, season_id)
-    team_stats_away = client.get_team_stats(away_team_id, uniqueTournament_id, season_id)
+    raw_players_home = context.player_stats("home", match_type=home_match_type)
+    raw_players_away = context.player_stats("away", match_type=away_match_type)
+
+    team_stats_home = context.team_stats("home")
+    team_stats_away = context.team_stats("away")
     
+    _index_players(raw_players_home + raw_players_away)
+
     home_players_df = _process_player_stats_to_dataframe(raw_players_home, last_match_shots_map)
     away_players_df = _process_player_stats_to_dataframe(raw_players_away, last_match_shots_map)
 
@@ -259,67 +298,21 @@ def get_match_analysis_data(
         }
         
         # Se não houver jogos, retorna o resumo com zeros para evitar erros de divisão
-        if matches == 0:
-            default_metrics = {
-                'Média Chutes/J': 0, 'Média Chutes Alvo/J': 0,
-                'Grandes Chances Criadas/J': 0, 'Índice de Perigo (%)': 0,
-                'Conversão de Grandes Chances (%)': 0,
-                'Grandes Chances Cedidas/J': 0, 'Média Chutes Alvo Cedidos/J': 0,
-                'Média Defesas/J': 0, 'Média Gols Pró/J': 0,
-                'Média Gols Contra/J': 0,
-                'Média Escanteios/J': 0,
-                'Média Escanteios Contra/J': 0
-            }
-            summary.update(default_metrics)
+        if not matches:
+            summary.update({label: 0 for label in TEAM_SUMMARY_LABELS})
             return summary
 
-        # --- Métricas Ofensivas (Pró) ---
-        summary['Média Chutes/J'] = round(stats.get('shots', 0) / matches, 2)
-        summary['Média Chutes Alvo/J'] = round(stats.get('shotsOnTarget', 0) / matches, 2)
-        summary['Grandes Chances Criadas/J'] = round(stats.get('bigChancesCreated', 0) / matches, 2)
-        summary['Média Gols Pró/J'] = round(team_standings_info.get('scoresFor', 0) / matches, 2)
-        
-        total_shots = stats.get('shots', 0)
-        if total_shots > 0:
-            summary['Índice de Perigo (%)'] = round((stats.get('shotsFromInsideTheBox', 0) / total_shots) * 100, 1)
-        else:
-            summary['Índice de Perigo (%)'] = 0
-
-        big_chances_created = stats.get('bigChancesCreated', 0)
-        if big_chances_created > 0:
-            goals = stats.get('goalsScored', 0) - stats.get('penaltyGoals', 0)
-            summary['Conversão de Grandes Chances (%)'] = round((goals / big_chances_created) * 100, 1)
-        else:
-            summary['Conversão de Grandes Chances (%)'] = 0
-            
-        # --- Métricas Defensivas (Contra) ---
-        summary['Grandes Chances Cedidas/J'] = round(stats.get('bigChancesAgainst', 0) / matches, 2)
-        summary['Média Chutes Alvo Cedidos/J'] = round(stats.get('shotsOnTargetAgainst', 0) / matches, 2)
-        summary['Média Defesas/J'] = round(stats.get('saves', 0) / matches, 2)
-        summary['Média Gols Contra/J'] = round(team_standings_info.get('scoresAgainst', 0) / matches, 2)
-
-        # Média de escanteios >>>
-        summary['Média Escanteios/J'] = round(stats.get('corners', 0) / matches, 2)
-        summary['Média Escanteios Contra/J'] = round(stats.get('cornersAgainst', 0) / matches, 2)
-
+        values = team_summary_matrix([team_summary_sources(stats, team_standings_info)])[0]
+        summary.update(zip(TEAM_SUMMARY_LABELS, values.tolist()))
         return summary
 
-    # Constrói um mapa de defesas da última partida por nome do jogador (para reuso na aba de goleiros)
-    last_match_saves_map_by_name: Dict[str, int] = {}
-    for player_stats in last_match_shots_map.values():
-        saves_val = player_stats.get('saves', 0)
-        if saves_val and saves_val > 0:
-            player_name = player_stats.get('player_name')
-            if player_name:
-                last_match_saves_map_by_name[player_name] = saves_val
-
     analysis_data = {
-        "tournament_name": tournament.get("name", "Campeonato"),
+        "tournament_name": event_context.get("tournament_name") or "Campeonato",
         # IDs de último jogo para reuso em outras consultas (ex.: goleiros)
-        "home_last_event_id": home_last_event.get("id"),
-        "away_last_event_id": away_last_event.get("id"),
+        "home_last_event_id": context.last_event_id("home"),
+        "away_last_event_id": context.last_event_id("away"),
         # Repassa também defesas da última partida já coletadas
-        "last_match_saves_map": last_match_saves_map_by_name,
+        "last_match_saves_map": context.last_match_saves_map,
         "home": {
             "players": home_players_df,
             "summary": _create_summary(team_stats_home, home_team_id)
@@ -335,54 +328,37 @@ def get_goalkeeper_stats_for_match(
     event_id: int,
     home_last_event_id: int | None = None,
     away_last_event_id: int | None = None,
-    last_match_saves_map_prefetched: Dict[str, int] | None = None,
+    last_match_saves_map_prefetched: Dict[int, int] | None = None,
+    context: Optional[MatchContext] = None,
 ) -> Dict[str, pd.DataFrame]:
     """
     Orquestrador dedicado a buscar e processar as estatísticas de goleiros,
     incluindo dados da última partida.
     """
-    client = SofaScoreClient()
-    event_details = client.get_event_details(event_id)
-    if not event_details:
-        return {"home": pd.DataFrame(), "away": pd.DataFrame()}
-
-    uniqueTournament_id = event_details.get("tournament", {}).get("uniqueTournament", {}).get("id")
-    season_id = event_details.get("season", {}).get("id")
-    home_team_id = event_details.get("homeTeam", {}).get("id")
-    away_team_id = event_details.get("awayTeam", {}).get("id")
-
-    if not all([uniqueTournament_id, season_id, home_team_id, away_team_id]):
+    context = context or MatchContext(event_id)
+    if not context.event or not context.is_complete or not context.unique_tournament_id:
         return {"home": pd.DataFrame(), "away": pd.DataFrame()}
 
-    # --- Busca e construção do mapa de defesas da última partida ---
+    # --- Mapa de defesas da última partida ---
     if last_match_saves_map_prefetched is not None:
         last_match_saves_map = last_match_saves_map_prefetched
+    elif home_last_event_id is None and away_last_event_id is None:
+        last_match_saves_map = context.last_match_saves_map
     else:
-        # Reutiliza IDs de último jogo se fornecidos para evitar chamadas extras
-        if home_last_event_id is None:
-            home_last_event = client.get_team_last_event(home_team_id)
-            home_last_event_id = home_last_event.get("id")
-        if away_last_event_id is None:
-            away_last_event = client.get_team_last_event(away_team_id)
-            away_last_event_id = away_last_event.get("id")
-
-        last_match_saves_map: Dict[str, int] = {}
-        if home_last_event_id:
-            stats_data = client.get_player_stats_for_event(home_last_event_id)
+        # IDs de último jogo fornecidos explicitamente (evita chamadas extras)
+        last_match_saves_map: Dict[int, int] = {}
+        for last_event_id in (home_last_event_id, away_last_event_id):
+            if not last_event_id:
+                continue
+            stats_data = context.lineup_stats(last_event_id)
             for team_type in ['home', 'away']:
                 for player in stats_data[team_type]:
                     if player.get('saves', 0) > 0:
-                        last_match_saves_map[player['player_name']] = player['saves']
+                        last_match_saves_map[player['player_id']] = player['saves']
 
-        if away_last_event_id:
-            stats_data = client.get_player_stats_for_event(away_last_event_id)
-            for team_type in ['home', 'away']:
-                for player in stats_data[team_type]:
-                    if player.get('saves', 0) > 0:
-                        last_match_saves_map[player['player_name']] = player['saves']
-        
-    raw_gk_home = client.get_goalkeeper_stats_for_team(uniqueTournament_id, season_id, home_team_id)
-    raw_gk_away = client.get_goalkeeper_stats_for_team(uniqueTournament_id, season_id, away_team_id)
+    raw_gk_home = context.goalkeeper_stats("home")
+    raw_gk_away = context.goalkeeper_stats("away")
+    _index_players(raw_gk_home + raw_gk_away, position='G')
     home_gk_df = _process_goalkeeper_stats_to_dataframe(raw_gk_home, last_match_saves_map)
     away_gk_df = _process_goalkeeper_stats_to_dataframe(raw_gk_away, last_match_saves_map)
 
@@ -441,22 +417,128 @@ def _process_h2h_events_to_dataframe(
     return df.sort_values(by="Data", ascending=False).reset_index(drop=True)
 
 
-def get_h2h_data(custom_id: str, home_team_name: str, away_team_name: str) -> pd.DataFrame:
+# Estatísticas por evento exibidas no H2H: chave do resumo -> rótulo das colunas
+H2H_STAT_LABELS = {
+    'total_shots': 'Chutes Totais',
+    'shots_on_target': 'Chutes no Alvo',
+    'saves': 'Defesas',
+    'corner_kicks': 'Escanteios',
+    'offsides': 'Impedimentos',
+}
+# Sufixos das colunas orientadas pelos times da partida analisada (não são exibidas na tabela)
+H2H_ORIENTED_SUFFIXES = (' - Mandante', ' - Visitante')
+
+
+def _h2h_stats_to_frame(detailed_stats_cache: Dict[int, Dict[str, Any]]) -> pd.DataFrame:
+    """Converte o cache {event_id: resumo} em um DataFrame colunar indexado por event_id."""
+    event_ids = list(detailed_stats_cache.keys())
+    columns = {}
+    for side, side_label in (('home', 'Casa'), ('away', 'Visitante')):
+        side_stats = [detailed_stats_cache[e].get(side, {}) for e in event_ids]
+        for key, label in H2H_STAT_LABELS.items():
+            columns[f'{label} ({side_label})'] = np.fromiter(
+                (stats.get(key, 0) for stats in side_stats), dtype=float, count=len(event_ids)
+            )
+    return pd.DataFrame(columns, index=pd.Index(event_ids, name='event_id'))
+
+
+def enrich_h2h_dataframe(
+    h2h_df: pd.DataFrame,
+    detailed_stats_cache: Dict[int, Dict[str, Any]],
+    home_team_name: str,
+    away_team_name: str,
+) -> pd.DataFrame:
+    """
+    Junta as estatísticas detalhadas dos eventos ao H2H e calcula, de forma vetorizada,
+    os totais por partida (Partida, Casa, Visitante) e as colunas orientadas para os
+    times da partida analisada ('<métrica> - Mandante' / '<métrica> - Visitante').
+    Jogos sem estatísticas recebem zero.
+    """
+    if h2h_df is None or h2h_df.empty:
+        return pd.DataFrame()
+
+    stats_df = _h2h_stats_to_frame(detailed_stats_cache or {})
+    df = h2h_df.join(stats_df, on='event_id')
+    df[stats_df.columns] = df[stats_df.columns].fillna(0)
+
+    df['Gols Totais'] = df['Gols Casa'] + df['Gols Visitante']
+    for label in H2H_STAT_LABELS.values():
+        df[f'{label} (Partida)'] = df[f'{label} (Casa)'] + df[f'{label} (Visitante)']
+
+    df['Com Estatísticas'] = (
+        (df['Chutes Totais (Casa)'] > 0) | (df['Defesas (Casa)'] > 0) |
+        (df['Chutes Totais (Visitante)'] > 0) | (df['Defesas (Visitante)'] > 0)
+    )
+
+    # Mandante da partida analisada jogando em casa no confronto -> colunas "Casa" são dele
+    mandante_em_casa = (df['Time da Casa'] == home_team_name).to_numpy()
+    mandante_suffix, visitante_suffix = H2H_ORIENTED_SUFFIXES
+    oriented = {'Gols': ('Gols Casa', 'Gols Visitante')}
+    oriented.update({label: (f'{label} (Casa)', f'{label} (Visitante)') for label in H2H_STAT_LABELS.values()})
+    for label, (home_col, away_col) in oriented.items():
+        home_values = df[home_col].to_numpy()
+        away_values = df[away_col].to_numpy()
+        df[f'{label}{mandante_suffix}'] = np.where(mandante_em_casa, home_values, away_values)
+        df[f'{label}{visitante_suffix}'] = np.where(mandante_em_casa, away_values, home_values)
+
+    return df
+
+
+def summarize_h2h_stats(enriched_h2h_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Médias do H2H já enriquecido: por partida e por time (Mandante/Visitante da análise).
+    Chutes, defesas, escanteios e impedimentos usam só jogos com estatísticas; gols usam todos.
+    """
+    labels = list(H2H_STAT_LABELS.values())
+    empty = {
+        'jogos_analisados': 0,
+        'partida': {label: 0 for label in labels},
+        'mandante': {label: 0 for label in labels + ['Gols']},
+        'visitante': {label: 0 for label in labels + ['Gols']},
+    }
+    if enriched_h2h_df is None or enriched_h2h_df.empty:
+        return empty
+
+    with_stats = enriched_h2h_df[enriched_h2h_df['Com Estatísticas']]
+    summary = {'jogos_analisados': len(with_stats)}
+    mandante_suffix, visitante_suffix = H2H_ORIENTED_SUFFIXES
+    if with_stats.empty:
+        summary.update({key: dict(values) for key, values in empty.items() if key != 'jogos_analisados'})
+    else:
+        means = with_stats[
+            [f'{label}{suffix}' for label in labels for suffix in (' (Partida)', mandante_suffix, visitante_suffix)]
+        ].mean()
+        summary['partida'] = {label: means[f'{label} (Partida)'] for label in labels}
+        summary['mandante'] = {label: means[f'{label}{mandante_suffix}'] for label in labels}
+        summary['visitante'] = {label: means[f'{label}{visitante_suffix}'] for label in labels}
+
+    summary['mandante']['Gols'] = enriched_h2h_df[f'Gols{mandante_suffix}'].mean()
+    summary['visitante']['Gols'] = enriched_h2h_df[f'Gols{visitante_suffix}'].mean()
+    return summary
+
+
+def get_h2h_data(
+    custom_id: str, home_team_name: str, away_team_name: str, context: Optional[MatchContext] = None
+) -> pd.DataFrame:
     """
     Orquestrador dedicado a buscar e processar os dados de confronto direto (H2H).
     """
-    client = SofaScoreClient()
-    raw_h2h_events = client.get_h2h_events(custom_id)
+    if context is not None:
+        raw_h2h_events = context.h2h_events
+    else:
+        raw_h2h_events = SofaScoreClient().get_h2h_events(custom_id)
     h2h_df = _process_h2h_events_to_dataframe(raw_h2h_events, home_team_name, away_team_name)
     return h2h_df
 
-def get_summary_stats_for_event(event_id: int) -> Dict[str, Dict[str, int]]:
+def get_summary_stats_for_event(event_id: int, context: Optional[MatchContext] = None) -> Dict[str, Dict[str, int]]:
     """
     Busca os dados de um evento usando o endpoint de estatísticas agregadas.
+    Com um `MatchContext`, reaproveita as estatísticas já carregadas daquele evento.
     """
-    client = SofaScoreClient()
-    # Chama a sua nova e poderosa função!
-    stats = client.get_team_stats_for_event(event_id) 
+    if context is not None:
+        stats = context.event_stats(event_id)
+    else:
+        stats = get_team_event_stats(event_id) or SofaScoreClient().get_team_stats_for_event(event_id)
 
     # Como a nova função já retorna os dados agregados, só precisamos garantir o formato.
     summary = {
@@ -508,7 +590,7 @@ def get_summary_stats_for_event(event_id: int) -> Dict[str, Dict[str, int]]:
 
     return summary
 
-def get_h2h_goalkeeper_analysis(custom_id: str, home_team_name: str, away_team_name: str, h2h_events: List[Dict[str, Any]] = None, detailed_stats_cache: Dict[int, Dict[str, Any]] = None) -> Dict[str, Any]:
+def get_h2h_goalkeeper_analysis(custom_id: str, home_team_name: str, away_team_name: str, h2h_events: List[Dict[str, Any]] = None, detailed_stats_cache: Dict[int, Dict[str, Any]] = None, context: Optional[MatchContext] = None) -> Dict[str, Any]:
     """
     Analisa o histórico de confrontos para calcular a média de defesas da POSIÇÃO de goleiro,
     usando apenas os jogos que contêm estatísticas válidas.
@@ -519,11 +601,11 @@ def get_h2h_goalkeeper_analysis(custom_id: str, home_team_name: str, away_team_n
         away_team_name: Nome do time visitante
         h2h_events: Lista opcional de eventos H2H já carregados para evitar requisições duplicadas
         detailed_stats_cache: Cache opcional de estatísticas já carregadas para evitar requisições duplicadas
+        context: `MatchContext` opcional da partida; fornece os eventos H2H e as estatísticas de cada um
     """
     # <<< OTIMIZAÇÃO: Reutiliza eventos H2H se fornecidos >>>
     if h2h_events is None:
-        client = SofaScoreClient()
-        h2h_events = client.get_h2h_events(custom_id)
+        h2h_events = context.h2h_events if context is not None else SofaScoreClient().get_h2h_events(custom_id)
     
     if not h2h_events or len(h2h_events) <= 1:
         return {}
@@ -543,7 +625,7 @@ def get_h2h_goalkeeper_analysis(custom_id: str, home_team_name: str, away_team_n
         if detailed_stats_cache and event_id in detailed_stats_cache:
             stats = detailed_stats_cache[event_id]
         else:
-            stats = get_summary_stats_for_event(event_id)
+            stats = get_summary_stats_for_event(event_id, context=context)
         
         # Verificamos se há dados de defesas válidos ANTES de adicioná-los à lista.
         # Isso garante que não estamos adicionando '0' de jogos sem estatísticas.
@@ -568,18 +650,15 @@ def get_h2h_goalkeeper_analysis(custom_id: str, home_team_name: str, away_team_n
         avg_saves = np.mean(saves_list)
         results = {"avg_saves": round(avg_saves, 2), "samples": saves_list}
         
-        # Linhas de aposta comuns para defesas de goleiro
-        for line in [0.5, 1.5, 2.5, 3.5, 4.5]:
-            k = int(line)
-            
-            # Usamos o modelo de Poisson com a média de defesas do H2H como nosso lambda
-            prob_under = poisson.cdf(k, avg_saves)
-            prob_over = 1 - prob_under
-            
-            # Converte probabilidades em Odds Justas
-            results[f'Odd_Over_{line}'] = round(1 / prob_over, 2) if prob_over > 0 else "∞"
-            results[f'Odd_Under_{line}'] = round(1 / prob_under, 2) if prob_under > 0 else "∞"
-            
+        # Mercados de defesas pelo motor de odds: Poisson com a média de defesas do H2H como lambda
+        odds = market_view(
+            compute_markets(poisson_pmf([avg_saves]), over_under_lines=GOALKEEPER_LINES, asian_lines=[]),
+            'over_under',
+        )
+        for line in GOALKEEPER_LINES:
+            results[f'Odd_Over_{line}'] = float(odds.loc[line, 'over'])
+            results[f'Odd_Under_{line}'] = float(odds.loc[line, 'under'])
+
         return results
 
     # Retorna um dicionário com os resultados para cada time
@@ -0,0 +1,495 @@
+# samsbet/services/view_model_service.py
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from samsbet.core.disk_cache import (
+    get_disk_cache_mtime,
+    get_from_disk_cache,
+    set_to_disk_cache,
+)
+from samsbet.services.league_service import get_team_league_context
+from samsbet.services.match_context import MatchContext, bump_match_cache_version, match_cache_version
+from samsbet.services.odds_service import (
+    compute_markets,
+    dynamic_lines,
+    empirical_btts,
+    empirical_pmf,
+    market_view,
+    poisson_over_under,
+    poisson_pmf,
+    ASIAN_LINES,
+    GOALKEEPER_LINES,
+    OVER_UNDER_LINES,
+)
+from samsbet.services.stats_service import (
+    get_match_analysis_data,
+    get_goalkeeper_stats_for_match,
+    get_h2h_data,
+    get_summary_stats_for_event,
+    get_h2h_goalkeeper_analysis,
+    get_variation_level,
+    enrich_h2h_dataframe,
+    summarize_h2h_stats,
+    H2H_ORIENTED_SUFFIXES,
+)
+
+# View model da página de análise: todos os números derivados que a página exibe (médias,
+# percentuais, odds justas, linhas dinâmicas e níveis de variação), calculados de uma vez
+# a partir do MatchContext e guardados como uma estrutura JSON (dicts, listas e números).
+# Tabelas vão no formato {"columns": [...], "data": [[...], ...]} -> pd.DataFrame(**tabela).
+# A página só renderiza; o warmer pré-calcula as variantes de cada partida do dia.
+# O view model é compartilhado entre leitores (memória do processo): trate-o como somente leitura.
+VIEW_MODEL_VERSION = 3
+VIEW_MODEL_TTL_SECONDS = 86400
+DEFAULT_VIEW_OPTIONS: Dict[str, Any] = {"filter_by_location": False}
+# Variantes pré-calculadas pelo warmer (os snapshots de casa/fora já estão no cache)
+WARM_VIEW_OPTIONS = ({"filter_by_location": False}, {"filter_by_location": True})
+
+CORNER_LINES = [4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5, 11.5, 12.5, 13.5, 14.5]
+# Odds de chutes por time (linhas em torno da média) e da partida (expectativa total)
+TEAM_SHOT_MARKETS = (
+    ("Chutes Totais", "Média Chutes/J", "Chutes Totais"),
+    ("Chutes ao Alvo", "Média Chutes Alvo/J", "Chutes no Alvo"),
+)
+TEAM_SHOT_LINES = 3
+MATCH_SHOT_LINES = 2
+H2H_HIDDEN_COLUMNS = ['Gols Casa', 'Gols Visitante', 'Gols Totais', 'event_id', 'hasEventPlayerStatistics', 'Com Estatísticas']
+
+# Cópia em memória do que está em disco: chave -> (expira em, mtime do arquivo, view model).
+# Só vale enquanto o arquivo não mudou (outro processo pode ter regravado ou apagado
+# a partida); LRU limitado a MEMORY_VIEW_MODELS entradas.
+MEMORY_VIEW_MODELS = 128
+_memory_view_models: "OrderedDict[str, Tuple[float, Optional[float], Dict[str, Any]]]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _options(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {**DEFAULT_VIEW_OPTIONS, **(options or {})}
+
+
+def _event_prefix(event_id: int) -> str:
+    return f"v{VIEW_MODEL_VERSION}:match_view_model:{event_id}:"
+
+
+def _view_model_key(event_id: int, options: Dict[str, Any]) -> str:
+    """
+    Chave da variante: inclui a versão da partida (`match_cache_version`), então avançá-la
+    descarta de uma vez todas as variantes, quaisquer que sejam as opções.
+    """
+    flags = ",".join(f"{name}={int(bool(options[name]))}" for name in sorted(options))
+    return f"{_event_prefix(event_id)}{match_cache_version(event_id)}:{flags}"
+
+
+# --- Conversão para JSON ---
+
+def _scalar(value: Any) -> Any:
+    """Valor de célula em tipo nativo (NaN e ∞ são mantidos; o JSON do cache os aceita)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.date().isoformat()
+    if value is pd.NaT:
+        return None
+    return value
+
+
+def _table(df: Optional[pd.DataFrame]) -> Dict[str, List]:
+    if df is None or df.empty:
+        return {"columns": [], "data": []}
+    return {
+        "columns": [str(c) for c in df.columns],
+        "data": [[_scalar(v) for v in row] for row in df.itertuples(index=False, name=None)],
+    }
+
+
+def _plain(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: _scalar(value) for key, value in values.items()}
+
+
+def _over_under(mu: float, num_lines: int) -> List[Dict[str, float]]:
+    """Odds Over/Under de Poisson nas linhas dinâmicas em torno da média."""
+    if not mu or mu <= 0:
+        return []
+    odds = poisson_over_under(mu, dynamic_lines(mu, num_lines=num_lines))
+    return [{"linha": float(line), "over": float(row['over']), "under": float(row['under'])}
+            for line, row in odds.iterrows()]
+
+
+def _market_lines(view: pd.DataFrame, sides: Tuple[str, ...] = ('over', 'under')) -> List[Dict[str, float]]:
+    if view.empty:
+        return []
+    return [{"linha": float(line), **{side: float(row[side]) for side in sides}} for line, row in view.iterrows()]
+
+
+# --- Seções ---
+
+def _team_shots(side: str, summary: Dict[str, Any], enriched_h2h_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Odds de chutes de um time: temporada e H2H (coluna orientada para o lado da partida)."""
+    team_suffix = H2H_ORIENTED_SUFFIXES[0] if side == 'home' else H2H_ORIENTED_SUFFIXES[1]
+    markets = []
+    for title, season_key, h2h_label in TEAM_SHOT_MARKETS:
+        avg_season = summary.get(season_key, 0) or 0
+        h2h = None
+        if not enriched_h2h_df.empty:
+            h2h_with_stats_df = enriched_h2h_df[enriched_h2h_df[f'{h2h_label} (Partida)'] > 0]
+            values = h2h_with_stats_df[f'{h2h_label}{team_suffix}'].tolist()
+            avg_h2h = float(np.mean(values)) if values else 0.0
+            h2h = {
+                "jogos": len(values),
+                "media": avg_h2h,
+                "odds": _over_under(avg_h2h, TEAM_SHOT_LINES),
+                "variacao": get_variation_level(values),
+            }
+        markets.append({
+            "titulo": title,
+            "temporada": {
+                "jogos": summary.get('Total de Jogos', 0),
+                "media": avg_season,
+                "odds": _over_under(avg_season, TEAM_SHOT_LINES),
+            },
+            "h2h": h2h,
+        })
+    return markets
+
+
+def _match_shots(home_summary: Dict[str, Any], away_summary: Dict[str, Any], enriched_h2h_df: pd.DataFrame) -> Dict[str, Any]:
+    """Expectativa total de chutes da partida (soma das médias dos times e média do H2H)."""
+    exp_shots_season = home_summary.get('Média Chutes/J', 0) + away_summary.get('Média Chutes/J', 0)
+    exp_sot_season = home_summary.get('Média Chutes Alvo/J', 0) + away_summary.get('Média Chutes Alvo/J', 0)
+    shots = {
+        "temporada": {
+            "chutes": exp_shots_season,
+            "chutes_alvo": exp_sot_season,
+            "odds_chutes": _over_under(exp_shots_season, MATCH_SHOT_LINES),
+            "odds_chutes_alvo": _over_under(exp_sot_season, MATCH_SHOT_LINES),
+        },
+        "h2h": None,
+    }
+    if enriched_h2h_df.empty:
+        return shots
+    h2h_with_stats_df = enriched_h2h_df[enriched_h2h_df['Chutes Totais (Partida)'] > 0]
+    if h2h_with_stats_df.empty:
+        shots["h2h"] = {"jogos": 0}
+        return shots
+    serie_totais = h2h_with_stats_df['Chutes Totais (Partida)'].tolist()
+    serie_alvo = h2h_with_stats_df['Chutes no Alvo (Partida)'].tolist()
+    exp_shots_h2h = float(np.mean(serie_totais))
+    exp_sot_h2h = float(np.mean(serie_alvo))
+    shots["h2h"] = {
+        "jogos": len(h2h_with_stats_df),
+        "chutes": exp_shots_h2h,
+        "chutes_alvo": exp_sot_h2h,
+        "odds_chutes": _over_under(exp_shots_h2h, MATCH_SHOT_LINES),
+        "odds_chutes_alvo": _over_under(exp_sot_h2h, MATCH_SHOT_LINES),
+        "variacao_chutes": get_variation_level(serie_totais),
+        "variacao_chutes_alvo": get_variation_level(serie_alvo),
+    }
+    return shots
+
+
+def _h2h_metrics(h2h_df: pd.DataFrame, enriched_h2h_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Médias de apostas do H2H exibido (None quando não sobra nenhum jogo)."""
+    if enriched_h2h_df.empty:
+        return None
+    summary = summarize_h2h_stats(enriched_h2h_df)
+    return {
+        "jogos_analisados": summary['jogos_analisados'],
+        # Média de gols da partida considera TODOS os jogos (com e sem stats)
+        "media_gols_partida": float(h2h_df['Gols Totais'].mean()),
+        "partida": _plain(summary['partida']),
+        "mandante": _plain(summary['mandante']),
+        "visitante": _plain(summary['visitante']),
+    }
+
+
+def _h2h_record(h2h_df: pd.DataFrame, home_team: str, away_team: str) -> Dict[str, Any]:
+    """Vitórias, derrotas e médias de gols de cada time no confronto direto."""
+    total_jogos = len(h2h_df)
+    home_is_home = h2h_df['Time da Casa'] == home_team
+    home_is_away = h2h_df['Time Visitante'] == home_team
+    away_is_home = h2h_df['Time da Casa'] == away_team
+    away_is_away = h2h_df['Time Visitante'] == away_team
+    home_won = h2h_df['Vencedor'] == home_team
+    away_won = h2h_df['Vencedor'] == away_team
+
+    gols_pro_home = h2h_df.loc[home_is_home, 'Gols Casa'].sum() + h2h_df.loc[home_is_away, 'Gols Visitante'].sum()
+    gols_pro_away = h2h_df.loc[away_is_home, 'Gols Casa'].sum() + h2h_df.loc[away_is_away, 'Gols Visitante'].sum()
+    return {
+        "partidas": total_jogos,
+        "empates": int(total_jogos - home_won.sum() - away_won.sum()),
+        "media_gols_total": float(h2h_df['Gols Totais'].mean()),
+        "home": {
+            "vitorias": int(home_won.sum()),
+            "vitorias_casa": int((home_is_home & home_won).sum()),
+            "vitorias_fora": int((home_is_away & home_won).sum()),
+            "derrotas_casa": int((home_is_home & away_won).sum()),
+            "derrotas_fora": int((home_is_away & away_won).sum()),
+            "media_gols": float(gols_pro_home / total_jogos),
+        },
+        "away": {
+            "vitorias": int(away_won.sum()),
+            "vitorias_casa": int((away_is_home & away_won).sum()),
+            "vitorias_fora": int((away_is_away & away_won).sum()),
+            "derrotas_casa": int((away_is_home & home_won).sum()),
+            "derrotas_fora": int((away_is_away & home_won).sum()),
+            "media_gols": float(gols_pro_away / total_jogos),
+        },
+    }
+
+
+def _h2h_section(h2h_df: pd.DataFrame, enriched_h2h_df: pd.DataFrame, home_team: str, away_team: str) -> Optional[Dict[str, Any]]:
+    if h2h_df.empty:
+        return None
+    hidden = [c for c in H2H_HIDDEN_COLUMNS if c in enriched_h2h_df.columns]
+    hidden += [c for c in enriched_h2h_df.columns if c.endswith(H2H_ORIENTED_SUFFIXES)]
+    has_stats = (enriched_h2h_df['hasEventPlayerStatistics'] == True).to_numpy()
+    with_stats_df = enriched_h2h_df[has_stats]
+    return {
+        # Tabela de todos os jogos; `com_estatisticas` marca as linhas mantidas pelo filtro da página
+        "tabela": _table(enriched_h2h_df.drop(columns=hidden)),
+        "com_estatisticas": has_stats.tolist(),
+        # Métricas de apostas sobre todos os jogos e só sobre os jogos com estatísticas
+        "metricas": {
+            "todos": _h2h_metrics(h2h_df, enriched_h2h_df),
+            "com_estatisticas": _h2h_metrics(h2h_df, with_stats_df),
+        },
+        "resumo": _h2h_record(h2h_df, home_team, away_team),
+    }
+
+
+def _goals_section(h2h_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Tendências e odds de gols do H2H, de uma única passada do motor de odds."""
+    if h2h_df.empty:
+        return None
+    goals_markets = compute_markets(
+        empirical_pmf(h2h_df['Gols Totais'].tolist()),
+        over_under_lines=OVER_UNDER_LINES,
+        asian_lines=ASIAN_LINES,
+        exact_totals=[0],
+        p_btts=empirical_btts(h2h_df['Gols Casa'], h2h_df['Gols Visitante']),
+    )
+    over_under_probs = market_view(goals_markets, 'over_under', value='prob')
+    btts_probs = market_view(goals_markets, 'ambas', value='prob').iloc[0]
+    btts_odds = market_view(goals_markets, 'ambas').iloc[0]
+    zero_gols_pct = market_view(goals_markets, 'total_exato', value='prob').iloc[0]['exato'] * 100
+    tendencias = [("Partida Sem Gols", zero_gols_pct)] \
+        + [(f"Mais de {line} Gols", over_under_probs.loc[line, 'over'] * 100) for line in OVER_UNDER_LINES] \
+        + [("Ambas Marcam", btts_probs['sim'] * 100), ("Ambas Não Marcam", btts_probs['nao'] * 100)]
+    return {
+        "tendencias": [{"rotulo": label, "pct": float(value)} for label, value in tendencias],
+        "over_under": _market_lines(market_view(goals_markets, 'over_under')),
+        "ambas": {"sim": float(btts_odds['sim']), "nao": float(btts_odds['nao'])},
+        "asiatico": _market_lines(market_view(goals_markets, 'asiatico')),
+    }
+
+
+def _corners_section(home_summary: Dict[str, Any], away_summary: Dict[str, Any],
+                     h2h_summary: Dict[str, Any], enriched_h2h_df: pd.DataFrame) -> Dict[str, Any]:
+    teams = {
+        side: {
+            "pro": summary.get('Média Escanteios/J', 0),
+            "contra": summary.get('Média Escanteios Contra/J', 0),
+            "total": summary.get('Média Escanteios/J', 0) + summary.get('Média Escanteios Contra/J', 0),
+        }
+        for side, summary in (('home', home_summary), ('away', away_summary))
+    }
+    jogos_analisados = h2h_summary['jogos_analisados']
+    lambda_season = home_summary.get('Média Escanteios/J', 0) + away_summary.get('Média Escanteios/J', 0)
+    lambda_h2h = float(h2h_summary['partida']['Escanteios']) if jogos_analisados > 0 else 0.0
+    # Temporada (partida 0) e H2H (partida 1) avaliados juntos pelo motor de odds
+    corner_markets = compute_markets(
+        poisson_pmf([lambda_season, lambda_h2h]),
+        over_under_lines=CORNER_LINES,
+        asian_lines=[],
+    )
+    h2h = None
+    if jogos_analisados > 0:
+        df_com_stats = enriched_h2h_df[enriched_h2h_df['Com Estatísticas']]
+        h2h = {
+            "media": lambda_h2h,
+            "odds": _market_lines(market_view(corner_markets, 'over_under', partida=1)),
+            "variacao": get_variation_level(df_com_stats['Escanteios (Partida)'].dropna().tolist()),
+        }
+    return {
+        "times": teams,
+        "temporada": {"media": lambda_season, "odds": _market_lines(market_view(corner_markets, 'over_under', partida=0))},
+        "h2h": h2h,
+    }
+
+
+def _h2h_goalkeepers(h2h_data: Dict[str, Any]) -> Dict[str, Any]:
+    if not h2h_data or h2h_data.get('avg_saves') is None:
+        return {"media": None, "odds": [], "variacao": None}
+    samples = [_scalar(s) for s in h2h_data.get('samples', []) or []]
+    return {
+        "media": _scalar(h2h_data['avg_saves']),
+        "odds": [
+            {"linha": line, "over": h2h_data[f"Odd_Over_{line}"], "under": h2h_data[f"Odd_Under_{line}"]}
+            for line in GOALKEEPER_LINES
+        ],
+        "variacao": get_variation_level(samples) if samples else None,
+    }
+
+
+# --- Montagem e cache ---
+
+def build_match_view_model(
+    event_id: int,
+    home_team: str,
+    away_team: str,
+    custom_id: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    context: Optional[MatchContext] = None,
+) -> Dict[str, Any]:
+    """
+    Calcula o view model completo da página de análise (sem renderizar nem gravar cache).
+    Dict vazio se a análise da partida não pôde ser carregada.
+    """
+    options = _options(options)
+    context = context or MatchContext(event_id, custom_id=custom_id)
+    analysis_data = get_match_analysis_data(event_id, filter_by_location=options["filter_by_location"], context=context)
+    if not analysis_data:
+        return {}
+
+    h2h_df = pd.DataFrame()
+    enriched_h2h_df = pd.DataFrame()
+    detailed_stats_cache: Dict[int, Dict[str, Any]] = {}
+    if custom_id:
+        h2h_df = get_h2h_data(custom_id, home_team, away_team, context=context)
+        if not h2h_df.empty:
+            # Evita chamadas quando o H2H indica ausência OU não fornece a flag
+            for h2h_event_id in h2h_df.loc[h2h_df['hasEventPlayerStatistics'] == True, 'event_id'].unique():
+                detailed_stats_cache[h2h_event_id] = get_summary_stats_for_event(h2h_event_id, context=context)
+            enriched_h2h_df = enrich_h2h_dataframe(h2h_df, detailed_stats_cache, home_team, away_team)
+            h2h_df = h2h_df.assign(**{'Gols Totais': h2h_df['Gols Casa'] + h2h_df['Gols Visitante']})
+    # Médias de chutes/escanteios/defesas usam só jogos com estatísticas
+    h2h_summary = summarize_h2h_stats(enriched_h2h_df)
+
+    home_summary = analysis_data['home']['summary']
+    away_summary = analysis_data['away']['summary']
+    gk_stats = get_goalkeeper_stats_for_match(event_id, context=context)
+    h2h_gk_data = get_h2h_goalkeeper_analysis(
+        custom_id, home_team, away_team, detailed_stats_cache=detailed_stats_cache, context=context
+    ) if custom_id else {}
+
+    teams = {}
+    for side, summary in (('home', home_summary), ('away', away_summary)):
+        league_df = pd.DataFrame()
+        if context.unique_tournament_id and context.season_id:
+            league_df = get_team_league_context(context.unique_tournament_id, context.season_id, context.team_id(side))
+        teams[side] = {
+            "nome": home_team if side == 'home' else away_team,
+            "resumo": _plain(summary),
+            "contexto_liga": _table(league_df),
+            "chutes": _team_shots(side, summary, enriched_h2h_df),
+            "jogadores": _table(analysis_data[side]['players'].drop(columns=['Time'], errors='ignore')),
+        }
+
+    return {
+        "version": VIEW_MODEL_VERSION,
+        "created_at": time.time(),
+        "event_id": event_id,
+        "custom_id": custom_id,
+        "options": options,
+        "tournament_name": analysis_data.get('tournament_name', ''),
+        "teams": teams,
+        "chutes_partida": _match_shots(home_summary, away_summary, enriched_h2h_df),
+        "h2h": _h2h_section(h2h_df, enriched_h2h_df, home_team, away_team),
+        "gols": _goals_section(h2h_df),
+        "escanteios": _corners_section(home_summary, away_summary, h2h_summary, enriched_h2h_df),
+        "goleiros": {
+            side: {
+                "media_defesas_time": (home_summary if side == 'home' else away_summary).get('Média Defesas/J', 0),
+                "tabela": _table(gk_stats.get(side)),
+                "h2h": _h2h_goalkeepers(h2h_gk_data.get(side, {})),
+            }
+            for side in ('home', 'away')
+        },
+    }
+
+
+def _remember(key: str, expires_at: float, view_model: Dict[str, Any]) -> None:
+    now = time.time()
+    with _memory_lock:
+        _memory_view_models.pop(key, None)
+        _memory_view_models[key] = (expires_at, get_disk_cache_mtime(key), view_model)
+        for expired in [k for k, entry in _memory_view_models.items() if entry[0] <= now]:
+            del _memory_view_models[expired]
+        while len(_memory_view_models) > MEMORY_VIEW_MODELS:
+            _memory_view_models.popitem(last=False)
+
+
+def _store(key: str, view_model: Dict[str, Any]) -> None:
+    set_to_disk_cache(key, view_model, VIEW_MODEL_TTL_SECONDS)
+    _remember(key, time.time() + VIEW_MODEL_TTL_SECONDS, view_model)
+
+
+def store_match_view_model(event_id: int, options: Optional[Dict[str, Any]], view_model: Dict[str, Any]) -> None:
+    _store(_view_model_key(event_id, _options(options)), view_model)
+
+
+def load_match_view_model(event_id: int, options: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    View model já calculado (memória do processo, depois disco); None se não existe ou
+    expirou. A cópia em memória só é usada se o arquivo em disco é o mesmo de quando ela
+    foi lida (um `stat`, sem reler o JSON).
+    """
+    key = _view_model_key(event_id, _options(options))
+    with _memory_lock:
+        cached = _memory_view_models.get(key)
+        if cached:
+            _memory_view_models.move_to_end(key)
+    if cached and time.time() < cached[0] and cached[1] is not None and get_disk_cache_mtime(key) == cached[1]:
+        return cached[2]
+    stored = get_from_disk_cache(key)
+    if not isinstance(stored, dict) or stored.get("version") != VIEW_MODEL_VERSION:
+        with _memory_lock:
+            _memory_view_models.pop(key, None)
+        return None
+    _remember(key, stored.get("created_at", time.time()) + VIEW_MODEL_TTL_SECONDS, stored)
+    return stored
+
+
+def invalidate_match_view_models(event_ids: Iterable[int]) -> None:
+    """
+    Descarta os view models das partidas, em todas as variantes: avança a versão de cada
+    partida (as chaves antigas deixam de ser lidas e expiram no disco pelo TTL) e tira da
+    memória as entradas dela.
+    """
+    event_ids = list(event_ids)
+    bump_match_cache_version(event_ids)
+    prefixes = tuple(_event_prefix(event_id) for event_id in event_ids)
+    if not prefixes:
+        return
+    with _memory_lock:
+        for key in [k for k in _memory_view_models if k.startswith(prefixes)]:
+            del _memory_view_models[key]
+
+
+def get_match_view_model(
+    event_id: int,
+    home_team: str,
+    away_team: str,
+    custom_id: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    context: Optional[MatchContext] = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """View model da partida: do cache quando existe, senão calculado agora e guardado."""
+    if not refresh:
+        cached = load_match_view_model(event_id, options)
+        if cached is not None:
+            return cached
+    # Chave lida antes do cálculo: uma invalidação durante ele não rotula dados antigos como novos
+    key = _view_model_key(event_id, _options(options))
+    view_model = build_match_view_model(event_id, home_team, away_team, custom_id, options=options, context=context)
+    if view_model:
+        _store(key, view_model)
+    return view_model
@@ -0,0 +1,421 @@
+# samsbet/services/warm_scheduler.py
+
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from samsbet.core.leader_lock import LeaderLock
+from samsbet.services.match_service import (
+    _user_timezone,
+    get_daily_matches_dataframe,
+    invalidate_match_caches,
+    refresh_matches_dataframe,
+)
+from samsbet.services.warm_service import (
+    DEFAULT_LEAGUE_TIERS,
+    LOOKAHEAD_DAYS,
+    WARM_WORKERS,
+    LeagueTiers,
+    WarmCheckpoint,
+    day_checkpoint,
+    filter_by_tiers,
+    league_tier,
+    refresh_match_before_kickoff,
+    warm_depth,
+    warm_matches,
+)
+
+# Aquecimento guiado pelo horário dos jogos, em vez de tudo de uma vez à 01:00:
+# - "warm": aquecimento completo da partida, WARM_LEAD_SECONDS antes do início (jogos
+#   da manhã já na primeira rodada). Os horários caem em janelas de WARM_SLOT_SECONDS,
+#   então as partidas de uma mesma janela são aquecidas juntas (plano deduplicado) e a
+#   carga se distribui ao longo do dia;
+# - "lineups": a partir de LINEUPS_LEAD_SECONDS antes do início, evento, escalações e
+#   últimos jogos são buscados de novo e a partida é recalculada; repete a cada
+#   LINEUPS_RETRY_SECONDS até as escalações saírem confirmadas ou o jogo começar.
+# Entre tarefas vencidas, as ligas de nível mais alto vêm primeiro e, dentro delas, quem
+# começa antes.
+#
+# Dias seguintes ("lookahead"): ficam numa fila à parte (dia mais próximo e nível mais
+# alto primeiro), consumida em lotes de LOOKAHEAD_BATCH_MATCHES só quando a agenda do dia
+# está ociosa por pelo menos LOOKAHEAD_MIN_IDLE_SECONDS. Depois de cada lote, o próximo
+# espera o bastante para a média ficar em LOOKAHEAD_REQUESTS_PER_MINUTE requisições.
+WARM_LEAD_SECONDS = 4 * 3600
+WARM_SLOT_SECONDS = 30 * 60
+LINEUPS_LEAD_SECONDS = 70 * 60
+LINEUPS_RETRY_SECONDS = 10 * 60
+LOOKAHEAD_BATCH_MATCHES = 10
+LOOKAHEAD_MIN_IDLE_SECONDS = 10 * 60
+LOOKAHEAD_REQUESTS_PER_MINUTE = 30
+
+# Daemon: só o processo que detém a trava de líder (arquivo no diretório de cache,
+# compartilhado entre réplicas) aquece; os demais tentam de novo a cada
+# LEADER_RETRY_SECONDS, assumindo se o líder cair. A agenda do dia é recarregada a cada
+# RESCHEDULE_SECONDS (jogos novos, horários alterados).
+LEADER_RETRY_SECONDS = 60
+RESCHEDULE_SECONDS = 30 * 60
+
+
+def kickoff_timestamps(matches_df: pd.DataFrame) -> pd.Series:
+    """Horário de início de cada jogo em segundos epoch."""
+    return (matches_df['start_time'] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+
+
+class WarmScheduler:
+    """
+    Agenda de aquecimento do dia: cada partida tem tarefas com horário de execução;
+    uma thread em segundo plano executa as que venceram, em ordem de prioridade.
+    """
+
+    def __init__(
+        self,
+        workers: int = WARM_WORKERS,
+        checkpoint: Optional[WarmCheckpoint] = None,
+        log: Callable[[str], None] = print,
+        league_tiers: LeagueTiers = DEFAULT_LEAGUE_TIERS,
+    ):
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.log = log
+        self.league_tiers = league_tiers
+        # (event_id, tipo) -> tarefa
+        self._jobs: Dict[tuple, Dict[str, Any]] = {}
+        self._lookahead: List[Dict[str, Any]] = []
+        self._lookahead_seen: set = set()
+        self._lookahead_after = 0.0
+        # (dia, profundidade) -> checkpoint dos lotes dos dias seguintes
+        self._lookahead_checkpoints: Dict[tuple, WarmCheckpoint] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, matches_df: pd.DataFrame, now: Optional[float] = None) -> int:
+        """
+        Sincroniza a agenda com o schedule do dia. Partidas novas ganham tarefas; as já
+        agendadas com horário alterado têm `kickoff`/`due_at` recalculados; tarefas de
+        partidas que saíram do schedule ou já não estão "notstarted" (começaram, adiadas,
+        canceladas) são removidas. Retorna quantas tarefas entraram.
+        """
+        now = now or time.time()
+        added = 0
+        kickoffs = kickoff_timestamps(matches_df) if not matches_df.empty else []
+        with self._lock:
+            upcoming = set()
+            for match, kickoff in zip(matches_df.itertuples(index=False), kickoffs):
+                if getattr(match, "status_type", "notstarted") != "notstarted":
+                    continue
+                event_id = int(match.event_id)
+                upcoming.add(event_id)
+                match_info = {
+                    "event_id": event_id,
+                    "kickoff": int(kickoff),
+                    "rank": league_tier(match.uniqueTournament_id, self.league_tiers),
+                    "label": f"{match.home_team} vs {match.away_team} (event_id={event_id})",
+                    "row": match,
+                }
+                warm_at = kickoff - WARM_LEAD_SECONDS
+                warm_due = max(warm_at - warm_at % WARM_SLOT_SECONDS, 0)
+                warm_job = self._jobs.get((event_id, "warm"))
+                if warm_job is None:
+                    self._jobs[(event_id, "warm")] = {**match_info, "kind": "warm", "due_at": warm_due}
+                    added += 1
+                elif warm_job["kickoff"] != match_info["kickoff"]:
+                    warm_job.update(match_info, due_at=warm_due)
+
+                lineups_job = self._jobs.get((event_id, "lineups"))
+                lineups_pending = not (self.checkpoint and self.checkpoint.is_done(f"match:{event_id}", "lineups"))
+                if lineups_job is None:
+                    if lineups_pending and kickoff > now:
+                        self._jobs[(event_id, "lineups")] = {
+                            **match_info, "kind": "lineups", "due_at": kickoff - LINEUPS_LEAD_SECONDS,
+                        }
+                        added += 1
+                elif lineups_job["kickoff"] != match_info["kickoff"]:
+                    lineups_job.update(match_info, due_at=kickoff - LINEUPS_LEAD_SECONDS)
+
+            for key in [key for key in self._jobs if key[0] not in upcoming]:
+                del self._jobs[key]
+        self._wake.set()
+        return added
+
+    def queue_lookahead(self, matches_df: pd.DataFrame, day: date, depth: str, day_offset: int) -> int:
+        """Enfileira jogos de dias seguintes (os já enfileirados são ignorados). Retorna quantos entraram."""
+        added = 0
+        with self._lock:
+            for match in matches_df.itertuples(index=False):
+                if int(match.event_id) in self._lookahead_seen:
+                    continue
+                self._lookahead_seen.add(int(match.event_id))
+                self._lookahead.append({
+                    "event_id": int(match.event_id),
+                    "day": day,
+                    "depth": depth,
+                    "order": (day_offset, league_tier(match.uniqueTournament_id, self.league_tiers)),
+                    "row": match,
+                })
+                added += 1
+            self._lookahead.sort(key=lambda job: job["order"])
+        return added
+
+    def lookahead_ready_in(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Segundos até o próximo lote dos dias seguintes poder rodar; None se a fila está
+        vazia ou a agenda do dia não está ociosa.
+        """
+        now = now or time.time()
+        with self._lock:
+            if not self._lookahead:
+                return None
+            next_due = min((job["due_at"] for job in self._jobs.values()), default=float("inf"))
+        if next_due - now < LOOKAHEAD_MIN_IDLE_SECONDS:
+            return None
+        return max(0.0, self._lookahead_after - now)
+
+    def run_lookahead(self, now: Optional[float] = None) -> int:
+        """
+        Aquece um lote da fila de dias seguintes, se a agenda do dia está ociosa e o
+        orçamento permite. Retorna quantos jogos foram aquecidos.
+        """
+        now = now or time.time()
+        if self.lookahead_ready_in(now) != 0:
+            return 0
+        with self._lock:
+            # Um lote tem um só dia e profundidade (os do primeiro da fila), com o checkpoint deles
+            day, depth = self._lookahead[0]["day"], self._lookahead[0]["depth"]
+            batch = [job for job in self._lookahead
+                     if job["day"] == day and job["depth"] == depth][:LOOKAHEAD_BATCH_MATCHES]
+            batch_ids = {job["event_id"] for job in batch}
+            self._lookahead = [job for job in self._lookahead if job["event_id"] not in batch_ids]
+            checkpoint = None
+            if self.checkpoint:
+                checkpoint = self._lookahead_checkpoints.get((day, depth))
+                if checkpoint is None:
+                    checkpoint = day_checkpoint(day, depth, resume=self.checkpoint.resume)
+                    self._lookahead_checkpoints[(day, depth)] = checkpoint
+        used = 0
+        try:
+            summary = warm_matches(pd.DataFrame([job["row"] for job in batch]), workers=self.workers,
+                                   checkpoint=checkpoint, log=self.log, depth=depth)
+            used = summary["network_requests"]
+        except Exception as e:
+            self.log(f"Falha no aquecimento dos próximos dias: {e}")
+        self._lookahead_after = time.time() + used / LOOKAHEAD_REQUESTS_PER_MINUTE * 60
+        return len(batch)
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Tarefas agendadas, na ordem de execução."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: (job["due_at"], job["rank"], job["kickoff"]))
+
+    def _due_jobs(self, now: float) -> List[Dict[str, Any]]:
+        with self._lock:
+            due = [job for job in self._jobs.values() if job["due_at"] <= now]
+        return sorted(due, key=lambda job: (job["rank"], job["kickoff"]))
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Executa as tarefas vencidas; retorna quantas foram processadas."""
+        now = now or time.time()
+        due = self._due_jobs(now)
+        warm_jobs = [job for job in due if job["kind"] == "warm"]
+        if warm_jobs:
+            batch = pd.DataFrame([job["row"] for job in warm_jobs])
+            last_kickoff = pd.Timestamp(max(job["kickoff"] for job in warm_jobs), unit='s', tz='UTC')
+            self.log(f"Aquecendo {len(batch)} partidas (início até {last_kickoff:%H:%M} UTC)...")
+            try:
+                warm_matches(batch, workers=self.workers, checkpoint=self.checkpoint, log=self.log)
+            except Exception as e:
+                self.log(f"Falha no aquecimento agendado: {e}")
+            with self._lock:
+                for job in warm_jobs:
+                    self._jobs.pop((job["event_id"], "warm"), None)
+
+        for job in (job for job in due if job["kind"] == "lineups"):
+            if now >= job["kickoff"]:
+                # Jogo já começou (o modo ao vivo assume daqui)
+                with self._lock:
+                    self._jobs.pop((job["event_id"], "lineups"), None)
+                continue
+            row = job["row"]
+            custom_id = row.customId if isinstance(row.customId, str) else None
+            try:
+                confirmed = refresh_match_before_kickoff(job["event_id"], row.home_team, row.away_team, custom_id)
+            except Exception as e:
+                self.log(f" Falha ao reaquecer {job['label']}: {e}")
+                confirmed = False
+            retry_at = now + LINEUPS_RETRY_SECONDS
+            with self._lock:
+                if confirmed or retry_at >= job["kickoff"]:
+                    self._jobs.pop((job["event_id"], "lineups"), None)
+                    if confirmed and self.checkpoint:
+                        self.checkpoint.mark(f"match:{job['event_id']}", "lineups")
+                else:
+                    job["due_at"] = retry_at
+            self.log(f" Pré-jogo {job['label']}: escalações {'confirmadas' if confirmed else 'ainda não confirmadas'}")
+        return len(due)
+
+    def seconds_until_next(self) -> float:
+        with self._lock:
+            if not self._jobs:
+                return 300.0
+            return max(0.0, min(job["due_at"] for job in self._jobs.values()) - time.time())
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._wake.wait(timeout=min(self.seconds_until_next(), 300.0))
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="samsbet-warm-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def run_until_idle(self) -> None:
+        """Executa a agenda e a fila dos dias seguintes em primeiro plano até esvaziarem (linha de comando)."""
+        while not self._stop.is_set():
+            self.run_pending()
+            self.run_lookahead()
+            with self._lock:
+                if not self._jobs and not self._lookahead:
+                    return
+            delay = self.seconds_until_next()
+            ready_in = self.lookahead_ready_in()
+            if ready_in is not None:
+                delay = min(delay, max(ready_in, 1.0))
+            self._stop.wait(timeout=delay)
+
+
+def schedule_daily_warm(scheduler: WarmScheduler, for_date: Optional[date] = None) -> int:
+    """
+    Sincroniza a agenda com os jogos do dia das ligas dos níveis do agendador. O
+    schedule vem da atualização incremental (status e horários novos); as mudanças
+    encontradas aqui também invalidam os caches das partidas afetadas.
+    """
+    matches_df, changes = refresh_matches_dataframe(for_date or date.today())
+    invalidate_match_caches(changes)
+    if matches_df is None:
+        return 0
+    return scheduler.schedule(filter_by_tiers(matches_df, scheduler.league_tiers))
+
+
+def schedule_lookahead(scheduler: WarmScheduler, today: Optional[date] = None, days: int = LOOKAHEAD_DAYS) -> int:
+    """Enfileira os jogos dos próximos `days` dias (completo ou leve conforme a distância)."""
+    today = today or date.today()
+    added = 0
+    for offset in range(1, days + 1):
+        day = today + timedelta(days=offset)
+        matches_df = get_daily_matches_dataframe(day)
+        if matches_df is None or matches_df.empty:
+            continue
+        added += scheduler.queue_lookahead(
+            filter_by_tiers(matches_df, scheduler.league_tiers), day, warm_depth(day, today), offset
+        )
+    return added
+
+
+class WarmDaemon:
+    """
+    Aquecimento em segundo plano do processo: uma thread que, enquanto este processo for
+    o líder, mantém a agenda do dia (no fuso do usuário), executa as tarefas vencidas e,
+    nos intervalos ociosos, aquece os próximos dias. As páginas nunca esperam por ela.
+    """
+
+    def __init__(self, workers: int = WARM_WORKERS, lock: Optional[LeaderLock] = None,
+                 log: Callable[[str], None] = print, lookahead_days: int = LOOKAHEAD_DAYS,
+                 league_tiers: LeagueTiers = DEFAULT_LEAGUE_TIERS):
+        self.workers = workers
+        self.lock = lock or LeaderLock("warm_leader")
+        self.log = log
+        self.lookahead_days = lookahead_days
+        self.league_tiers = league_tiers
+        self.scheduler: Optional[WarmScheduler] = None
+        self._day: Optional[date] = None
+        self._scheduled_at = 0.0
+        self._lookahead_queued = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def tick(self, now: Optional[float] = None) -> float:
+        """Uma volta do daemon; retorna quantos segundos esperar até a próxima."""
+        now = now or time.time()
+        if not self.lock.try_acquire():
+            return LEADER_RETRY_SECONDS
+        today = datetime.fromtimestamp(now, _user_timezone()).date()
+        if today != self._day:
+            self._day = today
+            self._scheduled_at = 0.0
+            self._lookahead_queued = False
+            self.scheduler = WarmScheduler(
+                workers=self.workers, checkpoint=day_checkpoint(today), log=self.log,
+                league_tiers=self.league_tiers,
+            )
+        if now - self._scheduled_at >= RESCHEDULE_SECONDS:
+            self._scheduled_at = now
+            try:
+                self.log(f"{schedule_daily_warm(self.scheduler, today)} tarefas de aquecimento agendadas.")
+            except Exception as e:
+                self.log(f"Falha ao agendar o aquecimento: {e}")
+        if not self._lookahead_queued and self.lookahead_days:
+            try:
+                queued = schedule_lookahead(self.scheduler, today, self.lookahead_days)
+                self._lookahead_queued = True
+                self.log(f"{queued} jogos dos próximos {self.lookahead_days} dias na fila de aquecimento.")
+            except Exception as e:
+                self.log(f"Falha ao enfileirar os próximos dias: {e}")
+        self.scheduler.run_pending(now)
+        self.scheduler.run_lookahead()
+        delay = min(self.scheduler.seconds_until_next(), RESCHEDULE_SECONDS)
+        ready_in = self.scheduler.lookahead_ready_in()
+        if ready_in is not None:
+            delay = min(delay, max(ready_in, 1.0))
+        return delay
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                delay = self.tick()
+            except Exception as e:
+                self.log(f"Falha no aquecimento em segundo plano: {e}")
+                delay = LEADER_RETRY_SECONDS
+            self._stop.wait(timeout=delay)
+        self.lock.release()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="samsbet-warm-daemon", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_daemon: Optional[WarmDaemon] = None
+_daemon_lock = threading.Lock()
+
+
+def get_warm_daemon() -> Optional[WarmDaemon]:
+    """
+    Daemon único do processo, já iniciado (None se desligado com SAMSBET_WARM_DAEMON=0;
+    SAMSBET_WARM_LOOKAHEAD_DAYS muda quantos dias à frente ele aquece).
+    """
+    global _daemon
+    if os.environ.get("SAMSBET_WARM_DAEMON", "1") == "0":
+        return None
+    with _daemon_lock:
+        if _daemon is None:
+            _daemon = WarmDaemon(lookahead_days=int(os.environ.get("SAMSBET_WARM_LOOKAHEAD_DAYS", LOOKAHEAD_DAYS)))
+            _daemon.start()
+        return _daemon
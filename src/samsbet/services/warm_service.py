@@ -0,0 +1,571 @@
+# samsbet/services/warm_service.py
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from samsbet.api.request_metrics import RequestRecorder, bind_context, recording
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.constants import PRINCIPAL_LEAGUES_IDS
+from samsbet.core.disk_cache import _get_cache_dir
+from samsbet.core.event_context import get_event_context
+from samsbet.core.event_store import is_finished
+from samsbet.services.form_service import fetch_player_event_stats, fetch_team_event_stats
+from samsbet.services.league_service import build_league_team_index
+from samsbet.services.match_context import MatchContext, bump_match_cache_version
+from samsbet.services.match_service import get_daily_matches_dataframe
+from samsbet.services.season_service import get_team_season_stats
+from samsbet.services.snapshot_service import build_league_player_snapshot
+from samsbet.services.stats_service import (
+    get_match_analysis_data,
+    get_goalkeeper_stats_for_match,
+    get_h2h_data,
+    get_summary_stats_for_event,
+    get_h2h_goalkeeper_analysis,
+)
+from samsbet.services.view_model_service import (
+    WARM_VIEW_OPTIONS,
+    build_match_view_model,
+    store_match_view_model,
+)
+
+# Aquecimento do cache em duas fases:
+# 1) plano de endpoints: o conjunto de recursos que as partidas do dia precisam é
+#    compilado em estágios (cada estágio depende do anterior, já em cache), sem
+#    repetição entre partidas — classificação, snapshots e times da mesma liga, H2H
+#    sobrepostos — e cada recurso é buscado uma única vez;
+# 2) resultados derivados: índices de liga e análises de cada partida, calculados a
+#    partir do cache já aquecido.
+# Tudo roda num pool de workers que divide o mesmo espaçamento entre requisições do
+# SofaScoreClient (orçamento global do processo), e cada item concluído é registrado
+# num checkpoint em disco, então uma rodada interrompida recomeça de onde parou.
+WARM_WORKERS = 4
+MATCH_STEPS = ("analysis", "goalkeepers", "h2h", "h2h_summaries", "h2h_goalkeepers", "view_model")
+
+# Ligas por nível de prioridade: cada nível é um conjunto de uniqueTournament_id (None = todas
+# as demais); jogos fora de todos os níveis não são aquecidos
+LeagueTiers = Sequence[Optional[Iterable[int]]]
+DEFAULT_LEAGUE_TIERS: LeagueTiers = (PRINCIPAL_LEAGUES_IDS,)
+
+# Dias à frente: os próximos FULL_WARM_DAYS dias (hoje incluído) recebem o aquecimento
+# completo; os demais, até LOOKAHEAD_DAYS, um aquecimento leve — evento, classificação,
+# H2H e totais de temporada dos dois times (sem snapshots de jogadores, índices de liga,
+# lineups nem análises), completado quando o dia se aproxima
+LOOKAHEAD_DAYS = 6
+FULL_WARM_DAYS = 2
+WARM_DEPTHS = ("full", "light")
+
+# Relatórios das rodadas (JSON por rodada + histórico resumido), no diretório de cache
+WARM_REPORTS_DIR = "warm_reports"
+REPORT_COLUMNS = (
+    ("rede", "network"), ("memória", "memory_hits"), ("disco", "disk_hits"), ("falhas", "failures"),
+    ("KB", "bytes"), ("espera s", "rate_wait_seconds"), ("p50 ms", "latency_p50_ms"),
+    ("p90 ms", "latency_p90_ms"), ("p99 ms", "latency_p99_ms"),
+)
+
+# Estágio -> recurso -> busca; a chave do recurso identifica o endpoint (ou a página de endpoints)
+PlanStage = Dict[str, Callable[[], Any]]
+
+
+def _has_payload(payload: Any) -> bool:
+    """
+    Se a busca trouxe dados: o cliente devolve `{}` quando a API bloqueia (403/429) ou
+    falha, e as montagens derivadas ficam vazias (ou só com zeros) nesse caso.
+    """
+    if isinstance(payload, pd.DataFrame):
+        return not payload.empty
+    if isinstance(payload, dict):
+        return any(_has_payload(value) for value in payload.values())
+    if isinstance(payload, (list, tuple)):
+        return len(payload) > 0
+    return bool(payload)
+
+
+class WarmCheckpoint:
+    """Etapas concluídas de uma rodada de aquecimento (JSON no diretório de cache)."""
+
+    def __init__(self, run_id: str, resume: bool = True, path: Optional[str] = None):
+        self.run_id = run_id
+        self.resume = resume
+        self.path = path or os.path.join(_get_cache_dir(), f"warm_checkpoint_{run_id}.json")
+        self._lock = threading.Lock()
+        self._done: Dict[str, List[str]] = {}
+        if resume and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._done = json.load(f).get("done", {})
+            except Exception:
+                self._done = {}
+
+    def is_done(self, key: str, step: str) -> bool:
+        with self._lock:
+            return step in self._done.get(key, [])
+
+    def all_done(self, key: str, steps) -> bool:
+        with self._lock:
+            return set(steps) <= set(self._done.get(key, []))
+
+    def mark(self, key: str, step: str) -> None:
+        with self._lock:
+            steps = self._done.setdefault(key, [])
+            if step in steps:
+                return
+            steps.append(step)
+            # Escrita atômica: um processo interrompido nunca deixa o arquivo pela metade
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"updated_at": time.time(), "done": self._done}, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+
+def day_checkpoint(day: date, depth: str = "full", resume: bool = True) -> WarmCheckpoint:
+    """
+    Checkpoint da rodada de um dia numa profundidade: um aquecimento leve não conta como
+    completo quando o dia se aproxima, e cada dia à frente tem o seu.
+    """
+    return WarmCheckpoint(f"{day.isoformat()}_{depth}", resume=resume)
+
+
+def warm_single_match(
+    event_id: int,
+    home_team: str,
+    away_team: str,
+    custom_id: str | None,
+    checkpoint: Optional[WarmCheckpoint] = None,
+) -> None:
+    """Executa todas as consultas pesadas de uma partida para aquecer o cache (pulando etapas já concluídas)."""
+    key = f"match:{event_id}"
+    done: Callable[[str], bool] = (lambda step: checkpoint.is_done(key, step)) if checkpoint else (lambda step: False)
+    mark: Callable[[str], None] = (lambda step: checkpoint.mark(key, step)) if checkpoint else (lambda step: None)
+
+    # Um único contexto por partida: cada endpoint é requisitado no máximo uma vez
+    context = MatchContext(event_id, custom_id=custom_id)
+
+    # 1) Dados de análise principal (times, jogadores, resumos, standings)
+    if not done("analysis"):
+        get_match_analysis_data(event_id, filter_by_location=False, context=context)
+        mark("analysis")
+
+    # 2) Estatísticas de goleiros por time (temporada), reaproveitando último jogo e lineups
+    if not done("goalkeepers"):
+        get_goalkeeper_stats_for_match(event_id, context=context)
+        mark("goalkeepers")
+
+    _warm_match_h2h(home_team, away_team, custom_id, context, done, mark)
+
+    # 6) View models da página (com e sem filtro de mando), recalculados sobre os dados atuais
+    if not done("view_model"):
+        for options in WARM_VIEW_OPTIONS:
+            view_model = build_match_view_model(event_id, home_team, away_team, custom_id, options=options, context=context)
+            if view_model:
+                store_match_view_model(event_id, options, view_model)
+        mark("view_model")
+
+
+def _warm_match_h2h(
+    home_team: str,
+    away_team: str,
+    custom_id: str | None,
+    context: MatchContext,
+    done: Callable[[str], bool],
+    mark: Callable[[str], None],
+) -> None:
+    """Etapas de H2H de `warm_single_match` (lista, estatísticas de cada jogo e goleiros)."""
+    h2h_steps = ("h2h", "h2h_summaries", "h2h_goalkeepers")
+    if not custom_id or all(done(step) for step in h2h_steps):
+        for step in h2h_steps:
+            mark(step)
+        return
+
+    # 3) H2H básico (lista); numa retomada vem do cache em disco
+    h2h_df = get_h2h_data(custom_id, home_team, away_team, context=context)
+    mark("h2h")
+    if h2h_df is None or h2h_df.empty:
+        mark("h2h_summaries")
+        mark("h2h_goalkeepers")
+        return
+
+    # 4) Para cada H2H com estatísticas, carregar summary stats do evento
+    detailed_stats_cache: Dict[int, Dict] = {}
+    for event_id_row in h2h_df.loc[h2h_df["hasEventPlayerStatistics"] == True, "event_id"].unique():
+        detailed_stats_cache[event_id_row] = get_summary_stats_for_event(event_id_row, context=context)
+    mark("h2h_summaries")
+
+    # 5) Análise específica de goleiros baseada no H2H (eventos e estatísticas vêm do contexto)
+    if not done("h2h_goalkeepers"):
+        get_h2h_goalkeeper_analysis(
+            custom_id, home_team, away_team, detailed_stats_cache=detailed_stats_cache, context=context
+        )
+        mark("h2h_goalkeepers")
+
+
+def refresh_match_before_kickoff(
+    event_id: int,
+    home_team: str,
+    away_team: str,
+    custom_id: str | None,
+    client: Optional[SofaScoreClient] = None,
+) -> bool:
+    """
+    Reaquecimento perto do início: busca de novo (ignorando o cache) o evento, as
+    escalações e os últimos eventos dos dois times, e recalcula a partida sobre os dados
+    novos. Retorna True quando as escalações já saíram confirmadas.
+    """
+    client = client or SofaScoreClient()
+    event = client.get_event_details(event_id, refresh=True)
+    lineups = client.get_event_lineups(event_id, refresh=True)
+    for side in ("homeTeam", "awayTeam"):
+        if team_id := event.get(side, {}).get("id"):
+            client.get_team_last_events(team_id, refresh=True)
+    # A versão avança antes do recálculo: os view models novos já saem com a chave nova
+    bump_match_cache_version([event_id])
+    warm_single_match(event_id, home_team, away_team, custom_id)
+    return bool(lineups.get("confirmed"))
+
+
+def league_tier(unique_tournament_id: Any, league_tiers: LeagueTiers = DEFAULT_LEAGUE_TIERS) -> Optional[int]:
+    """Nível de prioridade da liga (0 = mais alta), ou None se ela não está em nenhum nível."""
+    for tier, leagues in enumerate(league_tiers):
+        if leagues is None or unique_tournament_id in leagues:
+            return tier
+    return None
+
+
+def filter_by_tiers(matches_df: pd.DataFrame, league_tiers: LeagueTiers = DEFAULT_LEAGUE_TIERS) -> pd.DataFrame:
+    """Só os jogos das ligas de algum nível."""
+    tiers = matches_df["uniqueTournament_id"].map(lambda ut: league_tier(ut, league_tiers))
+    return matches_df[tiers.notna()]
+
+
+def warm_depth(day: date, today: date) -> str:
+    """Profundidade do aquecimento de um dia: completo perto, leve longe."""
+    return "full" if (day - today).days < FULL_WARM_DAYS else "light"
+
+
+def _plan_leagues(matches_df: pd.DataFrame) -> List[tuple]:
+    leagues = matches_df[["tournament_id", "uniqueTournament_id", "season_id"]].dropna(
+        subset=["uniqueTournament_id", "season_id"]
+    ).drop_duplicates(subset=["uniqueTournament_id", "season_id"]).fillna(0)
+    return [(int(t), int(ut), int(season)) for t, ut, season in leagues.itertuples(index=False)]
+
+
+def _standings_team_ids(client: SofaScoreClient, tournament_id: int, season_id: int) -> List[int]:
+    standings = client.get_league_standings(tournament_id, season_id) if tournament_id else {}
+    rows = standings.get("standings", [{}])[0].get("rows", []) if standings else []
+    return [row["team"]["id"] for row in rows if row.get("team", {}).get("id") and row.get("matches")]
+
+
+def compile_warm_plan(
+    matches_df: pd.DataFrame, client: SofaScoreClient, depth: str = "full"
+) -> Callable[[int], Tuple[PlanStage, int]]:
+    """
+    Plano de endpoints das partidas, por estágio de dependência. O estágio N é compilado
+    depois que o N-1 foi buscado (ele lê do cache o que o anterior trouxe) e devolve os
+    recursos únicos e quantas vezes as partidas os pediram, somadas:
+      0: evento (só se o schedule não trouxe o contexto), classificação, snapshots de
+         jogadores da liga (total/casa/fora) e lista do H2H;
+      1: últimos eventos dos times (os da partida e, para o índice da liga, toda a
+         tabela) e estatísticas dos jogos do H2H;
+      2: totais de temporada desses times e lineups do último jogo dos times da partida.
+    Com `depth="light"` ficam só evento, classificação, H2H e últimos eventos/totais de
+    temporada dos dois times da partida.
+    """
+    full = depth == "full"
+    matches = [
+        (int(m.event_id), m.customId if isinstance(m.customId, str) else None,
+         int(m.tournament_id) if pd.notna(m.tournament_id) else 0, int(m.uniqueTournament_id), int(m.season_id),
+         [int(t) for t in (m.home_team_id, m.away_team_id) if pd.notna(t)])
+        for m in matches_df.dropna(subset=["uniqueTournament_id", "season_id"]).itertuples(index=False)
+    ]
+
+    def stage(index: int) -> Tuple[PlanStage, int]:
+        tasks: PlanStage = {}
+        requested = 0
+
+        def add(key: str, fetch: Callable[[], Any]) -> None:
+            nonlocal requested
+            requested += 1
+            tasks.setdefault(key, fetch)
+
+        for event_id, custom_id, tournament_id, ut, season, team_ids in matches:
+            # Times cujos totais de temporada a partida usa: os dois e, no índice da liga, toda a tabela
+            league_team_ids = team_ids + [t for t in _standings_team_ids(client, tournament_id, season)
+                                          if t not in team_ids] if index > 0 and full else team_ids
+            if index == 0:
+                context = get_event_context(event_id) or {}
+                if not all(context.get(k) for k in ("tournament_id", "season_id", "home_team_id", "away_team_id")):
+                    add(f"event/{event_id}", lambda e=event_id: client.get_event_details(e))
+                if custom_id:
+                    add(f"h2h/{custom_id}", lambda c=custom_id: client.get_h2h_events(c))
+                if tournament_id:
+                    add(f"standings/{tournament_id}/{season}",
+                        lambda t=tournament_id, s=season: client.get_league_standings(t, s))
+                for match_type in ((None, "home", "away") if full else ()):
+                    add(f"snapshot/{ut}/{season}/{match_type or 'total'}",
+                        lambda u=ut, s=season, m=match_type: build_league_player_snapshot(u, s, match_type=m, client=client))
+            elif index == 1:
+                for team_id in league_team_ids:
+                    add(f"last_events/{team_id}", lambda t=team_id: client.get_team_last_events(t))
+                for event in (client.get_h2h_events(custom_id) if custom_id and full else []):
+                    if event.get("id") and is_finished(event) and event.get("hasEventPlayerStatistics") is True:
+                        add(f"event/{event['id']}/statistics", lambda e=event: fetch_team_event_stats(client, e))
+            else:
+                for team_id in league_team_ids:
+                    add(f"team_season/{team_id}/{ut}/{season}",
+                        lambda t=team_id, u=ut, s=season: get_team_season_stats(
+                            t, u, s, events=client.get_team_last_events(t), client=client))
+                for team_id in (team_ids if full else []):
+                    events = client.get_team_last_events(team_id)
+                    if events and events[-1].get("id"):
+                        add(f"event/{events[-1]['id']}/lineups", lambda e=events[-1]: fetch_player_event_stats(client, e))
+        return tasks, requested
+
+    return stage
+
+
+PLAN_STAGES = 3
+
+
+def run_warm_plan(
+    matches_df: pd.DataFrame,
+    workers: int = WARM_WORKERS,
+    checkpoint: Optional[WarmCheckpoint] = None,
+    client: Optional[SofaScoreClient] = None,
+    log: Callable[[str], None] = print,
+    depth: str = "full",
+) -> Dict[str, int]:
+    """Busca cada recurso do plano uma única vez, estágio por estágio. Retorna os totais do plano."""
+    client = client or SofaScoreClient()
+    stage_tasks = compile_warm_plan(matches_df, client, depth)
+    totals = {"requested": 0, "resources": 0, "fetched": 0, "skipped": 0, "failed": 0}
+    for index in range(PLAN_STAGES):
+        tasks, requested = stage_tasks(index)
+        pending = [
+            {"label": key, "key": key, "fetch": fetch} for key, fetch in tasks.items()
+            if checkpoint is None or not checkpoint.is_done("plan", key)
+        ]
+        log(f"Estágio {index} do plano: {requested} pedidos -> {len(tasks)} recursos únicos "
+            f"({len(tasks) - len(pending)} já aquecidos)")
+
+        def work(task):
+            # Resposta vazia conta como falha e fica fora do checkpoint: a retomada busca de novo
+            if not _has_payload(task["fetch"]()):
+                raise RuntimeError("resposta vazia")
+            if checkpoint:
+                checkpoint.mark("plan", task["key"])
+        counts = _run_pool(pending, work, workers, lambda message: None)
+        totals["requested"] += requested
+        totals["resources"] += len(tasks)
+        totals["fetched"] += counts["ok"]
+        totals["skipped"] += len(tasks) - len(pending)
+        totals["failed"] += counts["failed"]
+    return totals
+
+
+def _run_pool(tasks: List[Dict[str, Any]], work: Callable[[Dict[str, Any]], None], workers: int,
+              log: Callable[[str], None]) -> Dict[str, int]:
+    """Executa as tarefas no pool; cada falha é registrada sem derrubar as demais."""
+    counts = {"ok": 0, "failed": 0}
+    if not tasks:
+        return counts
+    # As tarefas herdam o contexto de quem submete (recorder do relatório da rodada)
+    work = bind_context(work)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(work, task): task for task in tasks}
+        for i, future in enumerate(as_completed(futures), start=1):
+            task = futures[future]
+            try:
+                future.result()
+                counts["ok"] += 1
+                log(f" [{i}/{len(tasks)}] {task['label']}")
+            except Exception as e:
+                counts["failed"] += 1
+                log(f" [{i}/{len(tasks)}] Falha em {task['label']}: {e}")
+    return counts
+
+
+def warm_matches(
+    matches_df: pd.DataFrame,
+    workers: int = WARM_WORKERS,
+    checkpoint: Optional[WarmCheckpoint] = None,
+    log: Callable[[str], None] = print,
+    depth: str = "full",
+) -> Dict[str, Any]:
+    """
+    Aquece ligas e partidas do DataFrame de jogos em paralelo. Retorna o resumo da
+    rodada (partidas, falhas, tempo, requisições à rede e vazão) e grava o relatório
+    completo, com o detalhamento por família de endpoint (`write_warm_report`).
+    No aquecimento leve (`depth="light"`) só o plano de endpoints é buscado.
+    """
+    with recording() as recorder:
+        summary = _warm_matches(matches_df, workers, checkpoint, log, depth, recorder)
+    endpoints = recorder.report()
+    summary["bytes_fetched"] = endpoints["total"]["bytes"]
+    summary["rate_wait_seconds"] = endpoints["total"]["rate_wait_seconds"]
+    summary["network_failures"] = endpoints["total"]["failures"]
+    report = {
+        "run_id": checkpoint.run_id if checkpoint else None,
+        "finished_at": time.time(),
+        "workers": workers,
+        "depth": depth,
+        "leagues": [[ut, season] for _, ut, season in _plan_leagues(matches_df)],
+        "summary": summary,
+        "endpoints": endpoints,
+    }
+    path = write_warm_report(report)
+    log(format_report_table(endpoints))
+    if path:
+        log(f"Relatório salvo em {path}")
+    return summary
+
+
+def _warm_matches(
+    matches_df: pd.DataFrame,
+    workers: int,
+    checkpoint: Optional[WarmCheckpoint],
+    log: Callable[[str], None],
+    depth: str,
+    recorder: RequestRecorder,
+) -> Dict[str, Any]:
+    started = time.time()
+
+    # 1) Cada recurso das partidas, uma única vez
+    plan = run_warm_plan(matches_df, workers=workers, checkpoint=checkpoint, log=log, depth=depth)
+
+    # 2) Resultados derivados, a partir do cache: índices de liga e análises das partidas
+    derived_df = matches_df if depth == "full" else matches_df.iloc[:0]
+    league_tasks = [
+        {"label": f"índice da liga ut={ut} season={season}", "args": (t, ut, season)}
+        for t, ut, season in _plan_leagues(derived_df)
+        if t and (checkpoint is None or not checkpoint.is_done(f"league:{ut}:{season}", "team_index"))
+    ]
+
+    def build_index(task):
+        build_league_team_index(*task["args"])
+        if checkpoint:
+            checkpoint.mark(f"league:{task['args'][1]}:{task['args'][2]}", "team_index")
+    log(f"Montando índices de {len(league_tasks)} competições...")
+    league_counts = _run_pool(league_tasks, build_index, workers, log)
+
+    match_tasks = []
+    skipped = 0
+    for match in derived_df.itertuples(index=False):
+        if checkpoint and checkpoint.all_done(f"match:{match.event_id}", MATCH_STEPS):
+            skipped += 1
+            continue
+        custom_id = match.customId if isinstance(match.customId, str) else None
+        match_tasks.append({
+            "label": f"{match.home_team} vs {match.away_team} (event_id={match.event_id})",
+            "args": (int(match.event_id), match.home_team, match.away_team, custom_id),
+        })
+    log(f"Aquecendo {len(match_tasks)} partidas ({skipped} já concluídas numa rodada anterior)...")
+    match_counts = _run_pool(
+        match_tasks, lambda task: warm_single_match(*task["args"], checkpoint=checkpoint), workers, log
+    )
+
+    elapsed = max(time.time() - started, 1e-6)
+    # Só as requisições desta rodada (o processo também atende páginas e o modo ao vivo)
+    totals = recorder.report()["total"]
+    network = totals["network"]
+    cache_hits = totals["memory_hits"] + totals["disk_hits"]
+    summary = {
+        "plan_requested": plan["requested"],
+        "plan_resources": plan["resources"],
+        "plan_failed": plan["failed"],
+        "leagues": len(league_tasks),
+        "leagues_failed": league_counts["failed"],
+        "matches": len(match_tasks),
+        "matches_skipped": skipped,
+        "matches_failed": match_counts["failed"],
+        "elapsed_seconds": round(elapsed, 1),
+        "network_requests": network,
+        "cache_hits": cache_hits,
+        "matches_per_minute": round(match_counts["ok"] / elapsed * 60, 1),
+        "requests_per_second": round(network / elapsed, 2),
+    }
+    log(
+        f"Aquecimento concluído em {summary['elapsed_seconds']}s: {match_counts['ok']} partidas "
+        f"({summary['matches_per_minute']}/min, {match_counts['failed']} falhas), "
+        f"{network} requisições ({summary['requests_per_second']}/s), {cache_hits} acertos de cache."
+    )
+    return summary
+
+
+def write_warm_report(report: Dict[str, Any]) -> Optional[str]:
+    """
+    Grava o relatório da rodada em `warm_reports/warm_<run_id>_<hora>.json` e acrescenta
+    o resumo a `warm_reports/history.jsonl` (custo das rodadas ao longo do tempo).
+    """
+    reports_dir = os.path.join(_get_cache_dir(), WARM_REPORTS_DIR)
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(report["finished_at"]))
+    path = os.path.join(reports_dir, f"warm_{report['run_id'] or 'adhoc'}_{stamp}.json")
+    try:
+        os.makedirs(reports_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        history = {key: report[key] for key in ("run_id", "finished_at", "workers", "depth", "leagues", "summary")}
+        with open(os.path.join(reports_dir, "history.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(history, ensure_ascii=False) + "\n")
+    except OSError:
+        return None
+    return path
+
+
+def load_warm_history(limit: int = 30) -> List[Dict[str, Any]]:
+    """Resumos das últimas rodadas (mais recente por último)."""
+    path = os.path.join(_get_cache_dir(), WARM_REPORTS_DIR, "history.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()[-limit:]
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def format_report_table(endpoints: Dict[str, Dict[str, Any]]) -> str:
+    """Tabela de texto do detalhamento por família de endpoint."""
+    table = pd.DataFrame.from_dict(endpoints, orient="index")[[key for _, key in REPORT_COLUMNS]]
+    table["bytes"] = (table["bytes"] / 1024).round(1)
+    table.columns = [label for label, _ in REPORT_COLUMNS]
+    return table.to_string()
+
+
+def run_daily_warm(
+    for_date: Optional[date] = None,
+    workers: int = WARM_WORKERS,
+    resume: bool = True,
+    log: Callable[[str], None] = print,
+    days: int = 0,
+    league_tiers: LeagueTiers = DEFAULT_LEAGUE_TIERS,
+) -> Dict[str, Any]:
+    """
+    Aquece as partidas do dia das ligas dos níveis dados (retomando a rodada do dia, se
+    houver) e, com `days`, as dos próximos dias — completo ou leve conforme `warm_depth`.
+    Retorna o resumo de cada dia aquecido. Cada dia e profundidade tem o seu checkpoint
+    (`day_checkpoint`).
+    """
+    for_date = for_date or date.today()
+    summaries = {}
+    for offset in range(days + 1):
+        day = for_date + timedelta(days=offset)
+        # Também indexa o contexto de cada evento (torneio, temporada, times), então as
+        # análises pulam a requisição a `event/{id}`
+        matches_df = get_daily_matches_dataframe(day)
+        if matches_df is None or matches_df.empty:
+            log(f"Nenhum jogo encontrado para {day:%d/%m/%Y}.")
+            continue
+        matches_df = filter_by_tiers(matches_df, league_tiers)
+        depth = warm_depth(day, for_date)
+        log(f"{day:%d/%m/%Y}: {len(matches_df)} jogos, aquecimento {'completo' if depth == 'full' else 'leve'}")
+        summaries[day.isoformat()] = warm_matches(
+            matches_df, workers=workers, checkpoint=day_checkpoint(day, depth, resume=resume), log=log, depth=depth
+        )
+    return summaries
@@ -0,0 +1,56 @@
+# tests/test_league_service.py
+
+import numpy as np
+import pytest
+
+from samsbet.core.event_store import put_season_totals
+from samsbet.services import league_service
+from samsbet.services.league_service import build_league_team_index, get_team_league_context, percentile_matrix
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAMSBET_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SAMSBET_EVENT_STORE", raising=False)
+    monkeypatch.setattr(league_service, "_memory_indexes", {})
+
+
+def test_percentile_matrix_inverts_lower_is_better_columns():
+    values = np.array([[1.0, 5.0], [2.0, 5.0], [3.0, 1.0]])
+    percentiles, positions = percentile_matrix(values, [True, False])
+
+    # Coluna 0: maior é melhor
+    assert percentiles[:, 0].tolist() == [0.0, 50.0, 100.0]
+    assert positions[:, 0].tolist() == [3, 2, 1]
+    # Coluna 1: menor é melhor; empates dividem o percentil e ficam com a melhor posição
+    assert percentiles[:, 1].tolist() == [25.0, 25.0, 100.0]
+    assert positions[:, 1].tolist() == [2, 2, 1]
+
+
+def test_percentile_matrix_single_team_and_empty():
+    percentiles, positions = percentile_matrix(np.array([[4.0, 2.0]]), [True, False])
+    assert percentiles.tolist() == [[100.0, 100.0]] and positions.tolist() == [[1, 1]]
+    assert percentile_matrix(np.empty((0, 2)))[0].shape == (0, 2)
+
+
+class _StandingsClient:
+    """Só a tabela: qualquer outra requisição falha o teste."""
+
+    def get_league_standings(self, tournament_id, season_id):
+        rows = [{"team": {"id": team_id}, "matches": 10, "scoresFor": 10 + team_id, "scoresAgainst": 12 - team_id}
+                for team_id in (1, 2, 3)]
+        return {"standings": [{"rows": rows}]}
+
+
+def test_index_is_built_from_stored_totals_only():
+    for team_id in (1, 2):
+        put_season_totals(team_id, 7, 8, {"goalsScored": 10 + team_id, "shots": 100 * team_id}, [], 0.0)
+
+    index = build_league_team_index(5, 7, 8, client=_StandingsClient())
+
+    # O time 3 ainda não tem totais gravados: fica fora, sem buscar nada na API
+    assert index["team_ids"] == [1, 2]
+    context = get_team_league_context(7, 8, 2)
+    assert not context.empty
+    assert context["Posição"].str.endswith("de 2").all()
+    assert get_team_league_context(7, 8, 3).empty
@@ -0,0 +1,53 @@
+# tests/test_live_service.py
+
+import pytest
+
+from samsbet.services.live_service import (
+    PRE_KICKOFF_INTERVAL_SECONDS,
+    STALE_KICKOFF_SECONDS,
+    LivePoller,
+    get_live_update,
+)
+
+NOW = 1_750_000_000
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAMSBET_CACHE_DIR", str(tmp_path))
+
+
+class _NotStartedClient:
+    """Evento que continua "não começado" depois do horário marcado."""
+
+    def __init__(self, start_timestamp):
+        self.start_timestamp = start_timestamp
+        self.requests = 0
+
+    def get_event_details(self, event_id, refresh=False):
+        self.requests += 1
+        return {"id": event_id, "startTimestamp": self.start_timestamp,
+                "status": {"type": "notstarted", "description": "Not started", "code": 0}}
+
+
+def test_late_kickoff_keeps_being_polled_until_it_goes_stale():
+    client = _NotStartedClient(NOW - 20 * 60)
+    poller = LivePoller(client=client)
+    poller.track([{"event_id": 1, "status_type": "notstarted", "start_timestamp": client.start_timestamp}], now=NOW)
+
+    poller.run_pending(NOW)
+    assert poller.tracked() == [1]
+    assert poller._due[1] == NOW + PRE_KICKOFF_INTERVAL_SECONDS
+
+    # Três horas depois do início e ainda sem começar: sai da agenda
+    later = client.start_timestamp + STALE_KICKOFF_SECONDS + 1
+    poller.run_pending(later)
+    assert poller.tracked() == []
+    assert get_live_update(1)["finished"] is True
+
+    # A publicação encerrada faz as outras réplicas pararem sem nova requisição
+    other = LivePoller(client=client)
+    other.track([{"event_id": 1, "status_type": "notstarted", "start_timestamp": later - 60}], now=later)
+    requests = client.requests
+    other.run_pending(later + 1)
+    assert other.tracked() == [] and client.requests == requests
@@ -0,0 +1,165 @@
+# tests/test_match_service.py
+
+from datetime import date, datetime, timezone
+
+import pandas as pd
+import pytest
+
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.services import match_service
+from samsbet.services.match_context import match_cache_version
+from samsbet.services.match_service import (
+    SCHEDULE_KEEP_EXPIRED_SECONDS,
+    _empty_changes,
+    _event_signature,
+    _frame_signatures,
+    _patch_frame,
+    _store_schedule,
+    _user_timezone,
+    diff_schedule,
+    invalidate_match_caches,
+    schedule_to_dataframe,
+)
+
+DAY = date(2025, 5, 10)
+USER_TZ = _user_timezone()
+
+
+def _kickoff(hour: int, minute: int = 0) -> int:
+    # 15:00 UTC = 12:00 em São Paulo: todos os horários dos testes caem no mesmo dia local
+    return int(datetime(2025, 5, 10, hour, minute, tzinfo=timezone.utc).timestamp())
+
+
+def _event(event_id, hour, status='Not started', status_type='notstarted', home=None, away=None,
+           tournament='Serie A', country='Brazil'):
+    return {
+        'id': event_id,
+        'customId': f'c{event_id}',
+        'startTimestamp': _kickoff(hour),
+        'tournament': {'id': 10, 'name': tournament, 'category': {'name': country}, 'uniqueTournament': {'id': 325}},
+        'season': {'id': 99},
+        'homeTeam': {'id': event_id * 10, 'name': f'Casa {event_id}'},
+        'awayTeam': {'id': event_id * 10 + 1, 'name': f'Fora {event_id}'},
+        'status': {'description': status, 'type': status_type},
+        'homeScore': {'current': home} if home is not None else {},
+        'awayScore': {'current': away} if away is not None else {},
+    }
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAMSBET_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(SofaScoreClient, "_cache", {})
+
+
+def _signatures(events):
+    return {e['id']: _event_signature(e) for e in events}
+
+
+def test_diff_schedule_classifies_each_change():
+    old = [_event(1, 15), _event(2, 16), _event(3, 17), _event(4, 18)]
+    new = [
+        _event(1, 15, status='1st half', status_type='inprogress', home=0, away=0),
+        _event(2, 16, home=None, away=None),
+        _event(3, 19),
+        _event(5, 20),
+    ]
+    new[1]['homeScore'] = {'current': 1}
+
+    changes = diff_schedule(_signatures(old), _signatures(new))
+
+    assert changes['added'] == [5]
+    assert changes['removed'] == [4]
+    assert changes['status_changed'] == [1]
+    assert sorted(changes['score_changed']) == [1, 2]
+    assert changes['kickoff_changed'] == [3]
+
+
+def test_diff_schedule_without_changes_is_empty():
+    events = [_event(1, 15, home=1, away=0), _event(2, 16)]
+    assert diff_schedule(_signatures(events), _signatures(events)) == _empty_changes()
+
+
+def test_frame_signatures_match_event_signatures():
+    events = [_event(1, 15, status='Ended', status_type='finished', home=2, away=1), _event(2, 16)]
+    df = schedule_to_dataframe(events, DAY, USER_TZ)
+    assert _frame_signatures(df) == _signatures(events)
+
+
+def _assert_patch_equals_rebuild(old_events, new_events):
+    old_df = schedule_to_dataframe(old_events, DAY, USER_TZ)
+    changes = diff_schedule(_frame_signatures(old_df), _signatures(new_events))
+    patched = _patch_frame(old_df, {e['id']: e for e in new_events}, changes, DAY, DAY, USER_TZ)
+    rebuilt = schedule_to_dataframe(new_events, DAY, USER_TZ)
+    # As categorias podem sobrar/vir em outra ordem no patch; os valores precisam ser iguais
+    pd.testing.assert_frame_equal(
+        patched.reset_index(drop=True), rebuilt, check_categorical=False, check_dtype=False,
+    )
+    return changes
+
+
+def test_patch_frame_equals_full_rebuild():
+    old_events = [
+        _event(1, 15),
+        _event(2, 16),
+        _event(3, 17, tournament='Premier League', country='England'),
+        _event(4, 18),
+    ]
+    new_events = [
+        _event(1, 15, status='1st half', status_type='inprogress', home=1, away=0),
+        _event(2, 21),
+        _event(3, 17, tournament='Premier League', country='England'),
+        _event(6, 19, status='Postponed', status_type='postponed', tournament='LaLiga', country='Spain'),
+    ]
+    changes = _assert_patch_equals_rebuild(old_events, new_events)
+    assert changes['added'] == [6] and changes['removed'] == [4]
+
+
+def test_patch_frame_with_only_score_changes_equals_full_rebuild():
+    old_events = [_event(1, 15, status='2nd half', status_type='inprogress', home=0, away=0), _event(2, 16)]
+    new_events = [_event(1, 15, status='2nd half', status_type='inprogress', home=0, away=1), _event(2, 16)]
+    changes = _assert_patch_equals_rebuild(old_events, new_events)
+    assert changes['score_changed'] == [1]
+
+
+def test_patch_frame_does_not_mutate_the_cached_frame():
+    old_events = [_event(1, 15), _event(2, 16)]
+    old_df = schedule_to_dataframe(old_events, DAY, USER_TZ)
+    snapshot = old_df.copy()
+    new_events = [_event(1, 15, status='1st half', status_type='inprogress', home=0, away=0), _event(2, 16)]
+    changes = diff_schedule(_frame_signatures(old_df), _signatures(new_events))
+    _patch_frame(old_df, {e['id']: e for e in new_events}, changes, DAY, DAY, USER_TZ)
+    pd.testing.assert_frame_equal(old_df, snapshot)
+
+
+def test_invalidate_match_caches_reaches_long_lived_clients():
+    long_lived = SofaScoreClient()
+    long_lived._remember("event/1", float("inf"), {"event": {"id": 1}})
+    long_lived._remember("event/2", float("inf"), {"event": {"id": 2}})
+    changes = {**_empty_changes(), 'status_changed': [1]}
+
+    endpoints = invalidate_match_caches(changes)
+
+    assert "event/1" in endpoints
+    assert "event/1" not in long_lived._cache
+    assert "event/2" in long_lived._cache
+    assert match_cache_version(1) > 0 and match_cache_version(2) == 0
+
+
+def test_store_schedule_evicts_abandoned_ranges(monkeypatch):
+    frames, signatures, refreshed = {}, {}, {}
+    monkeypatch.setattr(match_service, "_schedule_frames", frames)
+    monkeypatch.setattr(match_service, "_schedule_signatures", signatures)
+    monkeypatch.setattr(match_service, "_schedule_refreshed_at", refreshed)
+    now = datetime.now(timezone.utc).timestamp()
+    old_key, recent_key = (date(2025, 5, 1), date(2025, 5, 1)), (date(2025, 5, 9), date(2025, 5, 9))
+    # Vencido há muito (abandonado) e vencido há pouco (ainda base da atualização incremental)
+    frames[old_key] = (now - SCHEDULE_KEEP_EXPIRED_SECONDS - 1, pd.DataFrame())
+    frames[recent_key] = (now - 60, pd.DataFrame())
+    for key in (old_key, recent_key):
+        signatures[key], refreshed[key] = {}, now
+
+    _store_schedule((DAY, DAY), pd.DataFrame())
+
+    assert set(frames) == {recent_key, (DAY, DAY)}
+    assert old_key not in signatures and old_key not in refreshed
@@ -0,0 +1,72 @@
+# tests/test_odds_service.py
+
+import numpy as np
+import pytest
+from scipy.stats import nbinom, poisson
+
+from samsbet.services.odds_service import (
+    compute_markets,
+    dynamic_lines,
+    market_view,
+    negative_binomial_pmf,
+    poisson_pmf,
+)
+
+
+@pytest.mark.parametrize("avg, num_lines, expected", [
+    (2.3, 3, [0.5, 1.5, 2.5, 3.5, 4.5, 5.5]),
+    (10.7, 1, [9.5, 10.5, 11.5]),
+    (0.4, 2, [0.5, 1.5, 2.5]),
+    (0, 3, []),
+    (None, 3, []),
+])
+def test_dynamic_lines(avg, num_lines, expected):
+    assert dynamic_lines(avg, num_lines) == expected
+
+
+def test_quarter_lines_split_into_half_bets():
+    # P(0) = 0.2, P(1) = 0.3, P(2) = 0.5
+    table = compute_markets([0.2, 0.3, 0.5], over_under_lines=[], asian_lines=[1.25, 1.75, 2.0])
+    prob = market_view(table, 'asiatico', 'prob')
+    odd = market_view(table, 'asiatico', 'odd')
+
+    # 1.25 = metade em 1.0 (1 gol devolve) e metade em 1.5
+    assert prob.loc[1.25].to_dict() == pytest.approx({'over': 0.5, 'under': 0.35, 'devolucao': 0.15})
+    assert odd.loc[1.25, 'over'] == pytest.approx(1.7)
+    assert odd.loc[1.25, 'under'] == pytest.approx(2.43)
+    # 1.75 = metade em 1.5 e metade em 2.0 (2 gols devolvem)
+    assert prob.loc[1.75].to_dict() == pytest.approx({'over': 0.25, 'under': 0.5, 'devolucao': 0.25})
+    assert odd.loc[1.75, 'over'] == pytest.approx(3.0)
+    assert odd.loc[1.75, 'under'] == pytest.approx(1.5)
+    # Linha inteira: a devolução inteira fica fora da odd
+    assert prob.loc[2.0].to_dict() == pytest.approx({'over': 0.0, 'under': 0.5, 'devolucao': 0.5})
+    assert odd.loc[2.0, 'over'] == np.inf
+    assert odd.loc[2.0, 'under'] == pytest.approx(1.0)
+
+
+def test_poisson_pmf_matches_scipy():
+    k = np.arange(10)
+    pmf = poisson_pmf(1.7, max_count=10)
+    assert pmf[:10] == pytest.approx(poisson.pmf(k, 1.7))
+    # A cauda acima de max_count é somada no último valor
+    assert pmf[10] == pytest.approx(poisson.sf(9, 1.7))
+    assert pmf.sum() == pytest.approx(1.0)
+
+    rows = poisson_pmf([0.8, 2.5], max_count=10)
+    assert rows.shape == (2, 11)
+    assert rows[1, :10] == pytest.approx(poisson.pmf(k, 2.5))
+
+
+def test_negative_binomial_pmf_matches_scipy():
+    k = np.arange(15)
+    # Média 2, variância 5: n = mu² / (var - mu), p = n / (n + mu)
+    n, p = 4 / 3, 0.4
+    pmf = negative_binomial_pmf(2.0, 5.0, max_count=15)
+    assert pmf[:15] == pytest.approx(nbinom.pmf(k, n, p))
+    assert pmf[15] == pytest.approx(nbinom.sf(14, n, p))
+    assert nbinom.stats(n, p, moments='mv') == pytest.approx((2.0, 5.0))
+
+    # Sem sobredispersão cai na Poisson
+    rows = negative_binomial_pmf([2.0, 2.0], [5.0, 1.5], max_count=15)
+    assert rows[0] == pytest.approx(pmf)
+    assert rows[1, :15] == pytest.approx(poisson.pmf(k, 2.0))
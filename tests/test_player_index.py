@@ -0,0 +1,75 @@
+# tests/test_player_index.py
+
+import threading
+
+import pytest
+
+from samsbet.core import player_index
+from samsbet.core.disk_cache import set_to_disk_cache
+from samsbet.core.player_index import lookup_players, search_players, update_player_index
+
+
+@pytest.fixture(autouse=True)
+def _isolated_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAMSBET_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(player_index, "_state", {"frame": None, "tokens": None, "token_rows": None})
+
+
+def _player(player_id, name=None, team_id=None, position=None, team_name=None):
+    return {'player_id': player_id, 'name': name, 'team_id': team_id, 'position': position, 'team_name': team_name}
+
+
+PLAYERS = [
+    _player(1, 'Vinícius Júnior', 50, 'F', 'Real Madrid'),
+    _player(2, 'Júnior Alonso', 60, 'D', 'Atlético-MG'),
+    _player(3, 'Vinicius Tobias', 50, 'D', 'Real Madrid'),
+    _player(4, 'Weverton', 70, 'G', 'Palmeiras'),
+]
+
+
+def test_prefix_search_ignores_accents_and_matches_every_word():
+    update_player_index(PLAYERS)
+
+    assert search_players('vini jun')['player_id'].tolist() == [1]
+    assert search_players('JUN')['player_id'].tolist() == [1, 2]
+    assert search_players('vinícius')['player_id'].tolist() == [1, 3]
+    assert search_players('vini', team_id=50, limit=1)['player_id'].tolist() == [1]
+    assert search_players('alonso vini').empty
+    assert search_players('   ').empty
+
+
+def test_merge_keeps_known_values_and_prefers_new_data():
+    update_player_index(PLAYERS)
+    # Valores ausentes não apagam; valores novos substituem
+    update_player_index([_player(4, team_id=71, team_name='Outro')])
+    row = lookup_players([4]).iloc[0]
+    assert (row['name'], row['position'], row['team_id']) == ('Weverton', 'G', 71)
+
+    # Com only_new, jogadores já conhecidos não são regravados
+    update_player_index([_player(1, 'Outro Nome'), _player(5, 'Endrick')], only_new=True)
+    assert lookup_players([1, 5])['name'].tolist() == ['Vinícius Júnior', 'Endrick']
+    assert search_players('endr')['player_id'].tolist() == [5]
+
+
+def test_merge_rereads_what_another_process_wrote():
+    update_player_index(PLAYERS[:2])
+    # Outro processo grava um jogador que este ainda não viu
+    set_to_disk_cache(player_index._INDEX_CACHE_KEY, {
+        'player_id': [1, 2, 9], 'name': ['Vinícius Júnior', 'Júnior Alonso', 'Hulk'],
+        'position': ['F', 'D', 'F'], 'team_id': [50, 60, 60], 'team_name': [None, None, None],
+    }, player_index._INDEX_TTL_SECONDS)
+
+    assert update_player_index([PLAYERS[2]]) == 4
+    assert search_players('hul')['player_id'].tolist() == [9]
+
+
+def test_concurrent_only_new_updates_keep_every_player():
+    threads = [
+        threading.Thread(target=update_player_index, args=([_player(i, f'Jogador {i}')],), kwargs={'only_new': True})
+        for i in range(1, 21)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(search_players('jogador', limit=50)['player_id']) == list(range(1, 21))
@@ -0,0 +1,44 @@
+# tests/test_snapshot_service.py
+
+import pytest
+
+from samsbet.services import snapshot_service
+from samsbet.services.snapshot_service import build_league_player_snapshot, load_league_player_snapshot
+
+
+class _PagedClient:
+    """Duas páginas por consulta; a chamada número `fail_at` volta vazia (bloqueio)."""
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def get_season_player_stats_page(self, ut, season, fields, offset, limit, order, filters):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            return {}
+        page = offset // limit + 1
+        size = limit if page == 1 else 5
+        results = [{"player": {"id": offset + i, "name": f"J{offset + i}"}, "team": {"id": 1, "name": "T"},
+                    "totalShots": 1} for i in range(size)]
+        return {"results": results, "page": page, "pages": 2}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAMSBET_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(snapshot_service, "_memory_snapshots", {})
+
+
+@pytest.mark.parametrize("fail_at", [2, 3])
+def test_failed_page_does_not_persist_a_partial_snapshot(fail_at):
+    # 2: segunda página dos jogadores; 3: primeira página da consulta de goleiros
+    assert build_league_player_snapshot(1, 2, client=_PagedClient(fail_at)).empty
+    assert load_league_player_snapshot(1, 2) is None
+
+
+def test_complete_snapshot_is_persisted_with_goalkeepers():
+    df = build_league_player_snapshot(1, 2, client=_PagedClient())
+    assert len(df) == snapshot_service.PAGE_SIZE + 5
+    assert df['is_goalkeeper'].all()
+    assert len(load_league_player_snapshot(1, 2)) == len(df)
@@ -0,0 +1,49 @@
+# tests/test_stats_parser.py
+
+import json
+from pathlib import Path
+
+import pytest
+
+from samsbet.api.sofascore_client import SofaScoreClient
+from samsbet.api.stats_parser import EVENT_STATISTICS_PARSER, TEAM_EVENT_DEFAULTS
+
+# Payload de `event/{id}/statistics` no formato da API: períodos ALL, 1ST e 2ND, com
+# chaves repetidas entre grupos (ex.: chutes e defesas também no 'Match overview')
+FIXTURE = Path(__file__).parent / "fixtures" / "event_statistics.json"
+
+EXPECTED = {
+    'home': {
+        'total_shots': 13, 'shots_on_target': 5, 'hit_woodwork': 1, 'shots_inside_box': 9, 'big_chances': 3,
+        'expected_goals': 2.11, 'corner_kicks': 7, 'fouls': 11, 'yellow_cards': 1, 'red_cards': 0,
+        'ball_possession': 58, 'offsides': 3, 'throw_ins': 19, 'total_tackles': 15, 'goal_kicks': 7, 'saves': 3,
+    },
+    'away': {
+        'total_shots': 9, 'shots_on_target': 4, 'hit_woodwork': 1, 'shots_inside_box': 5, 'big_chances': 3,
+        'expected_goals': 0.77, 'corner_kicks': 3, 'fouls': 12, 'yellow_cards': 3, 'red_cards': 1,
+        'ball_possession': 42, 'offsides': 2, 'throw_ins': 23, 'total_tackles': 19, 'goal_kicks': 11, 'saves': 5,
+    },
+}
+
+
+@pytest.fixture
+def payload():
+    return json.loads(FIXTURE.read_text(encoding="utf-8"))
+
+
+def test_regular_time_periods_are_summed(payload):
+    parsed = EVENT_STATISTICS_PARSER.parse_periods(payload["statistics"])
+    assert parsed == EXPECTED
+    assert set(parsed['home']) == set(TEAM_EVENT_DEFAULTS)
+
+
+def test_client_parses_the_recorded_payload(payload, monkeypatch):
+    monkeypatch.setattr(SofaScoreClient, "_make_request", lambda self, endpoint, refresh=False: payload)
+    assert SofaScoreClient().get_team_stats_for_event(1) == EXPECTED
+
+
+def test_aggregate_period_is_used_when_halves_are_missing(payload):
+    parsed = EVENT_STATISTICS_PARSER.parse_periods([p for p in payload["statistics"] if p["period"] == "ALL"])
+    # O período ALL da gravação diverge da soma dos tempos só no total de chutes
+    assert parsed['home'] == {**EXPECTED['home'], 'total_shots': 15}
+    assert parsed['away'] == {**EXPECTED['away'], 'total_shots': 10}
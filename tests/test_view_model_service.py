@@ -0,0 +1,51 @@
+# tests/test_view_model_service.py
+
+from collections import OrderedDict
+
+import pytest
+
+from samsbet.services import view_model_service
+from samsbet.services.view_model_service import (
+    VIEW_MODEL_VERSION,
+    get_match_view_model,
+    invalidate_match_view_models,
+    load_match_view_model,
+    store_match_view_model,
+)
+
+# Variantes pré-calculadas pelo warmer e uma que só a página pede
+OPTIONS = ({"filter_by_location": False}, {"filter_by_location": True}, {"filter_by_location": True, "extra": True})
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAMSBET_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(view_model_service, "_memory_view_models", OrderedDict())
+
+
+def _view_model(event_id, options):
+    return {"version": VIEW_MODEL_VERSION, "event_id": event_id, "options": options}
+
+
+def test_invalidation_drops_every_variant_of_the_event_only():
+    for event_id in (1, 2):
+        for options in OPTIONS:
+            store_match_view_model(event_id, options, _view_model(event_id, options))
+
+    invalidate_match_view_models([1])
+
+    assert all(load_match_view_model(1, options) is None for options in OPTIONS)
+    assert all(load_match_view_model(2, options) == _view_model(2, options) for options in OPTIONS)
+    assert not any(key.startswith(f"v{VIEW_MODEL_VERSION}:match_view_model:1:")
+                   for key in view_model_service._memory_view_models)
+
+
+def test_view_model_built_before_an_invalidation_is_not_served_after_it(monkeypatch):
+    def build(event_id, *args, options=None, **kwargs):
+        # A partida muda enquanto o view model é calculado
+        invalidate_match_view_models([event_id])
+        return _view_model(event_id, options)
+
+    monkeypatch.setattr(view_model_service, "build_match_view_model", build)
+    get_match_view_model(1, "Casa", "Fora", options=OPTIONS[0])
+    assert load_match_view_model(1, OPTIONS[0]) is None
@@ -0,0 +1,53 @@
+# tests/test_warm_service.py
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from samsbet.services import warm_service
+from samsbet.services.warm_service import WarmCheckpoint, day_checkpoint, run_warm_plan
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAMSBET_CACHE_DIR", str(tmp_path))
+
+
+def _plan(resources):
+    """Plano de um estágio só, com as buscas dadas."""
+    def compile_warm_plan(matches_df, client, depth):
+        return lambda index: (resources, len(resources)) if index == 0 else ({}, 0)
+    return compile_warm_plan
+
+
+def test_empty_payloads_are_not_checkpointed(monkeypatch):
+    monkeypatch.setattr(warm_service, "compile_warm_plan", _plan({
+        "blocked": lambda: {},
+        "zeros": lambda: {"home": {"shots": 0}, "away": {}},
+        "empty_frame": lambda: pd.DataFrame(),
+        "ok": lambda: {"standings": [{"rows": [1]}]},
+    }))
+    checkpoint = WarmCheckpoint("test")
+    totals = run_warm_plan(pd.DataFrame(), workers=1, checkpoint=checkpoint, client=object(), log=lambda m: None)
+
+    assert totals["fetched"] == 1 and totals["failed"] == 3
+    assert checkpoint.is_done("plan", "ok")
+    assert not any(checkpoint.is_done("plan", key) for key in ("blocked", "zeros", "empty_frame"))
+
+    # A retomada busca de novo só o que falhou
+    calls = []
+    monkeypatch.setattr(warm_service, "compile_warm_plan", _plan({
+        key: (lambda k=key: calls.append(k) or [k]) for key in ("blocked", "zeros", "empty_frame", "ok")
+    }))
+    run_warm_plan(pd.DataFrame(), workers=1, checkpoint=WarmCheckpoint("test"), client=object(), log=lambda m: None)
+    assert sorted(calls) == ["blocked", "empty_frame", "zeros"]
+
+
+def test_light_warm_does_not_count_as_full():
+    day = date(2026, 10, 20)
+    day_checkpoint(day, "light").mark("plan", "standings/1/2")
+
+    assert not day_checkpoint(day, "full").is_done("plan", "standings/1/2")
+    assert day_checkpoint(day, "light").is_done("plan", "standings/1/2")
+    assert not day_checkpoint(date(2026, 10, 21), "light").is_done("plan", "standings/1/2")